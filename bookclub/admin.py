@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import User, Club, Book, Application, Post, UserPost, Rating, Meeting, Chat, Message
+from .models import User, Club, ClubMembership, Book, Application, Post, UserPost, Rating, Meeting, Chat, Message
 
 @admin.register(User)
 class UserAdmin(admin.ModelAdmin):
@@ -15,6 +15,13 @@ class ClubAdmin(admin.ModelAdmin):
     ]
 
 
+@admin.register(ClubMembership)
+class ClubMembershipAdmin(admin.ModelAdmin):
+    list_display = [
+        'club', 'user', 'role', 'joined_at'
+    ]
+
+
 @admin.register(Book)
 class BookAdmin(admin.ModelAdmin):
     list_display = [
@@ -1,6 +1,29 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_save, post_delete, m2m_changed
 
 
 class BookClubConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'bookclub'
+
+    def ready(self):
+        from bookclub.models import User, Club, ClubMembership, Post, UserPost, Message, Book
+        from bookclub import autocomplete, inbox, search, timeline
+        post_save.connect(timeline.post_saved, sender=Post, dispatch_uid='bookclub_timeline_post')
+        post_save.connect(timeline.user_post_saved, sender=UserPost, dispatch_uid='bookclub_timeline_user_post')
+        post_save.connect(timeline.club_saved, sender=Club, dispatch_uid='bookclub_timeline_club')
+        post_save.connect(timeline.membership_changed, sender=ClubMembership,
+                          dispatch_uid='bookclub_timeline_membership_save')
+        post_delete.connect(timeline.membership_changed, sender=ClubMembership,
+                            dispatch_uid='bookclub_timeline_membership_delete')
+        m2m_changed.connect(timeline.followers_changed, sender=User.followers.through,
+                            dispatch_uid='bookclub_timeline_followers')
+        post_save.connect(inbox.message_saved, sender=Message, dispatch_uid='bookclub_inbox_message_save')
+        post_delete.connect(inbox.message_deleted, sender=Message, dispatch_uid='bookclub_inbox_message_delete')
+        for model in (Book, Club, User):
+            post_save.connect(search.object_saved, sender=model, dispatch_uid=f'bookclub_search_{model.__name__}_save')
+            post_delete.connect(search.object_deleted, sender=model, dispatch_uid=f'bookclub_search_{model.__name__}_delete')
+        post_save.connect(autocomplete.book_saved, sender=Book, dispatch_uid='bookclub_autocomplete_book_save')
+        post_delete.connect(autocomplete.book_deleted, sender=Book, dispatch_uid='bookclub_autocomplete_book_delete')
+        post_save.connect(autocomplete.club_saved, sender=Club, dispatch_uid='bookclub_autocomplete_club_save')
+        post_delete.connect(autocomplete.club_deleted, sender=Club, dispatch_uid='bookclub_autocomplete_club_delete')
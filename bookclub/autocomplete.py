@@ -0,0 +1,193 @@
+"""Process-wide prefix index of book titles, authors and club names for the search bar's autocomplete.
+
+Every word of a name starts one sorted (key, entry) pair, so completions are the pairs between two bisections."""
+import heapq
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from django.conf import settings
+from django.db.models import Count
+from bookclub.models import Book, Club, Rating
+
+_index_lock = threading.Lock()
+_loaded_index = {'index': None, 'built_at': None}
+
+# Prefixes whose completions are remembered at once, beyond which they are all forgotten
+MAX_COMPLETIONS = 10000
+
+
+def normalise(text):
+    """Return text in lower case without accents and with every run of non-word characters as one space."""
+    text = unicodedata.normalize('NFKD', str(text or ''))
+    text = ''.join(character for character in text if not unicodedata.combining(character))
+    return ' '.join(re.findall(r'\w+', text.lower()))
+
+
+def word_suffixes(text):
+    """Return the normalised text from the start of each of its words."""
+    key = normalise(text)
+    return [key[match.start():] for match in re.finditer(r'\w+', key)]
+
+
+class PrefixIndex:
+    """Named entries, such as ('book', 3), findable by the start of any of their words and ranked by popularity."""
+
+    def __init__(self):
+        self.pairs = []
+        self.labels = {}
+        self.popularity = {}
+        self.author_books = {}
+        self.book_authors = {}
+        self.completions = {}
+
+    def add(self, entry, label, popularity=0, keep_sorted=True):
+        """Index an entry, leaving the pairs unsorted when keep_sorted is False for a bulk load ended by sort()."""
+        self.remove(entry)
+        self.completions.clear()
+        self.labels[entry] = label
+        self.popularity[entry] = popularity
+        for key in word_suffixes(label):
+            if keep_sorted:
+                insort(self.pairs, (key, entry))
+            else:
+                self.pairs.append((key, entry))
+
+    def sort(self):
+        self.pairs.sort()
+
+    def remove(self, entry):
+        label = self.labels.pop(entry, None)
+        if label is None:
+            return
+        self.popularity.pop(entry, None)
+        self.completions.clear()
+        for key in word_suffixes(label):
+            position = bisect_left(self.pairs, (key, entry))
+            if position < len(self.pairs) and self.pairs[position] == (key, entry):
+                del self.pairs[position]
+
+    def add_book(self, pk, title, author, popularity=0):
+        """Index a book and its author, whose popularity is the sum of the popularity of their books."""
+        self.remove_book(pk)
+        self.add(('book', pk), title, popularity)
+        author_key = normalise(author)
+        if author_key:
+            self.book_authors[pk] = author_key
+            books = self.author_books.setdefault(author_key, {})
+            books[pk] = popularity
+            self.add(('author', author_key), author, sum(books.values()))
+
+    def remove_book(self, pk):
+        self.remove(('book', pk))
+        author_key = self.book_authors.pop(pk, None)
+        if author_key is None:
+            return
+        books = self.author_books[author_key]
+        del books[pk]
+        if books:
+            self.popularity[('author', author_key)] = sum(books.values())
+            self.completions.clear()
+        else:
+            del self.author_books[author_key]
+            self.remove(('author', author_key))
+
+    def complete(self, term, limit=5):
+        """Return the labels of the most popular entries with a word starting with the term.
+
+        Completions are remembered until the index next changes, so repeated keystrokes skip the ranking."""
+        prefix = normalise(term)
+        if not prefix:
+            return []
+        if (prefix, limit) not in self.completions:
+            start = bisect_left(self.pairs, (prefix,))
+            end = bisect_left(self.pairs, (prefix + '\uffff',))
+            entries = {entry for key, entry in self.pairs[start:end]}
+            ranked = heapq.nsmallest(limit, entries, key=self.rank)
+            labels = list(dict.fromkeys(self.labels[entry] for entry in ranked))
+            if len(labels) < min(limit, len(entries)):
+                labels = list(dict.fromkeys(self.labels[entry] for entry in sorted(entries, key=self.rank)))[:limit]
+            if len(self.completions) >= MAX_COMPLETIONS:
+                self.completions.clear()
+            self.completions[prefix, limit] = labels
+        return self.completions[prefix, limit]
+
+    def rank(self, entry):
+        return -self.popularity.get(entry, 0), self.labels[entry]
+
+
+def build_index():
+    """Return a new index of every book, by number of ratings, and every club, by number of members."""
+    index = PrefixIndex()
+    ratings = dict(Rating.objects.values_list('isbn').annotate(count=Count('id')).order_by())
+    authors = {}
+    for pk, title, author, isbn in Book.objects.order_by().values_list('id', 'title', 'author', 'isbn'):
+        popularity = ratings.get(isbn, 0)
+        index.add(('book', pk), title, popularity, keep_sorted=False)
+        author_key = normalise(author)
+        if author_key:
+            index.book_authors[pk] = author_key
+            index.author_books.setdefault(author_key, {})[pk] = popularity
+            authors.setdefault(author_key, author)
+    for author_key, author in authors.items():
+        index.add(('author', author_key), author, sum(index.author_books[author_key].values()), keep_sorted=False)
+    for pk, name, members in Club.objects.order_by().annotate(members=Count('memberships')).values_list(
+            'id', 'name', 'members'):
+        index.add(('club', pk), name, members + 1, keep_sorted=False)
+    index.sort()
+    return index
+
+
+def get_index():
+    """Return this process's index, building it on first use and again once it is AUTOCOMPLETE_INDEX_TIMEOUT old.
+
+    Changes made in this process are applied as they happen, the rebuild picks up those of other processes."""
+    with _index_lock:
+        built_at = _loaded_index['built_at']
+        if built_at is not None and time.monotonic() - built_at < settings.AUTOCOMPLETE_INDEX_TIMEOUT:
+            return _loaded_index['index']
+    index = build_index()
+    with _index_lock:
+        _loaded_index['index'] = index
+        _loaded_index['built_at'] = time.monotonic()
+    return index
+
+
+def complete(term, limit=5):
+    index = get_index()
+    with _index_lock:
+        return index.complete(term, limit)
+
+
+def clear_index(**kwargs):
+    with _index_lock:
+        _loaded_index['index'] = None
+        _loaded_index['built_at'] = None
+
+
+def book_saved(sender, instance, **kwargs):
+    with _index_lock:
+        index = _loaded_index['index']
+        if index is not None:
+            popularity = index.popularity.get(('book', instance.pk), 0)
+            index.add_book(instance.pk, instance.title, instance.author, popularity)
+
+
+def book_deleted(sender, instance, **kwargs):
+    with _index_lock:
+        if _loaded_index['index'] is not None:
+            _loaded_index['index'].remove_book(instance.pk)
+
+
+def club_saved(sender, instance, **kwargs):
+    with _index_lock:
+        index = _loaded_index['index']
+        if index is not None:
+            index.add(('club', instance.pk), instance.name, index.popularity.get(('club', instance.pk), 1))
+
+
+def club_deleted(sender, instance, **kwargs):
+    with _index_lock:
+        if _loaded_index['index'] is not None:
+            _loaded_index['index'].remove(('club', instance.pk))
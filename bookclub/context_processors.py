@@ -0,0 +1,9 @@
+from bookclub.inbox import get_unread_count
+
+
+def inbox_count(request):
+    """Add the unread message count of the logged in user to every template."""
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        return {}
+    return {'inbox_count': get_unread_count(user)}
@@ -1,4 +1,5 @@
 from django.contrib.auth.base_user import BaseUserManager
+from django.db import models
 
 class UserManager(BaseUserManager):
     """ The abstractbaseuser needs these methods in order to function properly """
@@ -23,4 +24,14 @@ class UserManager(BaseUserManager):
         extra_fields.setdefault('is_staff', True)
         extra_fields.setdefault('is_superuser', True)
 
-        return self._create_user(email, password, **extra_fields)
\ No newline at end of file
+        return self._create_user(email, password, **extra_fields)
+
+
+class BookManager(models.Manager):
+    """ Resolves lists of ISBNs, such as recommendations, to books """
+
+    def in_isbn_order(self, isbns):
+        """Return the books with the given ISBNs using one query, in the order the ISBNs were given."""
+        isbns = list(dict.fromkeys(isbns))
+        books = {book.isbn: book for book in self.filter(isbn__in=isbns)}
+        return [books[isbn] for isbn in isbns if isbn in books]
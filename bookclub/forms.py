@@ -17,6 +17,14 @@ class UserForm(forms.ModelForm):
         fields = ['first_name', 'last_name', 'email', 'public_bio', 'favourite_genre', 'location', 'age']
         widgets = {'public_bio': forms.Textarea()}
 
+    def save(self, commit=True):
+        """Save only the profile fields, so the unread counter, updated in place by other requests, is kept."""
+
+        user = super().save(commit=False)
+        if commit:
+            user.save(update_fields=self._meta.fields)
+        return user
+
 
 class LogInForm(forms.Form):
     """Form enabling registered users to log in."""
@@ -127,7 +135,7 @@ class PasswordForm(NewPasswordMixin):
         new_password = self.cleaned_data['new_password']
         if self.user is not None:
             self.user.set_password(new_password)
-            self.user.save()
+            self.user.save(update_fields=['password'])
         return self.user
 
 
@@ -11,3 +11,18 @@ def login_prohibited(view_function):
         else:
             return view_function(request)
     return modified_view_function
+
+
+def get_club_roles(request, club):
+    """Return the club's map of user id to user level, queried at most once per request."""
+    if not hasattr(request, 'club_roles'):
+        request.club_roles = {}
+    if club.id not in request.club_roles:
+        request.club_roles[club.id] = club.get_role_map()
+    return request.club_roles[club.id]
+
+
+def can_manage_meetings(request, club):
+    """Return whether the requesting user may schedule and edit the club's meetings."""
+    level = get_club_roles(request, club).get(request.user.id)
+    return level == "Owner" or (level == "Organiser" and club.organiser_owner)
@@ -0,0 +1,50 @@
+"""Unread message counts, kept on User.inbox_count and updated in place with F() expressions.
+
+A null counter means it is unknown, it is counted once from the messages the next time it is read."""
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+from bookclub.models import User, Message
+
+
+def count_unread():
+    """Return the number of unread messages of the user in the outer query."""
+    unread = Message.objects.filter(receiver_user=OuterRef('pk'), is_read=False).order_by()
+    return Coalesce(Subquery(unread.values('receiver_user').annotate(count=Count('id')).values('count')), 0)
+
+
+def get_unread_count(user):
+    """Return the number of unread messages of a user, counting them only if the counter is unknown.
+
+    The count is taken inside the UPDATE that stores it, so a message saved meanwhile is either counted
+    there or added to the stored counter afterwards."""
+    if user.inbox_count is None:
+        User.objects.filter(pk=user.pk, inbox_count__isnull=True).update(inbox_count=count_unread())
+        user.inbox_count = User.objects.values_list('inbox_count', flat=True).get(pk=user.pk)
+    return user.inbox_count
+
+
+def add_unread(user_id, amount):
+    """Add amount, which may be negative, to a known counter without going below zero."""
+    if amount:
+        User.objects.filter(pk=user_id, inbox_count__isnull=False).update(
+            inbox_count=Greatest(F('inbox_count') + amount, 0)
+        )
+
+
+def mark_chat_read(chat, user):
+    """Mark the messages a user received in a chat as read and return how many were unread."""
+    read = Message.objects.filter(chat=chat, receiver_user=user, is_read=False).update(is_read=True)
+    add_unread(user.pk, -read)
+    if user.inbox_count is not None:
+        user.inbox_count = max(user.inbox_count - read, 0)
+    return read
+
+
+def message_saved(sender, instance, created, raw, **kwargs):
+    if created and not raw and not instance.is_read:
+        add_unread(instance.receiver_user_id, 1)
+
+
+def message_deleted(sender, instance, **kwargs):
+    if not instance.is_read:
+        add_unread(instance.receiver_user_id, -1)
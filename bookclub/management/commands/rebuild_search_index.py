@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+from bookclub.search import rebuild_search_indexes
+
+
+class Command(BaseCommand):
+    """Index every book, club and user again, for rows written without signals such as by bulk_create"""
+
+    help = 'Rebuild the full-text search index of books, clubs and users.'
+
+    def handle(self, *args, **options):
+        rebuild_search_indexes()
+        self.stdout.write('[ COMPLETED: The search index has been rebuilt ]')
@@ -2,6 +2,7 @@ import random
 from django.core.management.base import BaseCommand, CommandError
 from faker import Faker
 from bookclub.models import User, Club, Book, Application, Post, UserPost
+from bookclub.search import rebuild_search_indexes
 from django.core.exceptions import ValidationError
 import csv
 import pandas as pd
@@ -123,6 +124,7 @@ class Command(BaseCommand):
             print()
             print("Seed books:")
             self.load_books()
+            rebuild_search_indexes()
             print("All books have been successfully seeded")
             print()
             create_set_users()
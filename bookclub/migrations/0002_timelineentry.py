@@ -0,0 +1,66 @@
+# Generated by Django 3.2.5 on 2026-10-18 12:07
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fan_out_existing_posts(apps, schema_editor):
+    Club = apps.get_model('bookclub', 'Club')
+    Post = apps.get_model('bookclub', 'Post')
+    UserPost = apps.get_model('bookclub', 'UserPost')
+    TimelineEntry = apps.get_model('bookclub', 'TimelineEntry')
+
+    for club in Club.objects.all():
+        user_ids = set(club.members.values_list('id', flat=True))
+        user_ids.update(club.organisers.values_list('id', flat=True))
+        user_ids.add(club.owner_id)
+        TimelineEntry.objects.bulk_create(
+            [TimelineEntry(user_id=user_id, post_id=post_id, created_at=created_at)
+             for post_id, created_at in Post.objects.filter(club=club).values_list('id', 'created_at')
+             for user_id in user_ids],
+            batch_size=1000, ignore_conflicts=True
+        )
+
+    for user_post in UserPost.objects.all():
+        TimelineEntry.objects.bulk_create(
+            [TimelineEntry(user_id=follower_id, user_post_id=user_post.id, created_at=user_post.created_at)
+             for follower_id in user_post.author.followers.values_list('id', flat=True)],
+            batch_size=1000, ignore_conflicts=True
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookclub', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TimelineEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField()),
+                ('post', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='timeline_entries', to='bookclub.post')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='timeline_entries', to=settings.AUTH_USER_MODEL)),
+                ('user_post', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='timeline_entries', to='bookclub.userpost')),
+            ],
+            options={
+                'ordering': ['-created_at', '-id'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='timelineentry',
+            index=models.Index(fields=['user', '-created_at'], name='timeline_user_created_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='timelineentry',
+            constraint=models.UniqueConstraint(fields=('user', 'post'), name='unique_timeline_club_post'),
+        ),
+        migrations.AddConstraint(
+            model_name='timelineentry',
+            constraint=models.UniqueConstraint(fields=('user', 'user_post'), name='unique_timeline_user_post'),
+        ),
+        migrations.RunPython(fan_out_existing_posts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,66 @@
+# Generated by Django 3.2.5 on 2026-10-18 12:17
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+def copy_club_memberships(apps, schema_editor):
+    Club = apps.get_model('bookclub', 'Club')
+    ClubMembership = apps.get_model('bookclub', 'ClubMembership')
+
+    for club in Club.objects.all():
+        memberships = [ClubMembership(club=club, user=user, role='organiser') for user in club.organisers.all()]
+        memberships += [ClubMembership(club=club, user=user, role='member') for user in club.members.all()]
+        ClubMembership.objects.bulk_create(memberships, ignore_conflicts=True)
+
+
+def copy_club_memberships_back(apps, schema_editor):
+    ClubMembership = apps.get_model('bookclub', 'ClubMembership')
+
+    for membership in ClubMembership.objects.select_related('club'):
+        if membership.role == 'organiser':
+            membership.club.organisers.add(membership.user_id)
+        else:
+            membership.club.members.add(membership.user_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookclub', '0002_timelineentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ClubMembership',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('role', models.CharField(choices=[('member', 'Member'), ('organiser', 'Organiser')], default='member', max_length=9)),
+                ('joined_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('club', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='memberships', to='bookclub.club')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='club_memberships', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['joined_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='clubmembership',
+            index=models.Index(fields=['user', 'role'], name='club_membership_user_role_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='clubmembership',
+            constraint=models.UniqueConstraint(fields=('club', 'user'), name='unique_club_membership'),
+        ),
+        migrations.RunPython(copy_club_memberships, copy_club_memberships_back),
+        migrations.RemoveField(
+            model_name='club',
+            name='members',
+        ),
+        migrations.RemoveField(
+            model_name='club',
+            name='organisers',
+        ),
+    ]
@@ -0,0 +1,18 @@
+from django.db import migrations
+
+
+def reset_inbox_counts(apps, schema_editor):
+    """Forget the counts written by the old navbar code, they are recounted on first use."""
+    User = apps.get_model('bookclub', 'User')
+    User.objects.update(inbox_count=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookclub', '0003_clubmembership'),
+    ]
+
+    operations = [
+        migrations.RunPython(reset_inbox_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 3.2.5 on 2026-10-18 12:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookclub', '0004_reset_inbox_counts'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['receiver_user', 'is_read'], name='message_receiver_read_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 3.2.5 on 2026-10-18 12:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookclub', '0005_message_receiver_read_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['chat', 'date'], name='message_chat_date_idx'),
+        ),
+    ]
@@ -0,0 +1,54 @@
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def set_chat_pairs(apps, schema_editor):
+    """Order the users of every chat, merging the messages of duplicate chats into the oldest one."""
+    Chat = apps.get_model('bookclub', 'Chat')
+    Message = apps.get_model('bookclub', 'Message')
+    kept = {}
+    for chat in Chat.objects.order_by('id'):
+        pair = tuple(sorted((chat.user_id, chat.receiver_id)))
+        if pair in kept:
+            Message.objects.filter(chat_id=chat.id).update(chat_id=kept[pair])
+            chat.delete()
+        else:
+            kept[pair] = chat.id
+            Chat.objects.filter(id=chat.id).update(low_user_id=pair[0], high_user_id=pair[1])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('bookclub', '0006_message_chat_date_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chat',
+            name='low_user',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='chat',
+            name='high_user',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(set_chat_pairs, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='chat',
+            name='low_user',
+            field=models.ForeignKey(blank=True, editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='chat',
+            name='high_user',
+            field=models.ForeignKey(blank=True, editable=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddConstraint(
+            model_name='chat',
+            constraint=models.UniqueConstraint(fields=('low_user', 'high_user'), name='unique_chat_pair'),
+        ),
+    ]
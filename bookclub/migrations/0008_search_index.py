@@ -0,0 +1,73 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.db import migrations
+
+# The search indexes as they were when this migration was written. Later changes to bookclub.search need
+# a migration of their own, so this one replays the same statements on every database.
+
+
+def weighted(column, weight):
+    return f"setweight(to_tsvector('simple', regexp_replace(coalesce({column}::text, ''), '\\W+', ' ', 'g')), '{weight}')"
+
+
+CREATE_SQL = {
+    'sqlite': [
+        "CREATE VIRTUAL TABLE IF NOT EXISTS bookclub_book_fts "
+        "USING fts5(title, author, isbn, pub_year, publisher, prefix='2 3')",
+        "DELETE FROM bookclub_book_fts",
+        "INSERT INTO bookclub_book_fts (rowid, title, author, isbn, pub_year, publisher) "
+        "SELECT id, title, author, isbn, pub_year, publisher FROM bookclub_book",
+        "CREATE VIRTUAL TABLE IF NOT EXISTS bookclub_club_fts USING fts5(name, prefix='2 3')",
+        "DELETE FROM bookclub_club_fts",
+        "INSERT INTO bookclub_club_fts (rowid, name) SELECT id, name FROM bookclub_club",
+        "CREATE VIRTUAL TABLE IF NOT EXISTS bookclub_user_fts USING fts5(first_name, last_name, email, prefix='2 3')",
+        "DELETE FROM bookclub_user_fts",
+        "INSERT INTO bookclub_user_fts (rowid, first_name, last_name, email) "
+        "SELECT id, first_name, last_name, email FROM bookclub_user",
+    ],
+    'postgresql': [
+        "CREATE INDEX IF NOT EXISTS bookclub_book_search_idx ON bookclub_book USING GIN (("
+        + ' || '.join([weighted('title', 'A'), weighted('author', 'B'), weighted('isbn', 'C'),
+                       weighted('pub_year', 'D'), weighted('publisher', 'D')])
+        + "))",
+        "CREATE INDEX IF NOT EXISTS bookclub_club_search_idx ON bookclub_club USING GIN (("
+        + weighted('name', 'A')
+        + "))",
+        "CREATE INDEX IF NOT EXISTS bookclub_user_search_idx ON bookclub_user USING GIN (("
+        + ' || '.join([weighted('first_name', 'A'), weighted('last_name', 'A'), weighted('email', 'B')])
+        + "))",
+    ],
+}
+
+DROP_SQL = {
+    'sqlite': [
+        "DROP TABLE IF EXISTS bookclub_book_fts",
+        "DROP TABLE IF EXISTS bookclub_club_fts",
+        "DROP TABLE IF EXISTS bookclub_user_fts",
+    ],
+    'postgresql': [
+        "DROP INDEX IF EXISTS bookclub_book_search_idx",
+        "DROP INDEX IF EXISTS bookclub_club_search_idx",
+        "DROP INDEX IF EXISTS bookclub_user_search_idx",
+    ],
+}
+
+
+def run_for_vendor(statements):
+    def run(apps, schema_editor):
+        vendor = schema_editor.connection.vendor
+        if vendor not in statements:
+            raise ImproperlyConfigured(f'Search is not supported on {vendor} databases')
+        for statement in statements[vendor]:
+            schema_editor.execute(statement, params=None)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bookclub', '0007_chat_pair'),
+    ]
+
+    operations = [
+        migrations.RunPython(run_for_vendor(CREATE_SQL), run_for_vendor(DROP_SQL)),
+    ]
@@ -1,16 +1,28 @@
 import datetime
 from email.mime import application
-from django.db import models
+from django.conf import settings
+from django.core.cache import caches
+from django.db import models, transaction
+from django.db.models import Q
 from django.forms import CharField, DateField, IntegerField
 from django.utils import timezone
 from django.utils.timezone import make_aware
 from django.contrib.auth.models import AbstractUser, PermissionsMixin
 from django.contrib.auth.base_user import AbstractBaseUser
-from .custom_managers import UserManager
+from .custom_managers import UserManager, BookManager
 from django.core.validators import RegexValidator, MaxValueValidator, MinValueValidator
 from libgravatar import Gravatar
 
 
+def user_clubs_cache_key(user_id):
+    return f'user_clubs:{user_id}'
+
+
+def clear_user_clubs_cache(*user_ids):
+    """Forget the cached clubs of the given users, in every process."""
+    caches['shared'].delete_many([user_clubs_cache_key(user_id) for user_id in user_ids])
+
+
 # books model
 class Book(models.Model):
     """A model for a book"""
@@ -23,6 +35,8 @@ class Book(models.Model):
     medium_url = models.URLField(unique=False, blank=False, max_length=512)
     large_url = models.URLField(unique=False, blank=False, max_length=512)
 
+    objects = BookManager()
+
     class Meta:
         """Model options."""
 
@@ -162,15 +176,19 @@ class User(AbstractBaseUser, PermissionsMixin):
         return len(self.get_ratings())
     
     def get_all_clubs(self):
-        clubs = Club.objects.all()
-        user_clubs = []
-        for club in clubs:
-            if self in club.get_all_users():
-                user_clubs.append(club)
-        return user_clubs
-    
+        """Return the clubs the user owns, organises or is a member of, using one query."""
+        return Club.objects.filter(Q(memberships__user=self) | Q(owner=self)).distinct()
+
     def get_number_of_clubs(self):
-        return len(self.get_all_clubs())
+        return self.get_all_clubs().count()
+
+    def get_cached_clubs(self):
+        """Return the user's clubs, looking them up at most every USER_CLUBS_CACHE_TIMEOUT seconds.
+
+        The clubs are kept in the shared cache, so a membership change in any process clears them everywhere."""
+        return caches['shared'].get_or_set(
+            user_clubs_cache_key(self.id), lambda: list(self.get_all_clubs()), settings.USER_CLUBS_CACHE_TIMEOUT
+        )
 
     objects = UserManager()
 
@@ -185,8 +203,6 @@ class Club(models.Model):
     name = models.CharField(unique=True, blank=False, max_length=48)
     description = models.CharField(blank=True, max_length=512)
     location = models.CharField(blank=False, max_length=96)
-    members = models.ManyToManyField(User, related_name="member_of")
-    organisers = models.ManyToManyField(User, related_name="organiser_of")
     owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name="owner_of")
     meeting_online = models.BooleanField(unique=False, blank=False, default=True)
     organiser_owner = models.BooleanField(unique=False, blank=False, default=True)
@@ -209,56 +225,50 @@ class Club(models.Model):
         return self.location
 
     def user_level(self, user):
-        if self.owner == user:
+        if self.owner_id == user.id:
             return "Owner"
-        elif self.organisers.filter(email=user.email):
-            return "Organiser"
-        elif self.members.filter(email=user.email):
-            return "Member"
-        else:
-            return "Not in club"
+        role = self.memberships.filter(user=user).values_list('role', flat=True).first()
+        return ClubMembership.LEVELS.get(role, "Not in club")
 
-    def make_owner(self, user):
-        if self.user_level(user) == "Member":
-            self.members.remove(user)
-        elif self.user_level(user) == "Organiser":
-            self.organisers.remove(user)
+    def get_role_map(self):
+        """Return the user level of everyone in the club, keyed by user id, using one query."""
+        roles = {
+            user_id: ClubMembership.LEVELS[role] for user_id, role in self.memberships.values_list('user_id', 'role')
+        }
+        roles[self.owner_id] = "Owner"
+        return roles
 
-        self.members.add(self.owner)
-        self.owner = user
-        self.save()
+    def make_owner(self, user):
+        with transaction.atomic():
+            self.memberships.filter(user=user).delete()
+            self.memberships.get_or_create(user=self.owner, defaults={'role': ClubMembership.MEMBER})
+            clear_user_clubs_cache(self.owner_id, user.id)
+            self.owner = user
+            self.save(update_fields=['owner'])
 
     def make_organiser(self, user):
-        if self.user_level(user) == "Member":
-            self.members.remove(user)
-            self.organisers.add(user)
-            self.save()
-        else:
+        if not self.memberships.filter(user=user, role=ClubMembership.MEMBER).update(role=ClubMembership.ORGANISER):
             raise ValueError
 
     def demote_organiser(self, user):
-        if self.user_level(user) == "Organiser":
-            self.organisers.remove(user)
-            self.members.add(user)
-            self.save()
-        else:
+        if not self.memberships.filter(user=user, role=ClubMembership.ORGANISER).update(role=ClubMembership.MEMBER):
             raise ValueError
 
     def make_member(self, user):
-        self.members.add(user)
-        self.save()
+        self.memberships.get_or_create(user=user, defaults={'role': ClubMembership.MEMBER})
+        clear_user_clubs_cache(user.id)
 
     def get_number_of_members(self):
-        return self.members.count()
+        return self.memberships.filter(role=ClubMembership.MEMBER).count()
 
     def get_number_organisers(self):
-        return self.organisers.count()
+        return self.memberships.filter(role=ClubMembership.ORGANISER).count()
 
     def get_members(self):
-        return self.members.all()
+        return User.objects.filter(club_memberships__club=self, club_memberships__role=ClubMembership.MEMBER)
 
     def get_organisers(self):
-        return self.organisers.all()
+        return User.objects.filter(club_memberships__club=self, club_memberships__role=ClubMembership.ORGANISER)
 
     def get_owner(self):
         return self.owner
@@ -275,23 +285,18 @@ class Club(models.Model):
         return Meeting.objects.filter(club_id=self.id).count()
 
     def get_all_users(self):
-        self.club_members = self.get_members()
-        self.club_organisers = self.get_organisers()
-        self.club_owner = User.objects.filter(email=self.get_owner().email)
-
-        return (self.club_members | self.club_organisers | self.club_owner).distinct()
+        return User.objects.filter(Q(club_memberships__club=self) | Q(id=self.owner_id)).distinct()
 
     def remove_from_club(self, user):
-        if self.user_level(user) == "Member":
-            self.members.remove(user)
-            self.save()
-
-        elif self.user_level(user) == "Organiser":
-            self.organisers.remove(user)
-            self.save()
-
-        else:
+        if self.owner_id == user.id or not self.memberships.filter(user=user).delete()[0]:
             raise ValueError
+        clear_user_clubs_cache(user.id)
+
+    def disband(self):
+        """Delete the club, forgetting the cached clubs of everyone who was in it."""
+        user_ids = list(self.get_all_users().values_list('id', flat=True))
+        self.delete()
+        clear_user_clubs_cache(*user_ids)
 
     def organiser_has_owner_privilege(self):
         if self.organiser_owner:
@@ -310,6 +315,30 @@ class Club(models.Model):
         return self.gravatar(size=60)
 
 
+class ClubMembership(models.Model):
+    """A model for the role of a member or organiser in a club. The owner is the club's owner field."""
+    MEMBER = 'member'
+    ORGANISER = 'organiser'
+    ROLE_CHOICES = [(MEMBER, 'Member'), (ORGANISER, 'Organiser')]
+    LEVELS = {MEMBER: "Member", ORGANISER: "Organiser"}
+
+    club = models.ForeignKey(Club, on_delete=models.CASCADE, related_name='memberships')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='club_memberships')
+    role = models.CharField(max_length=9, choices=ROLE_CHOICES, default=MEMBER)
+    joined_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        """Model options."""
+
+        ordering = ['joined_at']
+        constraints = [
+            models.UniqueConstraint(fields=['club', 'user'], name='unique_club_membership'),
+        ]
+        indexes = [
+            models.Index(fields=['user', 'role'], name='club_membership_user_role_idx'),
+        ]
+
+
 class Application(models.Model):
     """A model for denoting and storing applications made by users to join book clubs."""
     applicant = models.ForeignKey(User, blank=False, on_delete=models.CASCADE)
@@ -381,6 +410,27 @@ class Chat(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
     receiver = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+')
     has_unread = models.BooleanField(default=False)
+    # The two users ordered by id and set on save, so a pair has one chat whoever started it
+    low_user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+', blank=True, editable=False)
+    high_user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+', blank=True, editable=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['low_user', 'high_user'], name='unique_chat_pair'),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.low_user_id, self.high_user_id = sorted((self.user_id, self.receiver_id))
+        super().save(*args, **kwargs)
+
+
+def get_or_create_chat(user, other):
+    """Return the chat between two users and whether it was created, started by user if it is new."""
+    low_user_id, high_user_id = sorted((user.id, other.id))
+    return Chat.objects.get_or_create(
+        low_user_id=low_user_id, high_user_id=high_user_id, defaults={'user': user, 'receiver': other}
+    )
+
 
 class Message(models.Model):
     """A model for a message in a chat"""
@@ -392,6 +442,12 @@ class Message(models.Model):
     is_read = models.BooleanField(default=False)
     club = models.ForeignKey(Club, on_delete=models.CASCADE, blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['receiver_user', 'is_read'], name='message_receiver_read_idx'),
+            models.Index(fields=['chat', 'date'], name='message_chat_date_idx'),
+        ]
+
 
 class Post(models.Model):
     """A model for a club post"""
@@ -413,6 +469,28 @@ class UserPost(models.Model):
     class Meta:
         ordering = ['-created_at']
 
+
+class TimelineEntry(models.Model):
+    """A post fanned out to the home timeline of a member of its club or a follower of its author"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='timeline_entries')
+    post = models.ForeignKey(Post, blank=True, null=True, on_delete=models.CASCADE, related_name='timeline_entries')
+    user_post = models.ForeignKey(UserPost, blank=True, null=True, on_delete=models.CASCADE,
+                                  related_name='timeline_entries')
+    created_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['-created_at', '-id']
+        indexes = [
+            models.Index(fields=['user', '-created_at'], name='timeline_user_created_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'post'], name='unique_timeline_club_post'),
+            models.UniqueConstraint(fields=['user', 'user_post'], name='unique_timeline_user_post'),
+        ]
+
+    def get_post(self):
+        return self.post or self.user_post
+
   
 class RecommendedBook(models.Model):
     """A model for a recommended book"""
@@ -0,0 +1,132 @@
+"""Keyset (cursor) pagination for long, append-mostly lists such as posts and books."""
+import base64
+import binascii
+import json
+from django.core.paginator import Paginator
+from django.db.models import Q
+
+POSTS_CURSOR_ORDERING = ('-created_at', '-id')
+BOOKS_CURSOR_ORDERING = ('title', 'id')
+MESSAGES_CURSOR_ORDERING = ('-date', '-id')
+# Annotated on posts by bookclub.timeline, so timelines are ordered by when the posts entered them
+TIMELINE_CURSOR_ORDERING = ('-entry_created_at', '-entry_id')
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip('=')
+
+
+def decode_cursor(token, length):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+    except (binascii.Error, ValueError):
+        raise InvalidCursor(token)
+    if not isinstance(values, list) or len(values) != length:
+        raise InvalidCursor(token)
+    return values
+
+
+def cursor_value(obj, field):
+    """Return the JSON serialisable value of a possibly related field, such as book__title, of an object."""
+    for name in field.split('__'):
+        obj = getattr(obj, name)
+    return obj.isoformat() if hasattr(obj, 'isoformat') else obj
+
+
+class CursorPage:
+    """One page of a CursorPaginator, with the tokens of the pages that follow and precede it."""
+
+    is_cursor_page = True
+
+    def __init__(self, object_list, next_after, previous_before):
+        self.object_list = object_list
+        self.next_after = next_after
+        self.previous_before = previous_before
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_after is not None
+
+    def has_previous(self):
+        return self.previous_before is not None
+
+
+class CursorPaginator:
+    """Paginate a queryset on a unique ordering of non-null fields, such as (-created_at, -id), with ?after= and
+    ?before= tokens.
+
+    Each page is one query that seeks past the last row of the previous page, so deep pages cost the
+    same as the first page and no COUNT(*) is needed."""
+
+    def __init__(self, queryset, per_page, ordering=POSTS_CURSOR_ORDERING):
+        self.queryset = queryset.order_by(*ordering)
+        self.per_page = int(per_page)
+        self.ordering = ordering
+
+    def seek(self, values, backwards=False):
+        """Return the filter selecting the rows that come after, or before when backwards, the given ordering values."""
+        condition = Q()
+        equal = {}
+        for field, value in zip(self.ordering, values):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') != backwards else 'gt'
+            condition |= Q(**equal, **{f'{name}__{lookup}': value})
+            equal[name] = value
+        return condition
+
+    def cursor(self, obj):
+        return encode_cursor([cursor_value(obj, field.lstrip('-')) for field in self.ordering])
+
+    def page(self, after=None, before=None):
+        """Return the page after or before the given token, or the first page. Raise InvalidCursor for a bad token."""
+        if before:
+            return self.page_before(before)
+        queryset = self.queryset
+        if after:
+            queryset = queryset.filter(self.seek(decode_cursor(after, len(self.ordering))))
+        rows = list(queryset[:self.per_page + 1])
+        next_after = None
+        if len(rows) > self.per_page:
+            rows = rows[:self.per_page]
+            next_after = self.cursor(rows[-1])
+        previous_before = self.cursor(rows[0]) if after and rows else None
+        return CursorPage(rows, next_after, previous_before)
+
+    def page_before(self, before):
+        """Return the page that ends just before the given token, or the first page when fewer rows precede it."""
+        values = decode_cursor(before, len(self.ordering))
+        reverse_ordering = [field[1:] if field.startswith('-') else f'-{field}' for field in self.ordering]
+        queryset = self.queryset.filter(self.seek(values, backwards=True)).order_by(*reverse_ordering)
+        rows = list(queryset[:self.per_page + 1])
+        if len(rows) <= self.per_page:
+            return self.page()
+        rows = rows[:self.per_page][::-1]
+        return CursorPage(rows, self.cursor(rows[-1]), self.cursor(rows[0]))
+
+    def get_page(self, after=None, before=None):
+        """Return a valid page even if a token is malformed, by falling back to the first page."""
+        try:
+            return self.page(after, before)
+        except InvalidCursor:
+            return self.page()
+
+
+def paginate(request, queryset, per_page, ordering=POSTS_CURSOR_ORDERING):
+    """Return the requested page of a queryset, by ?page= number when given and by ?after= or ?before= token otherwise.
+
+    The first page is a cursor page too, so its Next link leads on to ?after= pages."""
+    if 'page' in request.GET:
+        return Paginator(queryset.order_by(*ordering), per_page).get_page(request.GET.get('page'))
+    return CursorPaginator(queryset, per_page, ordering).get_page(request.GET.get('after'), request.GET.get('before'))
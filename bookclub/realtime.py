@@ -0,0 +1,136 @@
+"""Live delivery of new chat messages to open chats over ASGI websockets.
+
+The broadcast layer lives in the memory of one process, so every websocket of a chat must be served by
+the same ASGI server process as the views that publish to it."""
+import asyncio
+import json
+import re
+import threading
+from http.cookies import SimpleCookie
+from importlib import import_module
+from urllib.parse import urlparse
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import HASH_SESSION_KEY, SESSION_KEY
+from django.db.models import Q
+from django.http.request import split_domain_port, validate_host
+from django.utils.crypto import constant_time_compare
+from bookclub.models import Chat, User
+
+CHAT_PATH = re.compile(r'^/ws/chat/(?P<pk>[0-9]+)/$')
+
+
+class ChatBroadcaster:
+    """Fan out published messages to the queues of every websocket subscribed to a chat."""
+
+    def __init__(self):
+        self.subscribers = {}
+        self.lock = threading.Lock()
+
+    def subscribe(self, chat_id):
+        """Return a new queue, on the running event loop, receiving the messages published to a chat."""
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue())
+        with self.lock:
+            self.subscribers.setdefault(chat_id, set()).add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, chat_id, subscriber):
+        with self.lock:
+            chat_subscribers = self.subscribers.get(chat_id, set())
+            chat_subscribers.discard(subscriber)
+            if not chat_subscribers:
+                self.subscribers.pop(chat_id, None)
+
+    def publish(self, chat_id, payload):
+        """Queue a payload for every subscriber of a chat, from any thread, and return how many there were."""
+        with self.lock:
+            chat_subscribers = list(self.subscribers.get(chat_id, ()))
+        for loop, queue in chat_subscribers:
+            loop.call_soon_threadsafe(queue.put_nowait, payload)
+        return len(chat_subscribers)
+
+
+broadcaster = ChatBroadcaster()
+
+
+def message_payload(message):
+    return {
+        'id': message.id,
+        'sender': message.sender_user_id,
+        'body': message.body,
+        'date': message.date.isoformat(),
+    }
+
+
+def publish_message(message):
+    """Send a newly saved message to the open websockets of its chat."""
+    return broadcaster.publish(message.chat_id, message_payload(message))
+
+
+def get_scope_user(scope):
+    """Return the user logged in to the session of a websocket handshake, or None."""
+    cookies = SimpleCookie()
+    for name, value in scope.get('headers', ()):
+        if name == b'cookie':
+            cookies.load(value.decode('latin-1'))
+    if settings.SESSION_COOKIE_NAME not in cookies:
+        return None
+    session = import_module(settings.SESSION_ENGINE).SessionStore(cookies[settings.SESSION_COOKIE_NAME].value)
+    user = User.objects.filter(pk=session.get(SESSION_KEY)).first()
+    if user is None or not constant_time_compare(session.get(HASH_SESSION_KEY, ''), user.get_session_auth_hash()):
+        return None
+    return user
+
+
+def is_allowed_origin(scope):
+    """Return whether a websocket handshake was opened by a page of one of the ALLOWED_HOSTS.
+
+    Browsers send the session cookie with cross-site websockets too, and their Origin header is the only sign
+    of where the page came from, so handshakes without one are refused as well."""
+    origin = dict(scope.get('headers', ())).get(b'origin')
+    if origin is None:
+        return False
+    domain, port = split_domain_port(urlparse(origin.decode('latin-1')).netloc)
+    allowed_hosts = settings.ALLOWED_HOSTS
+    if settings.DEBUG and not allowed_hosts:
+        allowed_hosts = ['.localhost', '127.0.0.1', '[::1]']
+    return bool(domain) and validate_host(domain, allowed_hosts)
+
+
+def can_join_chat(scope, chat_id):
+    user = get_scope_user(scope)
+    if user is None:
+        return False
+    return Chat.objects.filter(Q(low_user=user) | Q(high_user=user), pk=chat_id).exists()
+
+
+async def chat_websocket(scope, receive, send):
+    """ASGI application streaming the new messages of one chat to a participant of it."""
+    match = CHAT_PATH.match(scope['path'])
+    event = await receive()
+    if event['type'] != 'websocket.connect':
+        return
+    if match is None or not is_allowed_origin(scope) or not await sync_to_async(can_join_chat)(scope, int(match['pk'])):
+        await send({'type': 'websocket.close', 'code': 4403})
+        return
+
+    chat_id = int(match['pk'])
+    subscriber = broadcaster.subscribe(chat_id)
+    await send({'type': 'websocket.accept'})
+    disconnected = asyncio.ensure_future(wait_for_disconnect(receive))
+    try:
+        while True:
+            payload = asyncio.ensure_future(subscriber[1].get())
+            await asyncio.wait({payload, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+            if disconnected.done():
+                payload.cancel()
+                break
+            await send({'type': 'websocket.send', 'text': json.dumps(payload.result())})
+    finally:
+        broadcaster.unsubscribe(chat_id, subscriber)
+        disconnected.cancel()
+
+
+async def wait_for_disconnect(receive):
+    while (await receive())['type'] != 'websocket.disconnect':
+        pass
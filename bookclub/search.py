@@ -0,0 +1,223 @@
+"""Full-text search over books, clubs and users, ranked by relevance.
+
+On SQLite every searchable table has an FTS5 copy kept in sync by the post_save and post_delete signals of its
+model. On Postgres the same columns are searched through a GIN index on their tsvector, which Postgres maintains."""
+import re
+import time
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+
+# Key, in the shared cache, of the number that changes whenever the index does in any process. It is part of
+# the key of every cached search result, so results cached by one process go stale when another changes the index
+INDEX_VERSION_KEY = 'search-index-version'
+
+# Relevance weights, from most to least important, in Postgres setweight() labels
+WEIGHTS = {'A': 10.0, 'B': 4.0, 'C': 2.0, 'D': 1.0}
+
+
+class SearchIndex:
+    """The table behind a kind of search result and its searchable columns with their weights."""
+
+    def __init__(self, table, columns):
+        self.table = table
+        self.columns = columns
+
+    @property
+    def column_names(self):
+        return [column for column, weight in self.columns]
+
+    @property
+    def fts_table(self):
+        return f'{self.table}_fts'
+
+
+SEARCH_INDEXES = {
+    'book': SearchIndex('bookclub_book', (
+        ('title', 'A'), ('author', 'B'), ('isbn', 'C'), ('pub_year', 'D'), ('publisher', 'D'),
+    )),
+    'club': SearchIndex('bookclub_club', (('name', 'A'),)),
+    'user': SearchIndex('bookclub_user', (('first_name', 'A'), ('last_name', 'A'), ('email', 'B'))),
+}
+
+
+def query_terms(query):
+    """Return the lower case words of a query, the only characters either backend is ever sent."""
+    return re.findall(r'\w+', (query or '').lower())
+
+
+class SqliteSearchBackend:
+    """FTS5 virtual tables whose rowid is the id of the indexed row, ranked with bm25."""
+
+    def create(self, cursor):
+        for index in SEARCH_INDEXES.values():
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {index.fts_table} "
+                f"USING fts5({', '.join(index.column_names)}, prefix='2 3')"
+            )
+            self.rebuild(cursor, index)
+
+    def drop(self, cursor):
+        for index in SEARCH_INDEXES.values():
+            cursor.execute(f'DROP TABLE IF EXISTS {index.fts_table}')
+
+    def rebuild(self, cursor, index):
+        columns = ', '.join(index.column_names)
+        cursor.execute(f'DELETE FROM {index.fts_table}')
+        cursor.execute(f'INSERT INTO {index.fts_table} (rowid, {columns}) SELECT id, {columns} FROM {index.table}')
+
+    def index_row(self, cursor, index, pk):
+        columns = ', '.join(index.column_names)
+        cursor.execute(f'DELETE FROM {index.fts_table} WHERE rowid = %s', [pk])
+        cursor.execute(
+            f'INSERT INTO {index.fts_table} (rowid, {columns}) SELECT id, {columns} FROM {index.table} WHERE id = %s',
+            [pk]
+        )
+
+    def remove_row(self, cursor, index, pk):
+        cursor.execute(f'DELETE FROM {index.fts_table} WHERE rowid = %s', [pk])
+
+    def match(self, terms):
+        return ' '.join(f'"{term}"*' for term in terms)
+
+    def search_ids(self, cursor, index, terms, limit, offset):
+        weights = ', '.join(str(WEIGHTS[weight]) for column, weight in index.columns)
+        cursor.execute(
+            f'SELECT rowid FROM {index.fts_table} WHERE {index.fts_table} MATCH %s '
+            f'ORDER BY bm25({index.fts_table}, {weights}), rowid LIMIT %s OFFSET %s',
+            [self.match(terms), -1 if limit is None else limit, offset]
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+    def count(self, cursor, index, terms):
+        cursor.execute(f'SELECT COUNT(*) FROM {index.fts_table} WHERE {index.fts_table} MATCH %s', [self.match(terms)])
+        return cursor.fetchone()[0]
+
+
+class PostgresSearchBackend:
+    """GIN indexes on a weighted tsvector expression of the searchable columns, ranked with ts_rank."""
+
+    def vector(self, index):
+        # Words are split on the same \w boundaries as query_terms, so e-mail addresses match word by word
+        return ' || '.join(
+            f"setweight(to_tsvector('simple', regexp_replace(coalesce({column}::text, ''), '\\W+', ' ', 'g')), '{weight}')"
+            for column, weight in index.columns
+        )
+
+    def create(self, cursor):
+        for index in SEARCH_INDEXES.values():
+            cursor.execute(
+                f'CREATE INDEX IF NOT EXISTS {index.table}_search_idx ON {index.table} USING GIN (({self.vector(index)}))'
+            )
+
+    def drop(self, cursor):
+        for index in SEARCH_INDEXES.values():
+            cursor.execute(f'DROP INDEX IF EXISTS {index.table}_search_idx')
+
+    def index_row(self, cursor, index, pk):
+        pass
+
+    def remove_row(self, cursor, index, pk):
+        pass
+
+    def tsquery(self, terms):
+        return ' & '.join(f'{term}:*' for term in terms)
+
+    def search_ids(self, cursor, index, terms, limit, offset):
+        vector = self.vector(index)
+        cursor.execute(
+            f"SELECT id FROM {index.table} WHERE ({vector}) @@ to_tsquery('simple', %s) "
+            f"ORDER BY ts_rank(({vector}), to_tsquery('simple', %s)) DESC, id LIMIT %s OFFSET %s",
+            [self.tsquery(terms), self.tsquery(terms), limit, offset]
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+    def count(self, cursor, index, terms):
+        cursor.execute(
+            f"SELECT COUNT(*) FROM {index.table} WHERE ({self.vector(index)}) @@ to_tsquery('simple', %s)",
+            [self.tsquery(terms)]
+        )
+        return cursor.fetchone()[0]
+
+
+BACKENDS = {
+    'sqlite': SqliteSearchBackend,
+    'postgresql': PostgresSearchBackend,
+}
+
+
+def get_backend(vendor=None):
+    vendor = vendor or connection.vendor
+    if vendor not in BACKENDS:
+        raise ImproperlyConfigured(f'Search is not supported on {vendor} databases')
+    return BACKENDS[vendor]()
+
+
+def rebuild_search_indexes():
+    """Index every row again, after rows were written without signals such as by bulk_create."""
+    with connection.cursor() as cursor:
+        backend = get_backend()
+        backend.drop(cursor)
+        backend.create(cursor)
+    bump_index_version()
+
+
+def search_ids(kind, query, limit=None, offset=0):
+    """Return the ids of the rows of a kind matching every word of a query, as a prefix, best first."""
+    terms = query_terms(query)
+    if not terms:
+        return []
+    with connection.cursor() as cursor:
+        return get_backend().search_ids(cursor, SEARCH_INDEXES[kind], terms, limit, offset)
+
+
+def count_matches(kind, query):
+    """Return how many rows of a kind match a query, counted in the index."""
+    terms = query_terms(query)
+    if not terms:
+        return 0
+    with connection.cursor() as cursor:
+        return get_backend().count(cursor, SEARCH_INDEXES[kind], terms)
+
+
+def in_id_order(model, ids):
+    """Return the instances of a model with the given ids, in the same order."""
+    found = model.objects.in_bulk(ids)
+    return [found[pk] for pk in ids if pk in found]
+
+
+def search(model, query, limit=None, offset=0):
+    """Return the instances of a model matching a query, best first."""
+    return in_id_order(model, search_ids(model._meta.model_name, query, limit, offset))
+
+
+def normalise_query(query):
+    return ' '.join(query_terms(query))
+
+
+def get_index_version():
+    """Return the current version of the index, starting from the clock so a lost version is never reused."""
+    return caches['shared'].get_or_set(INDEX_VERSION_KEY, time.time_ns, None)
+
+
+def bump_index_version():
+    """Make every cached search result stale, in every process."""
+    try:
+        caches['shared'].incr(INDEX_VERSION_KEY)
+    except ValueError:
+        caches['shared'].set(INDEX_VERSION_KEY, time.time_ns(), None)
+
+
+def object_saved(sender, instance, update_fields=None, **kwargs):
+    index = SEARCH_INDEXES[sender._meta.model_name]
+    if update_fields is not None and not set(update_fields) & set(index.column_names):
+        return
+    with connection.cursor() as cursor:
+        get_backend().index_row(cursor, index, instance.pk)
+    bump_index_version()
+
+
+def object_deleted(sender, instance, **kwargs):
+    with connection.cursor() as cursor:
+        get_backend().remove_row(cursor, SEARCH_INDEXES[sender._meta.model_name], instance.pk)
+    bump_index_version()
@@ -63,6 +63,16 @@ class TestPasswordForm(TestCase):
         form = PasswordForm(user=self.user, data=self.form_input)
         self.assertFalse(form.is_valid())
 
+    def test_saving_keeps_the_unread_counter(self):
+        """Testing that changing the password does not overwrite a counter updated since the user was loaded."""
+        User.objects.filter(pk=self.user.pk).update(inbox_count=4)
+        form = PasswordForm(user=self.user, data=self.form_input)
+        self.assertTrue(form.is_valid())
+        form.save()
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password('NewPassword123'))
+        self.assertEqual(self.user.inbox_count, 4)
+
     def test_password_form_when_user_is_none_raises_error(self):
         """Testing for a raised attribute error upon finding a blank user"""
         form = PasswordForm(user=None)
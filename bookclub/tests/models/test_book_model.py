@@ -164,6 +164,23 @@ class BookModelTestCase(TestCase):
         self.book_one.large_url = "example.com"
         self._assert_book_is_invalid()
 
+    # manager tests
+
+    def test_in_isbn_order_keeps_the_given_order(self):
+        """Test if books resolved from ISBNs come back in the order of the ISBNs."""
+        books = Book.objects.in_isbn_order(["12345678911", "12345678910"])
+        self.assertEqual(books, [self.book_two, self.book_one])
+
+    def test_in_isbn_order_skips_unknown_and_repeated_isbns(self):
+        """Test if ISBNs without a book, or given twice, are skipped."""
+        books = Book.objects.in_isbn_order(["0000000000", "12345678910", "12345678910"])
+        self.assertEqual(books, [self.book_one])
+
+    def test_in_isbn_order_uses_one_query(self):
+        """Test if resolving many ISBNs only needs a single query."""
+        with self.assertNumQueries(1):
+            Book.objects.in_isbn_order(["12345678910", "12345678911", "12345678912"])
+
     def _assert_book_is_invalid(self):
         """Test if book at its present state is invalid"""
         with self.assertRaises(ValidationError):
@@ -1,7 +1,8 @@
 """Unit tests for the Chat model"""
 from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
 from django.test import TestCase
-from bookclub.models import Chat, User
+from bookclub.models import Chat, User, get_or_create_chat
 
 
 class ChatModelTestCase(TestCase):
@@ -32,3 +33,28 @@ class ChatModelTestCase(TestCase):
         """Test if chat at its present state is invalid"""
         with self.assertRaises(ValidationError):
             self.chat_john_to_jane.full_clean()
+
+    def test_chat_pair_is_ordered_by_user_id(self):
+        """Test that the pair of a chat is the same whichever user started it"""
+        chat = Chat.objects.create(user=User.objects.get(pk=3), receiver=self.john)
+        self.assertEqual((chat.low_user, chat.high_user), (self.john, User.objects.get(pk=3)))
+
+    def test_chat_pair_must_be_unique(self):
+        """Test that a second chat between the same users cannot be saved"""
+        with self.assertRaises(IntegrityError):
+            with transaction.atomic():
+                Chat.objects.create(user=self.jane, receiver=self.john)
+
+    def test_get_or_create_chat_finds_chat_in_either_direction(self):
+        """Test that the helper returns the existing chat with one query"""
+        with self.assertNumQueries(1):
+            chat, created = get_or_create_chat(self.jane, self.john)
+        self.assertEqual(chat, self.chat_john_to_jane)
+        self.assertFalse(created)
+
+    def test_get_or_create_chat_creates_missing_chat(self):
+        """Test that the helper starts a new chat from the first user"""
+        joe = User.objects.get(pk=3)
+        chat, created = get_or_create_chat(joe, self.john)
+        self.assertTrue(created)
+        self.assertEqual((chat.user, chat.receiver), (joe, self.john))
@@ -1,7 +1,8 @@
 """Unit tests for the Club model"""
 from django.core.exceptions import ValidationError
 from django.test import TestCase
-from bookclub.models import User, Club
+from django.db import IntegrityError, transaction
+from bookclub.models import User, Club, ClubMembership
 
 
 # Adapted from the Clucker project and Chess club management system
@@ -189,3 +190,63 @@ class ClubModelTestCase(TestCase):
         self.club_bush_house.description = "a" * 512
         with self.assertRaisesMessage(AssertionError, 'ValidationError not raised'):
             self._assert_book_club_is_invalid()
+
+    # testing the club membership table
+
+    def test_each_user_has_a_single_membership_row_per_club(self):
+        """Testing if promoting and demoting update the role of a single membership row."""
+        self.club_bush_house.make_member(self.user_two)
+        self.club_bush_house.make_member(self.user_two)
+        self.club_bush_house.make_organiser(self.user_two)
+        memberships = ClubMembership.objects.filter(club=self.club_bush_house, user=self.user_two)
+        self.assertEqual(list(memberships.values_list('role', flat=True)), [ClubMembership.ORGANISER])
+        self.club_bush_house.demote_organiser(self.user_two)
+        self.assertEqual(list(memberships.values_list('role', flat=True)), [ClubMembership.MEMBER])
+
+    def test_membership_must_be_unique(self):
+        """Testing if a user cannot hold two memberships of the same club."""
+        ClubMembership.objects.create(club=self.club_bush_house, user=self.user_two)
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            ClubMembership.objects.create(club=self.club_bush_house, user=self.user_two, role=ClubMembership.ORGANISER)
+
+    def test_user_level_uses_one_query(self):
+        """Testing if a user's level is read from one membership row."""
+        self.club_bush_house.make_member(self.user_two)
+        self.club_bush_house.make_organiser(self.user_two)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.club_bush_house.user_level(self.user_two), "Organiser")
+        with self.assertNumQueries(0):
+            self.assertEqual(self.club_bush_house.user_level(self.user_one), "Owner")
+
+    def test_get_all_users_includes_owner_organisers_and_members(self):
+        """Testing if every user of a club is returned by one query."""
+        self.club_bush_house.make_member(self.user_two)
+        self.club_bush_house.make_organiser(self.user_two)
+        user_three = User.objects.get(pk=3)
+        self.club_bush_house.make_member(user_three)
+        with self.assertNumQueries(1):
+            users = set(self.club_bush_house.get_all_users())
+        self.assertEqual(users, {self.user_one, self.user_two, user_three})
+
+    def test_make_owner_makes_previous_owner_a_member(self):
+        """Testing if transferring ownership turns the old owner into a member."""
+        self.club_bush_house.make_member(self.user_two)
+        self.club_bush_house.make_owner(self.user_two)
+        self.assertEqual(self.club_bush_house.user_level(self.user_two), "Owner")
+        self.assertEqual(self.club_bush_house.user_level(self.user_one), "Member")
+        self.assertFalse(ClubMembership.objects.filter(club=self.club_bush_house, user=self.user_two).exists())
+
+    def test_cannot_remove_owner_from_club(self):
+        """Test the owner cannot be removed from the club, raises Value Error."""
+        with self.assertRaises(ValueError):
+            self.club_bush_house.remove_from_club(self.user_one)
+
+    def test_get_role_map_uses_one_query(self):
+        """Testing if the level of everyone in the club is read with one query."""
+        user_three = User.objects.get(pk=3)
+        self.club_bush_house.make_member(self.user_two)
+        self.club_bush_house.make_member(user_three)
+        self.club_bush_house.make_organiser(user_three)
+        with self.assertNumQueries(1):
+            roles = self.club_bush_house.get_role_map()
+        self.assertEqual(roles, {self.user_one.id: "Owner", self.user_two.id: "Member", user_three.id: "Organiser"})
@@ -0,0 +1,88 @@
+"""Unit tests for the fan-out-on-write timeline"""
+from datetime import timedelta
+from django.test import TestCase
+from django.utils import timezone
+from bookclub.models import User, Club, Post, UserPost, TimelineEntry
+from bookclub.paginators import TIMELINE_CURSOR_ORDERING
+from bookclub.timeline import get_timeline_posts, get_timeline_club_posts, get_timeline_user_posts
+
+
+class TimelineEntryModelTestCase(TestCase):
+    """Test case for the TimelineEntry model and the timeline fan-out"""
+
+    fixtures = [
+        "bookclub/tests/fixtures/default_users.json",
+        "bookclub/tests/fixtures/default_clubs.json"
+    ]
+
+    def setUp(self):
+        self.john = User.objects.get(email='johndoe@bookclub.com')
+        self.jane = User.objects.get(email='janedoe@bookclub.com')
+        self.joe = User.objects.get(email='joedoe@bookclub.com')
+        self.bush_club = Club.objects.get(name='Bush House Book Club')
+
+    def test_club_post_is_fanned_out_to_everyone_in_the_club(self):
+        self.bush_club.make_member(self.jane)
+        post = Post.objects.create(author=self.john, club=self.bush_club, text="A club post")
+        self.assertEqual(
+            set(TimelineEntry.objects.filter(post=post).values_list('user_id', flat=True)),
+            {self.john.id, self.jane.id}
+        )
+        self.assertFalse(TimelineEntry.objects.filter(user=self.joe).exists())
+
+    def test_user_post_is_fanned_out_to_followers(self):
+        self.jane._follow(self.john)
+        user_post = UserPost.objects.create(author=self.john, text="A user post")
+        self.assertEqual(list(TimelineEntry.objects.filter(user_post=user_post).values_list('user_id', flat=True)),
+                         [self.jane.id])
+
+    def test_following_adds_and_unfollowing_removes_earlier_posts(self):
+        UserPost.objects.create(author=self.john, text="A user post")
+        self.jane.toggle_follow(self.john)
+        self.assertEqual(len(get_timeline_user_posts(self.jane)), 1)
+        self.jane.toggle_follow(self.john)
+        self.assertEqual(len(get_timeline_user_posts(self.jane)), 0)
+
+    def test_joining_adds_and_leaving_removes_earlier_club_posts(self):
+        Post.objects.create(author=self.john, club=self.bush_club, text="A club post")
+        self.bush_club.make_member(self.jane)
+        self.assertEqual(len(get_timeline_club_posts(self.jane)), 1)
+        self.bush_club.make_organiser(self.jane)
+        self.assertEqual(len(get_timeline_club_posts(self.jane)), 1)
+        self.bush_club.remove_from_club(self.jane)
+        self.assertEqual(len(get_timeline_club_posts(self.jane)), 0)
+
+    def test_transferring_ownership_keeps_both_timelines(self):
+        Post.objects.create(author=self.john, club=self.bush_club, text="A club post")
+        self.bush_club.make_member(self.jane)
+        self.bush_club.make_owner(self.jane)
+        self.assertEqual(len(get_timeline_club_posts(self.jane)), 1)
+        self.assertEqual(len(get_timeline_club_posts(self.john)), 1)
+
+    def test_saving_a_club_does_not_sync_its_timeline_again(self):
+        Post.objects.create(author=self.john, club=self.bush_club, text="A club post")
+        TimelineEntry.objects.filter(user=self.john).delete()
+        self.bush_club.description = "A new description"
+        self.bush_club.save()
+        self.assertFalse(TimelineEntry.objects.filter(user=self.john).exists())
+
+    def test_timeline_club_posts_are_ordered_by_their_timeline_entries(self):
+        older = Post.objects.create(author=self.john, club=self.bush_club, text="Older")
+        newer = Post.objects.create(author=self.john, club=self.bush_club, text="Newer")
+        TimelineEntry.objects.filter(post=older).update(created_at=timezone.now() + timedelta(hours=1))
+        posts = get_timeline_club_posts(self.john).order_by(*TIMELINE_CURSOR_ORDERING)
+        self.assertEqual(list(posts), [older, newer])
+
+    def test_timeline_posts_are_newest_first_across_clubs_and_followees(self):
+        self.jane._follow(self.john)
+        self.bush_club.make_member(self.jane)
+        first = Post.objects.create(author=self.john, club=self.bush_club, text="First")
+        second = UserPost.objects.create(author=self.john, text="Second")
+        third = Post.objects.create(author=self.john, club=self.bush_club, text="Third")
+        self.assertEqual(get_timeline_posts(self.jane, 5), [third, second, first])
+        self.assertEqual(get_timeline_posts(self.jane, 2), [third, second])
+
+    def test_deleting_a_post_removes_it_from_timelines(self):
+        post = Post.objects.create(author=self.john, club=self.bush_club, text="A club post")
+        post.delete()
+        self.assertFalse(TimelineEntry.objects.exists())
@@ -1,5 +1,6 @@
 """Unit tests for the User model"""
 from django.core.exceptions import ValidationError
+from django.core.cache import caches
 from django.test import TestCase
 from bookclub.models import User, Club
 
@@ -194,3 +195,48 @@ class UserModelTestCase(TestCase):
         jane.toggle_follow(john)
         self.assertEqual(john.followers.all()[0], john.get_users_followers()[0])
         self.assertEqual(jane.followers.all()[0], jane.get_users_followers()[0])
+
+    def test_get_all_clubs_includes_every_role_with_one_query(self):
+        somerset = Club.objects.get(pk=2)
+        strand = Club.objects.get(pk=3)
+        somerset.make_member(self.user_three)
+        strand.make_member(self.user_three)
+        strand.make_organiser(self.user_three)
+        strand.make_owner(self.user_three)
+        temple = Club.objects.get(pk=4)
+        temple.make_member(self.user_three)
+        temple.make_organiser(self.user_three)
+        with self.assertNumQueries(1):
+            clubs = list(self.user_three.get_all_clubs())
+        self.assertEqual(clubs, sorted([somerset, strand, temple], key=lambda club: club.name))
+        self.assertEqual(self.user_three.get_number_of_clubs(), 3)
+
+    def test_get_all_clubs_is_empty_for_user_without_clubs(self):
+        self.assertEqual(list(self.user_four.get_all_clubs()), [])
+        self.assertEqual(self.user_four.get_number_of_clubs(), 0)
+
+    def test_get_cached_clubs_only_looks_up_memberships_once(self):
+        caches['shared'].clear()
+        club = Club.objects.get(pk=2)
+        club.make_member(self.user_three)
+        self.assertEqual(self.user_three.get_cached_clubs(), [club])
+        with self.assertNumQueries(1):
+            self.assertEqual(self.user_three.get_cached_clubs(), [club])
+
+    def test_get_cached_clubs_follows_membership_changes(self):
+        caches['shared'].clear()
+        somerset = Club.objects.get(pk=2)
+        strand = Club.objects.get(pk=3)
+        self.assertEqual(self.user_three.get_cached_clubs(), [])
+        somerset.make_member(self.user_three)
+        strand.make_member(self.user_three)
+        self.assertEqual(self.user_three.get_cached_clubs(), [somerset, strand])
+        somerset.remove_from_club(self.user_three)
+        self.assertEqual(self.user_three.get_cached_clubs(), [strand])
+        self.assertEqual(self.user_one.get_cached_clubs(), [Club.objects.get(pk=1), strand])
+        strand.make_owner(self.user_three)
+        self.assertEqual(self.user_three.get_cached_clubs(), [strand])
+        strand.remove_from_club(self.user_one)
+        self.assertEqual(self.user_one.get_cached_clubs(), [Club.objects.get(pk=1)])
+        strand.disband()
+        self.assertEqual(self.user_three.get_cached_clubs(), [])
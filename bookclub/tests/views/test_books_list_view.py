@@ -74,6 +74,57 @@ class BooksListViewTestCase(TestCase, LogInTester):
         self.assertTrue(page_obj.has_previous())
         self.assertFalse(page_obj.has_next())
 
+    def test_get_book_list_with_cursor_pagination(self):
+        """Testing for book list pages reached by ?after= tokens, in title order."""
+        self.client.login(email=self.user.email, password='Password123')
+        self._create_test_books(settings.BOOKS_PER_PAGE * 2 + 3 - 1)
+        response = self.client.get(self.url, {'after': ''})
+        seen = [book.id for book in response.context['books']]
+        page_obj = response.context['page_obj']
+        self.assertFalse(page_obj.has_previous())
+        while page_obj.has_next():
+            response = self.client.get(self.url, {'after': page_obj.next_after})
+            self.assertEqual(response.status_code, 200)
+            self.assertContains(response, 'First')
+            page_obj = response.context['page_obj']
+            self.assertTrue(page_obj.has_previous())
+            self.assertLessEqual(len(page_obj), settings.BOOKS_PER_PAGE)
+            seen += [book.id for book in response.context['books']]
+        self.assertEqual(seen, list(Book.objects.order_by('title', 'id').values_list('id', flat=True)))
+
+    def test_first_book_list_page_links_to_the_next_cursor_page(self):
+        """Testing if the first page's Next link is an ?after= token."""
+        self.client.login(email=self.user.email, password='Password123')
+        self._create_test_books(settings.BOOKS_PER_PAGE + 1)
+        response = self.client.get(self.url)
+        page_obj = response.context['page_obj']
+        self.assertTrue(page_obj.has_next())
+        self.assertContains(response, f'href="?after={page_obj.next_after}"')
+
+    def test_book_list_cursor_pages_link_back_to_the_previous_page(self):
+        """Testing if ?before= tokens walk back through the same pages the ?after= tokens walked forward."""
+        self.client.login(email=self.user.email, password='Password123')
+        self._create_test_books(settings.BOOKS_PER_PAGE * 2 + 3 - 1)
+        pages = [self.client.get(self.url).context['page_obj']]
+        while pages[-1].has_next():
+            pages.append(self.client.get(self.url, {'after': pages[-1].next_after}).context['page_obj'])
+        self.assertEqual(len(pages), 3)
+        response = self.client.get(self.url, {'after': pages[1].next_after})
+        self.assertContains(response, f'href="?before={pages[2].previous_before}"')
+        page_obj = pages[2]
+        for expected in reversed(pages[:-1]):
+            page_obj = self.client.get(self.url, {'before': page_obj.previous_before}).context['page_obj']
+            self.assertEqual(list(page_obj), list(expected))
+        self.assertFalse(page_obj.has_previous())
+        self.assertEqual(page_obj.next_after, pages[0].next_after)
+
+    def test_get_book_list_with_malformed_cursor_shows_first_page(self):
+        """Testing if an invalid ?after= token falls back to the first page."""
+        self.client.login(email=self.user.email, password='Password123')
+        response = self.client.get(self.url, {'after': 'not-a-token'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.context['books']), list(Book.objects.order_by('title', 'id')))
+
     def test_book_list_view_has_remove_from_reading_list_button_when_book_is_in_reading_list(self):
         """"Testing the remove from reading list button."""
         self.client.login(email=self.user.email, password='Password123')
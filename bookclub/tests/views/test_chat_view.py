@@ -1,6 +1,8 @@
 """Unit tests of the Chats View"""
 from django.conf import settings
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from bookclub.models import User, Club, Application, Chat, Message
 from bookclub.tests.helpers import reverse_with_next
@@ -25,3 +27,87 @@ class ChatViewTestCase(TestCase):
         response = self.client.get(reverse('chat', kwargs={'pk':self.chat.pk}))
         response_url = reverse('home')
         self.assertRedirects(response, response_url, status_code=302, target_status_code=200)
+
+    def test_opening_chat_marks_received_messages_read(self):
+        """Test that opening a chat marks only the messages received by the user as read."""
+        Message.objects.create(chat=self.chat, sender_user=self.john, receiver_user=self.jane, body="Hi Jane")
+        Message.objects.create(chat=self.chat, sender_user=self.jane, receiver_user=self.john, body="Hi John")
+        self.client.login(email=self.jane.email, password='Password123')
+        response = self.client.get(reverse('chat', kwargs={'pk':self.chat.pk}))
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Message.objects.filter(receiver_user=self.jane, is_read=False).exists())
+        self.assertTrue(Message.objects.filter(receiver_user=self.john, is_read=False).exists())
+        self.assertEqual(response.context['inbox_count'], 0)
+
+    def test_opening_chat_decrements_unread_counter(self):
+        """Test that the unread counter of the receiver drops by the messages read."""
+        self.client.login(email=self.jane.email, password='Password123')
+        self.client.get(reverse('home'))
+        Message.objects.create(chat=self.chat, sender_user=self.john, receiver_user=self.jane, body="One")
+        Message.objects.create(chat=self.chat, sender_user=self.john, receiver_user=self.jane, body="Two")
+        self.jane.refresh_from_db()
+        self.assertEqual(self.jane.inbox_count, 2)
+        self.client.get(reverse('chat', kwargs={'pk':self.chat.pk}))
+        self.jane.refresh_from_db()
+        self.assertEqual(self.jane.inbox_count, 0)
+
+    def test_marking_messages_read_is_one_update(self):
+        """Test that opening a chat marks all received messages read in a single update."""
+        for number in range(10):
+            Message.objects.create(chat=self.chat, sender_user=self.john, receiver_user=self.jane, body=f"Message {number}")
+        self.client.login(email=self.jane.email, password='Password123')
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('chat', kwargs={'pk':self.chat.pk}))
+        updates = [query['sql'] for query in queries if query['sql'].startswith('UPDATE "bookclub_message"')]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(Message.objects.filter(receiver_user=self.jane, is_read=True).count(), 10)
+
+    def _create_messages(self, count):
+        return [
+            Message.objects.create(chat=self.chat, sender_user=self.john, receiver_user=self.jane, body=f"Message {number}")
+            for number in range(count)
+        ]
+
+    def test_chat_shows_latest_messages_oldest_first(self):
+        """Test that the chat page only renders the latest page of messages, in order."""
+        created = self._create_messages(settings.MESSAGES_PER_PAGE + 5)
+        self.client.login(email=self.jane.email, password='Password123')
+        response = self.client.get(reverse('chat', kwargs={'pk':self.chat.pk}))
+        self.assertEqual(response.context['message_list'], created[5:])
+        self.assertIsNotNone(response.context['older_after'])
+        self.assertEqual(response.context['last_message_id'], created[-1].id)
+
+    def test_chat_messages_returns_older_messages_by_cursor(self):
+        """Test that the JSON endpoint pages back through older messages."""
+        created = self._create_messages(settings.MESSAGES_PER_PAGE + 5)
+        self.client.login(email=self.jane.email, password='Password123')
+        older_after = self.client.get(reverse('chat', kwargs={'pk':self.chat.pk})).context['older_after']
+        response = self.client.get(reverse('chat_messages', kwargs={'pk':self.chat.pk}), {'before': older_after})
+        data = response.json()
+        self.assertEqual([message['id'] for message in data['messages']], [message.id for message in created[:5]])
+        self.assertIsNone(data['older'])
+        self.assertIn("Message 0", data['messages'][0]['html'])
+
+    def test_chat_messages_returns_newer_messages_since_id(self):
+        """Test that polling returns only the messages after the given id and marks them read."""
+        first = self._create_messages(1)[0]
+        self.client.login(email=self.jane.email, password='Password123')
+        self.client.get(reverse('chat', kwargs={'pk':self.chat.pk}))
+        newer = self._create_messages(2)
+        response = self.client.get(reverse('chat_messages', kwargs={'pk':self.chat.pk}), {'since': first.id})
+        self.assertEqual([message['id'] for message in response.json()['messages']], [message.id for message in newer])
+        self.assertFalse(Message.objects.filter(receiver_user=self.jane, is_read=False).exists())
+
+    def test_chat_messages_forbidden_if_not_yours(self):
+        """Test that the JSON endpoint refuses users outside the chat."""
+        self._create_messages(1)
+        self.client.login(email=self.joe.email, password='Password123')
+        response = self.client.get(reverse('chat_messages', kwargs={'pk':self.chat.pk}), {'since': 0})
+        self.assertEqual(response.status_code, 403)
+
+    def test_chat_messages_rejects_bad_parameters(self):
+        """Test that a malformed id or cursor is a bad request."""
+        self.client.login(email=self.jane.email, password='Password123')
+        url = reverse('chat_messages', kwargs={'pk':self.chat.pk})
+        self.assertEqual(self.client.get(url, {'since': 'abc'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'before': '!!'}).status_code, 400)
@@ -0,0 +1,74 @@
+"""Unit tests of the chat websocket"""
+import json
+from asgiref.sync import sync_to_async
+from asgiref.testing import ApplicationCommunicator
+from django.conf import settings
+from django.test import TestCase
+from django.urls import reverse
+from bookclub.models import User, Chat, Message
+from bookclub.realtime import broadcaster, chat_websocket
+
+
+class ChatWebsocketTestCase(TestCase):
+    """Test case of the chat websocket"""
+
+    fixtures = ['bookclub/tests/fixtures/default_users.json']
+
+    def setUp(self):
+        self.john = User.objects.get(email='johndoe@bookclub.com')
+        self.jane = User.objects.get(email='janedoe@bookclub.com')
+        self.joe = User.objects.get(email='joedoe@bookclub.com')
+        self.chat = Chat.objects.create(user=self.john, receiver=self.jane)
+
+    def _connect(self, user, path=None, origin='http://testserver'):
+        headers = [(b'origin', origin.encode())] if origin else []
+        if user is not None:
+            self.client.login(email=user.email, password='Password123')
+            session_key = self.client.cookies[settings.SESSION_COOKIE_NAME].value
+            headers.append((b'cookie', f'{settings.SESSION_COOKIE_NAME}={session_key}'.encode()))
+        scope = {'type': 'websocket', 'path': path or f'/ws/chat/{self.chat.pk}/', 'headers': headers}
+        return ApplicationCommunicator(chat_websocket, scope)
+
+    async def test_participant_receives_new_messages(self):
+        """Test that a message posted to the chat is pushed to an open websocket"""
+        communicator = await sync_to_async(self._connect)(self.jane)
+        await communicator.send_input({'type': 'websocket.connect'})
+        self.assertEqual((await communicator.receive_output())['type'], 'websocket.accept')
+
+        await sync_to_async(self._connect)(self.john)
+        await sync_to_async(self.client.post)(reverse('create_message', kwargs={'pk': self.chat.pk}), {'message': "Hello"})
+        event = await communicator.receive_output()
+        payload = json.loads(event['text'])
+        self.assertEqual(payload['body'], "Hello")
+        self.assertEqual(payload['sender'], self.john.id)
+        message = await sync_to_async(Message.objects.get)(body="Hello")
+        self.assertEqual(payload['id'], message.id)
+
+        await communicator.send_input({'type': 'websocket.disconnect', 'code': 1000})
+        await communicator.wait()
+        self.assertNotIn(self.chat.pk, broadcaster.subscribers)
+
+    async def test_user_outside_chat_is_refused(self):
+        """Test that a user who is not in the chat cannot open its websocket"""
+        communicator = await sync_to_async(self._connect)(self.joe)
+        await communicator.send_input({'type': 'websocket.connect'})
+        self.assertEqual((await communicator.receive_output())['type'], 'websocket.close')
+
+    async def test_other_origins_are_refused(self):
+        """Test that a page of another site cannot open a participant's websocket with their cookie"""
+        for origin in ('https://evil.example', None):
+            communicator = await sync_to_async(self._connect)(self.jane, origin=origin)
+            await communicator.send_input({'type': 'websocket.connect'})
+            self.assertEqual((await communicator.receive_output())['type'], 'websocket.close')
+
+    async def test_anonymous_user_is_refused(self):
+        """Test that a websocket without a session is closed"""
+        communicator = await sync_to_async(self._connect)(None)
+        await communicator.send_input({'type': 'websocket.connect'})
+        self.assertEqual((await communicator.receive_output())['type'], 'websocket.close')
+
+    async def test_unknown_path_is_refused(self):
+        """Test that websockets outside the chat paths are closed"""
+        communicator = await sync_to_async(self._connect)(self.jane, path='/ws/other/')
+        await communicator.send_input({'type': 'websocket.connect'})
+        self.assertEqual((await communicator.receive_output())['type'], 'websocket.close')
@@ -98,6 +98,24 @@ class ClubFeedViewTestCase(TestCase, LogInTester):
         self.assertEqual(len(context['posts']), len(Post.objects.filter(club=self.bush_club)))
         self.assertEqual(len(response.context['page_obj']), settings.POSTS_PER_PAGE)
         
+    def test_club_feed_with_cursor_pagination(self):
+        """Testing if ?after= pages of the club feed are newest first without gaps or repeats."""
+        self.client.login(email=self.user.email, password="Password123")
+        self._create_test_club_posts(settings.POSTS_PER_PAGE + 3)
+        Post.objects.filter(club=self.bush_club).update(created_at=Post.objects.first().created_at)
+        response = self.client.get(self.url, {'after': ''})
+        first_page = response.context['page_obj']
+        self.assertEqual(len(first_page), settings.POSTS_PER_PAGE)
+        with self.assertNumQueries(5):
+            response = self.client.get(self.url, {'after': first_page.next_after})
+        second_page = response.context['page_obj']
+        self.assertEqual(len(second_page), 3)
+        self.assertFalse(second_page.has_next())
+        self.assertEqual(
+            [post.id for post in first_page] + [post.id for post in second_page],
+            list(Post.objects.filter(club=self.bush_club).order_by('-created_at', '-id').values_list('id', flat=True))
+        )
+
     def post_club_feed_view(self):
         self.client.login(email=self.user.email, password="Password123")
         self._create_test_club_posts(settings.POSTS_PER_PAGE*2+3-1)
@@ -1,6 +1,8 @@
 """Unit tests for the Club Members View"""
 from django.conf import settings
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from bookclub.models import User, Club
 from bookclub.tests.helpers import LogInTester, reverse_with_next
@@ -102,6 +104,21 @@ class ClubMembersViewTestCase(TestCase, LogInTester):
         self.assertTrue(page_obj.has_previous())
         self.assertFalse(page_obj.has_next())
         
+    def test_club_members_list_query_count_does_not_depend_on_page_size(self):
+        """Testing if rendering the members list runs the same number of queries for 2 or 10 members on a page."""
+        self.client.login(email=self.user.email, password='Password123')
+        self._create_test_club_members(1)
+        self.club.make_organiser(User.objects.get(email='user1@test.org'))
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as small_page:
+            self.client.get(self.url)
+        self._create_test_club_members(settings.USERS_PER_PAGE + 5)
+        with CaptureQueriesContext(connection) as full_page:
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.context['page_obj']), settings.USERS_PER_PAGE)
+        self.assertEqual(len(full_page), len(small_page))
+        self.assertEqual(response.context['club_roles'][self.user.id], "Owner")
+
     def test_club_members_view_redirects_when_club_does_not_exist(self):
         """Testing for redirect to home page when non-existent club queried."""
         self.client.login(email=self.user.email, password='Password123')
@@ -113,7 +130,8 @@ class ClubMembersViewTestCase(TestCase, LogInTester):
 
     def _create_test_club_members(self, user_count=10):
         """Creation of club members."""
-        for id in range(1, user_count + 1, 1):
+        first_id = User.objects.filter(email__endswith='@test.org').count() + 1
+        for id in range(first_id, first_id + user_count, 1):
             self.club.make_member(
                 User.objects.create(
                     email=f'user{id}@test.org',
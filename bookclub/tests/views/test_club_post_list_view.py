@@ -2,7 +2,7 @@
 from django.conf import settings
 from django.test import TestCase
 from django.urls import reverse
-from bookclub.models import User, Club, Post
+from bookclub.models import User, Club, Post, TimelineEntry
 from bookclub.tests.helpers import reverse_with_next
 from django.contrib import messages
 
@@ -63,6 +63,23 @@ class ClubPostViewTestCase(TestCase):
         response = self.client.get(self.url)
         self.assertRedirects(response, redirect_url, status_code=302, target_status_code=200)
 
+    def test_club_post_list_with_cursor_pagination_on_timeline_entries(self):
+        """Testing if ?after= pages follow the timeline entries newest first without gaps or repeats."""
+        self.client.login(email=self.john.email, password='Password123')
+        self._create_test_club_posts(settings.POSTS_PER_PAGE + 3)
+        entries = TimelineEntry.objects.filter(user=self.john)
+        entries.update(created_at=entries.first().created_at)
+        response = self.client.get(self.url, {'after': ''})
+        first_page = response.context['page_obj']
+        self.assertEqual(len(first_page), settings.POSTS_PER_PAGE)
+        response = self.client.get(self.url, {'after': first_page.next_after})
+        second_page = response.context['page_obj']
+        self.assertFalse(second_page.has_next())
+        self.assertEqual(
+            [post.id for post in first_page] + [post.id for post in second_page],
+            list(entries.order_by('-created_at', '-id').values_list('post_id', flat=True))
+        )
+
     def test_get_club_post_list_with_pagination(self):
         """Testing for club post list with pagination."""
         self.client.login(email=self.john.email, password='Password123')
@@ -1,10 +1,14 @@
 """Unit tests for the Create Message View."""
 from django.conf import settings
-from django.test import TestCase
+from unittest import mock
+from django.db.models import QuerySet
+from django.test import TestCase, RequestFactory
 from django.urls import reverse
 from bookclub.models import User, Club, Application, Chat, Message
 from bookclub.tests.helpers import reverse_with_next
 from django.contrib import messages
+from bookclub.context_processors import inbox_count
+from bookclub.inbox import get_unread_count
 
 
 class CreateMessageViewTestCase(TestCase):
@@ -40,3 +44,43 @@ class CreateMessageViewTestCase(TestCase):
         self.assertTemplateUsed(response, 'chat.html')
         afterCount = Message.objects.count()
         self.assertEqual(beforeCount+1, afterCount)
+
+    def test_creation_increments_receiver_unread_counter(self):
+        """Testing that a new message adds one to the unread counter of its receiver."""
+        Message.objects.create(chat=self.chat, sender_user=self.john, receiver_user=self.jane, body="Earlier")
+        self.client.login(email=self.jane.email, password='Password123')
+        response = self.client.get(reverse('home'))
+        self.assertEqual(response.context['inbox_count'], 1)
+        self.client.logout()
+        self.client.login(email=self.john.email, password='Password123')
+        self.client.post(reverse('create_message', kwargs={'pk':self.chat.pk}), {'message': "Later"})
+        self.jane.refresh_from_db()
+        self.assertEqual(self.jane.inbox_count, 2)
+
+    def test_inbox_count_context_processor_is_read_only(self):
+        """Testing that a known unread counter is exposed without any query."""
+        self.jane.inbox_count = 3
+        request = RequestFactory().get(reverse('home'))
+        request.user = self.jane
+        with self.assertNumQueries(0):
+            self.assertEqual(inbox_count(request), {'inbox_count': 3})
+
+    def test_message_created_while_counting_is_not_lost(self):
+        """Testing that a message saved while an unknown counter is being counted is still counted."""
+        Message.objects.create(chat=self.chat, sender_user=self.john, receiver_user=self.jane, body="Earlier")
+        User.objects.filter(pk=self.jane.pk).update(inbox_count=None)
+        self.jane.refresh_from_db()
+        update = QuerySet.update
+        sent = []
+
+        def update_then_send(queryset, **kwargs):
+            rows = update(queryset, **kwargs)
+            if not sent:
+                sent.append(True)
+                Message.objects.create(chat=self.chat, sender_user=self.john, receiver_user=self.jane, body="Meanwhile")
+            return rows
+
+        with mock.patch.object(QuerySet, 'update', autospec=True, side_effect=update_then_send):
+            self.assertEqual(get_unread_count(self.jane), 2)
+        self.jane.refresh_from_db()
+        self.assertEqual(self.jane.inbox_count, 2)
@@ -112,3 +112,10 @@ class EditClubViewTest(TestCase):
         self.assertEqual(self.club.description, 'New description')
         self.assertEqual(self.club.location, 'Strand, London, England')
         self.assertEqual(self.club.meeting_online, False)
+
+    def test_successful_profile_update_refreshes_cached_clubs(self):
+        """Testing if the club switcher shows the new club name after an update."""
+        self.client.login(email='johndoe@bookclub.com', password='Password123')
+        self.assertEqual(self.user.get_cached_clubs()[0].name, self.club.name)
+        self.client.post(self.url, self.form_input)
+        self.assertIn('Bush House Book Club Remastered', [club.name for club in self.user.get_cached_clubs()])
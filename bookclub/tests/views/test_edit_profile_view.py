@@ -120,6 +120,16 @@ class ProfileViewTest(TestCase):
         self.assertEqual(self.user.location, "London")
         self.assertEqual(self.user.age, 39)
 
+    def test_profile_update_keeps_the_unread_counter(self):
+        """Testing that saving the profile does not overwrite a counter updated since the user was loaded."""
+        form = UserForm(instance=self.user, data=self.form_input)
+        User.objects.filter(pk=self.user.pk).update(inbox_count=4)
+        self.assertTrue(form.is_valid())
+        form.save()
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.first_name, 'John2')
+        self.assertEqual(self.user.inbox_count, 4)
+
     def test_post_profile_redirects_when_not_logged_in(self):
         """Test if not logged in, redirect to post profile."""
         redirect_url = reverse_with_next('login', self.url)
@@ -1,8 +1,13 @@
 """Unit tests of the Home View."""
-from django.test import TestCase
+import tempfile
+import numpy as np
+from django.test import TestCase, override_settings
 from django.urls import reverse
-from bookclub.models import User, Rating, RecommendedBook, Post
+from bookclub.models import User, Rating, RecommendedBook, Post, Book
 from bookclub.tests.helpers import reverse_with_next
+from recommender.artifacts import SVDModel, save_model
+from recommender.jobs import run_pending_jobs
+from recommender.models import RecommendationJob
 
 
 class HomeViewTestCase(TestCase):
@@ -10,7 +15,8 @@ class HomeViewTestCase(TestCase):
 
     fixtures = ['bookclub/tests/fixtures/default_users.json',
                 'bookclub/tests/fixtures/default_clubs.json',
-                'bookclub/tests/fixtures/default_posts.json']
+                'bookclub/tests/fixtures/default_posts.json',
+                'bookclub/tests/fixtures/default_books.json']
 
     def setUp(self):
         self.url = reverse('home')
@@ -137,6 +143,15 @@ class HomeViewTestCase(TestCase):
         self.assertIn(f' <p class="card-text fw-bold">This is a Bush House Book Club Post</p>',
                       html)
 
+    def test_home_posts_only_show_the_latest_five(self):
+        """Testing if the home page shows the five newest posts from the user's timeline."""
+        for i in range(7):
+            Post.objects.create(author=self.user, club=self.post.club, text=f"Post number {i}")
+        self.client.login(email=self.user.email, password='Password123')
+        response = self.client.get(self.url)
+        self.assertEqual([post.text for post in response.context['posts']],
+                         [f"Post number {i}" for i in range(6, 1, -1)])
+
     def test_successful_update_rating(self):
         self.client.login(email=self.user.email, password='Password123')
         self._create_ratings()
@@ -146,6 +161,48 @@ class HomeViewTestCase(TestCase):
         ratingAfter = Rating.objects.get(pk=1).get_rating
         self.assertNotEqual(ratingBefore , ratingAfter)
 
+    def test_home_queues_recommendations_and_shows_them_once_computed(self):
+        """Testing if enough books are rated, recommendations are computed by the worker from the saved model."""
+        with tempfile.TemporaryDirectory() as artifact_dir, override_settings(RECOMMENDER_ARTIFACT_DIR=artifact_dir):
+            save_model(SVDModel(
+                pu=np.zeros((1, 2)), qi=np.zeros((3, 2)), bu=np.zeros(1), bi=np.array([0.1, 0.3, 0.2]),
+                global_mean=7.0, user_ids=np.array([self.user.id]),
+                isbns=np.array(['12345678910', '12345678911', '12345678912'])
+            ))
+            self.client.login(email=self.user.email, password='Password123')
+            self._create_ratings()
+            response = self.client.get(self.url)
+            self.assertEqual(response.context['recommendations'], [])
+            self.assertTrue(response.context['recommendations_pending'])
+            self.assertEqual(RecommendationJob.objects.filter(user=self.user).count(), 1)
+            run_pending_jobs()
+            response = self.client.get(self.url)
+        recommendations = response.context['recommendations']
+        self.assertEqual([book.isbn for book in recommendations], ['12345678911', '12345678912', '12345678910'])
+        self.assertFalse(response.context['recommendations_pending'])
+        self.assertEqual(RecommendedBook.objects.filter(user=self.user).count(), 3)
+
+    def test_home_does_not_requeue_a_job_that_found_no_recommendations(self):
+        """Testing if a finished job that stored nothing is not queued again on every visit."""
+        with tempfile.TemporaryDirectory() as artifact_dir, override_settings(RECOMMENDER_ARTIFACT_DIR=artifact_dir):
+            self.client.login(email=self.user.email, password='Password123')
+            self._create_ratings()
+            self.client.get(self.url)
+            with self.assertLogs('recommender.artifacts', 'WARNING'):
+                run_pending_jobs()
+            response = self.client.get(self.url)
+        self.assertFalse(response.context['recommendations_pending'])
+        self.assertFalse(RecommendationJob.has_pending(self.user))
+        self.assertEqual(RecommendationJob.objects.filter(user=self.user).count(), 1)
+
+    def test_repeated_refresh_queues_a_single_job(self):
+        """Testing if clicking refresh several times only queues one recommendation job."""
+        self.client.login(email=self.user.email, password='Password123')
+        self._create_ratings()
+        for i in range(3):
+            self.client.get(reverse('recommend'))
+        self.assertEqual(RecommendationJob.objects.filter(user=self.user).count(), 1)
+
     def _create_ratings(self):
         """Creation of 20 ratings."""
         for i in range(0, 20):
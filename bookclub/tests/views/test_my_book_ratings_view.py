@@ -102,6 +102,24 @@ class MyBookRatingsViewTestCase(TestCase):
         self.assertTrue(page_obj.has_previous())
         self.assertFalse(page_obj.has_next())
 
+    def test_my_book_ratings_cursor_pages_show_ratings_without_a_book(self):
+        """Testing if ratings of books missing from the catalogue are shown by their isbn on the ?after= pages."""
+        self.client.login(email=self.john.email, password="Password123")
+        self._create_test_my_book_ratings(settings.APPLICATIONS_PER_PAGE + 1)
+        rating = Rating.objects.create(user=self.john, isbn='999999999999', rating=5)
+        seen = []
+        response = self.client.get(self.url)
+        page_obj = response.context['page_obj']
+        seen += list(page_obj)
+        while page_obj.has_next():
+            response = self.client.get(self.url, {'after': page_obj.next_after})
+            self.assertEqual(response.status_code, 200)
+            page_obj = response.context['page_obj']
+            seen += list(page_obj)
+        self.assertContains(response, '<td>999999999999</td>')
+        self.assertIn(rating, seen)
+        self.assertEqual(len(seen), Rating.objects.filter(user=self.john).count())
+
     def _create_test_my_book_ratings(self, my_ratings_count=10):
         """Creation of book ratings."""
         for id in range(1, my_ratings_count + 1, 1):
@@ -1,8 +1,15 @@
 """Unit tests for the Search Bar View"""
+from django.conf import settings
 from django.contrib import messages
+from django.core.cache import caches
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
-from bookclub.models import Book, User
+from bookclub.autocomplete import clear_index, complete
+from bookclub.models import Book, Club, Rating, User
+from bookclub.search import INDEX_VERSION_KEY, bump_index_version, count_matches, get_index_version, search, \
+    search_ids
 from bookclub.tests.helpers import reverse_with_next
 
 class SearchBarViewTest(TestCase):
@@ -46,3 +53,202 @@ class SearchBarViewTest(TestCase):
         """Testing for working filter feature."""
         response = self.client.get(reverse('login'))
         self.assertQuerysetEqual(Book.objects.all(), Book.objects.filter(title__contains='Harry Potter'), transform= lambda x:x)
+
+
+class SearchResultsTest(TestCase):
+    """Test case for the results of the Search Bar View"""
+
+    fixtures = [
+        "bookclub/tests/fixtures/default_users.json",
+        "bookclub/tests/fixtures/default_books.json",
+        "bookclub/tests/fixtures/default_clubs.json",
+    ]
+
+    def setUp(self):
+        self.url = reverse('search_page')
+        self.user = User.objects.get(pk=1)
+        caches['search'].clear()
+
+    def _create_book(self, isbn, title, author='Jane Doe', publisher='Example Company'):
+        return Book.objects.create(
+            isbn=isbn, title=title, author=author, pub_year=2001, publisher=publisher,
+            small_url='http://example.com/small.jpg', medium_url='http://example.com/medium.jpg',
+            large_url='http://example.com/large.jpg'
+        )
+
+    def test_search_finds_books_clubs_and_users(self):
+        """Testing that a search shows the matching books, clubs and users."""
+        self.client.login(email=self.user.email, password='Password123')
+        self._create_book('0000000011', 'Somerset Stories')
+        response = self.client.get(self.url, {'query': 'somerset'})
+        self.assertEqual([book.title for book in response.context['books']], ['Somerset Stories'])
+        self.assertEqual([club.name for club in response.context['clubs']], ['Somerset House Book Club'])
+        self.assertEqual(list(response.context['users']), [])
+
+    def test_search_results_are_cached_by_normalised_query(self):
+        """Testing that a repeated query, whatever its case and spacing, reuses the cached result ids."""
+        self.client.login(email=self.user.email, password='Password123')
+        self.client.get(self.url, {'query': 'Somerset'})
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {'query': '  somerset  '})
+        self.assertFalse([query for query in queries if '_fts' in query['sql']])
+        self.assertEqual([club.name for club in response.context['clubs']], ['Somerset House Book Club'])
+
+    def test_search_cache_is_invalidated_by_changes(self):
+        """Testing that saving a searchable row makes the cached results stale."""
+        self.client.login(email=self.user.email, password='Password123')
+        self.client.get(self.url, {'query': 'somerset'})
+        book = self._create_book('0000000014', 'Somerset Stories')
+        response = self.client.get(self.url, {'query': 'somerset'})
+        self.assertEqual(list(response.context['books']), [book])
+
+    def test_search_index_version_is_shared_between_processes(self):
+        """Testing that the index version lives in the shared cache, not in the process's own search cache."""
+        version = get_index_version()
+        caches['search'].clear()
+        self.assertEqual(get_index_version(), version)
+        bump_index_version()
+        self.assertNotEqual(caches['shared'].get(INDEX_VERSION_KEY), version)
+
+    def test_search_post_redirects_to_linkable_results(self):
+        """Testing that a posted search redirects to the GET url of its results."""
+        self.client.login(email=self.user.email, password='Password123')
+        response = self.client.post(self.url, {'query': 'house club'})
+        self.assertRedirects(response, self.url + '?query=house+club', status_code=302, target_status_code=200)
+
+    def test_search_pages_each_type_separately(self):
+        """Testing that every result type has its own page parameter and a count from the index."""
+        self.client.login(email=self.user.email, password='Password123')
+        for number in range(settings.BOOKS_PER_PAGE + 2):
+            self._create_book(f'00000001{number:02}', f'Somerset Stories {number}')
+        response = self.client.get(self.url, {'query': 'somerset', 'books_page': 2})
+        self.assertEqual(response.context['books'].number, 2)
+        self.assertEqual(response.context['books'].paginator.count, settings.BOOKS_PER_PAGE + 2)
+        self.assertEqual(len(response.context['books']), 2)
+        self.assertEqual(response.context['clubs'].number, 1)
+        self.assertContains(response, 'books_page=1')
+
+    def test_search_results_json(self):
+        """Testing the JSON variant of the results, for all types or a single one."""
+        self.client.login(email=self.user.email, password='Password123')
+        response = self.client.get(reverse('search_results'), {'query': 'house'})
+        data = response.json()
+        self.assertEqual(data['clubs']['count'], 3)
+        self.assertEqual(data['clubs']['results'][0]['url'], reverse('club_profile', args=[data['clubs']['results'][0]['id']]))
+        self.assertEqual(data['books']['results'], [])
+        self.assertIn('private', response['Cache-Control'])
+        response = self.client.get(reverse('search_results'), {'query': 'doe', 'type': 'users'})
+        self.assertEqual(set(response.json()), {'query', 'users'})
+        self.assertEqual(response.json()['users']['results'][0]['name'], 'John Doe')
+        response = self.client.get(reverse('search_results'), {'query': 'doe', 'type': 'posts'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_search_matches_word_prefixes_of_every_term(self):
+        """Testing that every word of a query must start a word of the result."""
+        self.assertEqual(len(search(Book, 'the boo')), 3)
+        self.assertEqual([book.title for book in search(Book, 'title2 doe')], ['The Book title2'])
+        self.assertEqual(search(Book, 'ook'), [])
+        self.assertEqual(search_ids('book', '  '), [])
+
+    def test_search_ranks_title_matches_first(self):
+        """Testing that a match in the title ranks above a match in the publisher."""
+        publisher_match = self._create_book('0000000012', 'Another Story', publisher='Penguin Books')
+        title_match = self._create_book('0000000013', 'Penguin Island')
+        self.assertEqual(search(Book, 'penguin'), [title_match, publisher_match])
+
+    def test_search_finds_users_by_name_and_email(self):
+        """Testing that users are found by their full name or e-mail address."""
+        self.assertEqual(search(User, 'john doe'), [self.user])
+        self.assertEqual(search(User, 'johndoe@bookclub.com'), [self.user])
+
+    def test_search_index_follows_changes(self):
+        """Testing that the index is updated when rows are saved and deleted."""
+        club = Club.objects.get(name='Temple Book Club')
+        club.name = 'Aldwych Book Club'
+        club.save()
+        self.assertEqual(search(Club, 'temple'), [])
+        self.assertEqual(search(Club, 'aldwych'), [club])
+        club.delete()
+        self.assertEqual(count_matches('club', 'aldwych'), 0)
+        self.assertEqual(count_matches('club', 'house'), 3)
+
+
+class SearchAutocompleteTest(TestCase):
+    """Test case for the search bar's autocomplete"""
+
+    fixtures = [
+        "bookclub/tests/fixtures/default_users.json",
+        "bookclub/tests/fixtures/default_books.json",
+        "bookclub/tests/fixtures/default_clubs.json",
+    ]
+
+    def setUp(self):
+        self.url = reverse('search_autocomplete')
+        clear_index()
+        caches['search'].clear()
+        self.client.login(email='johndoe@bookclub.com', password='Password123')
+
+    def _create_book(self, isbn, title, author='Jane Doe'):
+        return Book.objects.create(
+            isbn=isbn, title=title, author=author, pub_year=2001, publisher='Example Company',
+            small_url='http://example.com/small.jpg', medium_url='http://example.com/medium.jpg',
+            large_url='http://example.com/large.jpg'
+        )
+
+    def test_autocomplete_completes_any_word_of_titles_authors_and_clubs(self):
+        """Testing that completions start at any word of a title, author or club name."""
+        response = self.client.get(self.url, {'term': 'house'})
+        self.assertEqual(response.json(), ['Bush House Book Club', 'Somerset House Book Club', 'Strand House Book Club'])
+        self.assertEqual(complete('john d'), ['John Doe'])
+        self.assertEqual(complete('TITLE3'), ['The Book title3'])
+
+    def test_autocomplete_ranks_by_popularity(self):
+        """Testing that the five most rated books are suggested first."""
+        for number in range(7):
+            book = self._create_book(f'00000000{number:02}', f'Penguin Tale {number}')
+            for rating in range(number):
+                Rating.objects.create(book=book, isbn=book.isbn, rating=5)
+        self.assertEqual(complete('penguin t'), [f'Penguin Tale {number}' for number in (6, 5, 4, 3, 2)])
+
+    def test_autocomplete_follows_book_changes(self):
+        """Testing that saved and deleted books change the loaded index without a rebuild."""
+        complete('anything')
+        book = self._create_book('0000000099', 'Wuthering Heights', author='Emily Brontë')
+        with self.assertNumQueries(0):
+            self.assertEqual(complete('wuth'), ['Wuthering Heights'])
+            self.assertEqual(complete('bronte'), ['Emily Brontë'])
+        book.title = 'Jane Eyre'
+        book.save()
+        self.assertEqual(complete('wuth'), [])
+        book.delete()
+        self.assertEqual(complete('jane eyre'), [])
+        self.assertEqual(complete('emily'), [])
+
+    def test_autocomplete_response_can_be_reused(self):
+        """Testing that autocomplete responses carry cache headers and an ETag clients can revalidate."""
+        response = self.client.get(self.url, {'term': 'house'})
+        self.assertIn('private', response['Cache-Control'])
+        self.assertIn('max-age', response['Cache-Control'])
+        response = self.client.get(self.url, {'term': 'House '}, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_autocomplete_response_is_cached(self):
+        """Testing that a cached autocomplete response reads only the session, the user and the index version."""
+        self.client.get(self.url, {'term': 'house'})
+        clear_index()
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url, {'term': 'HOUSE'})
+        self.assertEqual(len(response.json()), 3)
+
+    def test_autocomplete_without_a_term_is_empty(self):
+        """Testing that a request without a term gets an empty list of completions."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), [])
+
+    def test_autocomplete_redirects_when_not_logged_in(self):
+        """Testing that autocomplete is only for logged in users."""
+        self.client.logout()
+        redirect_url = reverse_with_next('login', self.url)
+        response = self.client.get(self.url)
+        self.assertRedirects(response, redirect_url, status_code=302, target_status_code=200)
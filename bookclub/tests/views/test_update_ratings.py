@@ -1,7 +1,12 @@
-from django.test import TestCase
+import tempfile
+import numpy as np
+from django.test import TestCase, override_settings
 from bookclub.forms import ClubForm
 from django.urls import reverse
-from bookclub.models import Book, User, Rating
+from bookclub.models import Book, User, Rating, RecommendedBook
+from recommender.artifacts import SVDModel, save_model
+from recommender.jobs import run_pending_jobs
+from recommender.models import RecommendationJob
 
 class UpdateRatingsTestCase(TestCase):
     
@@ -33,4 +38,20 @@ class UpdateRatingsTestCase(TestCase):
         self.assertRedirects(request, redirect_url, status_code=302, target_status_code=200)
         self.rating = Rating.objects.get(user=self.user, book=self.book)
         self.assertEqual(self.rating.get_rating(), 7)
-    
\ No newline at end of file
+
+    def test_update_ratings_queues_recommendations_of_eligible_user(self):
+        """Test that rating a book queues new recommendations for a user with enough ratings."""
+        for i in range(20):
+            Rating.objects.create(user=self.user, isbn=f'{i:010d}', rating=5)
+        isbns = [book.isbn for book in Book.objects.order_by('isbn')]
+        with tempfile.TemporaryDirectory() as artifact_dir, override_settings(RECOMMENDER_ARTIFACT_DIR=artifact_dir):
+            save_model(SVDModel(
+                pu=np.zeros((1, 2)), qi=np.ones((len(isbns), 2)), bu=np.zeros(1), bi=np.zeros(len(isbns)),
+                global_mean=5.0, user_ids=np.array([self.user.id]), isbns=np.array(isbns)
+            ))
+            self.client.login(email=self.user.email, password="Password123")
+            self.client.post(self.url, self.data)
+            self.assertTrue(RecommendationJob.has_pending(self.user))
+            run_pending_jobs()
+        recommended = set(RecommendedBook.objects.filter(user=self.user).values_list('isbn', flat=True))
+        self.assertEqual(recommended, set(isbns) - {self.book.isbn})
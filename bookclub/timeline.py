@@ -0,0 +1,109 @@
+"""Fan-out-on-write home timelines of club and followee posts."""
+from django.db.models import F
+from bookclub.models import User, Post, UserPost, TimelineEntry
+
+
+def club_user_ids(club):
+    """Return the ids of the owner, organisers and members of a club."""
+    user_ids = set(club.memberships.values_list('user_id', flat=True))
+    user_ids.add(club.owner_id)
+    return user_ids
+
+
+def fan_out_post(post):
+    """Add a club post to the timeline of everyone in its club."""
+    TimelineEntry.objects.bulk_create(
+        [TimelineEntry(user_id=user_id, post=post, created_at=post.created_at) for user_id in club_user_ids(post.club)],
+        ignore_conflicts=True
+    )
+
+
+def fan_out_user_post(user_post):
+    """Add a user post to the timeline of every follower of its author."""
+    TimelineEntry.objects.bulk_create(
+        [TimelineEntry(user_id=follower_id, user_post=user_post, created_at=user_post.created_at)
+         for follower_id in User.objects.filter(followees=user_post.author_id).values_list('id', flat=True)],
+        ignore_conflicts=True
+    )
+
+
+def sync_club_timeline(club, user):
+    """Add the posts of a club to a user's timeline if they are in the club, otherwise remove them."""
+    if club.user_level(user) == "Not in club":
+        TimelineEntry.objects.filter(user=user, post__club=club).delete()
+    else:
+        TimelineEntry.objects.bulk_create(
+            [TimelineEntry(user=user, post_id=post_id, created_at=created_at)
+             for post_id, created_at in Post.objects.filter(club=club).values_list('id', 'created_at')],
+            ignore_conflicts=True
+        )
+
+
+def sync_followee_timeline(follower, followee):
+    """Add the posts of a followee to a follower's timeline if they still follow them, otherwise remove them."""
+    if follower.is_following(followee):
+        TimelineEntry.objects.bulk_create(
+            [TimelineEntry(user=follower, user_post_id=post_id, created_at=created_at)
+             for post_id, created_at in UserPost.objects.filter(author=followee).values_list('id', 'created_at')],
+            ignore_conflicts=True
+        )
+    else:
+        TimelineEntry.objects.filter(user=follower, user_post__author=followee).delete()
+
+
+def get_timeline(user):
+    """Return the user's timeline entries, newest first, with their posts loaded in the same query."""
+    return TimelineEntry.objects.filter(user=user).select_related(
+        'post__author', 'post__club', 'user_post__author'
+    )
+
+
+def get_timeline_posts(user, limit):
+    return [entry.get_post() for entry in get_timeline(user)[:limit]]
+
+
+def get_timeline_club_posts(user):
+    """Return the club posts in the user's timeline with the time and id of their entry, to be ordered on with
+    TIMELINE_CURSOR_ORDERING so the user's (user, created_at) index of entries serves the ordering."""
+    return Post.objects.filter(timeline_entries__user=user).select_related('author', 'club').annotate(
+        entry_created_at=F('timeline_entries__created_at'), entry_id=F('timeline_entries__id')
+    )
+
+
+def get_timeline_user_posts(user):
+    """Return the posts of the users this user follows with the time and id of their timeline entry."""
+    return UserPost.objects.filter(timeline_entries__user=user).select_related('author').annotate(
+        entry_created_at=F('timeline_entries__created_at'), entry_id=F('timeline_entries__id')
+    )
+
+
+def post_saved(sender, instance, created, **kwargs):
+    if created:
+        fan_out_post(instance)
+
+
+def user_post_saved(sender, instance, created, **kwargs):
+    if created:
+        fan_out_user_post(instance)
+
+
+def club_saved(sender, instance, created, raw, update_fields=None, **kwargs):
+    """Add a club's posts to the timeline of a new owner, which Club.make_owner saves with update_fields."""
+    if not raw and (created or (update_fields is not None and 'owner' in update_fields)):
+        sync_club_timeline(instance, instance.owner)
+
+
+def membership_changed(sender, instance, **kwargs):
+    """Keep timelines in step with users joining and leaving clubs."""
+    sync_club_timeline(instance.club, instance.user)
+
+
+def followers_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """Keep timelines in step with follows and unfollows, made from either side of the relation."""
+    if action not in ('post_add', 'post_remove'):
+        return
+    for other in User.objects.filter(pk__in=pk_set):
+        if reverse:
+            sync_followee_timeline(instance, other)
+        else:
+            sync_followee_timeline(other, instance)
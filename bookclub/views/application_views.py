@@ -6,10 +6,8 @@ from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.http import Http404
 from bookclub.models import Club, Application
-from bookclub.views import club_views
 from django.views.generic.edit import View
 from django.core.paginator import Paginator
-from bookclub.views import config
 
 
 class ApplicationsView(LoginRequiredMixin, View):
@@ -74,7 +72,6 @@ def app_accept(request, pk):
             app.club.make_member(app.applicant)
             app.delete()
             messages.add_message(request, messages.SUCCESS, "User accepted!")
-            club_views.club_util(request)
             return redirect('applications')
         else:
             messages.add_message(request, messages.ERROR, "Action prohibited")
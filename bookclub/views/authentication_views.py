@@ -13,7 +13,6 @@ from bookclub.models import User
 from .mixins import LoginProhibitedMixin
 from django.contrib.auth.decorators import login_required
 from bookclub.helpers import login_prohibited
-from bookclub.views import club_views
 from django.contrib.sites.shortcuts import get_current_site
 from django.template.loader import render_to_string
 from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
@@ -62,7 +61,7 @@ class LogInView(LoginProhibitedMixin, View):
                 messages.add_message(request, messages.ERROR, "Email is not verified, please check your inbox")
                 return redirect("login")
             form = login(request, user)
-            club_views.club_util(request)
+            user.get_cached_clubs()
             return redirect(self.next)
         messages.add_message(request, messages.ERROR, "The credentials provided were invalid!")
         return self.render()
@@ -107,7 +106,7 @@ def activate(request, uid, token):
 
     if user and generate_token.check_token(user, token):
         user.is_email_verified = True
-        user.save()
+        user.save(update_fields=['is_email_verified'])
 
         messages.add_message(request, messages.SUCCESS, "Email verified")
         return redirect(reverse('login'))
@@ -13,10 +13,13 @@ from django.views.generic.detail import DetailView
 from django.views.generic.list import MultipleObjectMixin
 from bookclub.models import Book, Club, User, Rating
 from django.contrib import messages
-from bookclub.views import config
+from bookclub.views.mixins import CursorPaginationMixin
+from bookclub.paginators import BOOKS_CURSOR_ORDERING, paginate
+from recommender.batch import MIN_RATINGS
+from recommender.models import RecommendationJob
 
 
-class BooksListView(LoginRequiredMixin, ListView):
+class BooksListView(LoginRequiredMixin, CursorPaginationMixin, ListView):
     """View that shows a list of all books."""
     
     model = Book
@@ -24,6 +27,7 @@ class BooksListView(LoginRequiredMixin, ListView):
     context_object_name = "books"
     queryset = Book.objects.all()
     paginate_by = settings.BOOKS_PER_PAGE
+    cursor_ordering = BOOKS_CURSOR_ORDERING
 
 
 class ShowBookView(LoginRequiredMixin, DetailView, MultipleObjectMixin):
@@ -140,6 +144,8 @@ def update_ratings(request, book_id):
         Rating.objects.get(book=book, user=user).delete()
 
     Rating.objects.create(user=user, book=book, isbn=isbn, rating=request.POST.get('ratings', "0"))
+    if Rating.objects.filter(user=user).count() >= MIN_RATINGS:
+        RecommendationJob.enqueue(user)
     messages.add_message(request, messages.SUCCESS,
                          "You have given " + book.title + " a rating of " + request.POST.get('ratings', "0"))
     return redirect('book_profile', book_id=book_id)
@@ -191,10 +197,7 @@ class MyBookRatings(LoginRequiredMixin, ListView):
 
     def render(self):
         user = User.objects.get(pk=self.request.user.id)
-        ratings = Rating.objects.filter(user=user)
-
-        paginator = Paginator(ratings, settings.APPLICATIONS_PER_PAGE)
-        page_number = self.request.GET.get('page')
-        page_obj = paginator.get_page(page_number)
+        ratings = Rating.objects.filter(user=user).select_related('book').order_by('isbn', 'id')
+        page_obj = paginate(self.request, ratings, settings.APPLICATIONS_PER_PAGE, ('isbn', 'id'))
 
         return render(self.request, 'my_book_ratings.html', {'ratings': ratings, 'page_obj': page_obj})
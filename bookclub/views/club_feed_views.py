@@ -7,6 +7,7 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.shortcuts import redirect, render
 from django.views.generic import ListView, FormView
 from bookclub.forms import PostForm
+from bookclub.paginators import paginate
 
 class ClubFeedView(LoginRequiredMixin, ListView):
 
@@ -40,8 +41,6 @@ class ClubFeedView(LoginRequiredMixin, ListView):
         current_club_id = self.kwargs['club_id']
         club = Club.objects.all().get(pk=current_club_id)
         posts = Post.objects.filter(club=club)
-        paginator = Paginator(posts, settings.POSTS_PER_PAGE)
-        page_number = request.GET.get('page')
-        page_obj = paginator.get_page(page_number)
+        page_obj = paginate(request, posts.select_related('author'), settings.POSTS_PER_PAGE)
         form = PostForm()
         return render(request, 'feed.html', {"author": request.user, "club": club, "form": form, "posts": posts, 'page_obj': page_obj})
@@ -4,13 +4,13 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.shortcuts import redirect, render
 from django.views.generic import ListView
 from bookclub.models import Club
-from bookclub.views import config
+from bookclub.helpers import get_club_roles
 from django.urls import reverse
 from django.contrib import messages
 from bookclub.templates import *
 from bookclub.forms import EditClubForm, PostForm, ClubForm, ScheduleMeetingForm
 from django.http import Http404
-from bookclub.models import User, Club, Post, Meeting, Application
+from bookclub.models import User, Club, Post, Meeting, Application, clear_user_clubs_cache
 from django.views.generic.edit import UpdateView
 from django.core.paginator import Paginator
 
@@ -37,38 +37,24 @@ class ClubMemberListView(LoginRequiredMixin, ListView):
         return Club.objects.get(id=self.kwargs['club_id']).get_all_users()
 
     def get_context_data(self, *args, **kwargs):
-        current_user_is_owner = False
         context = super().get_context_data(*args, **kwargs)
         current_club_id = self.kwargs['club_id']
-        current_club = Club.objects.get(id=current_club_id)
-        all_users = current_club.get_all_users()
-        current_club = Club.objects.get(id=current_club_id)
-        if current_club.owner == self.request.user:
-            current_user_is_owner = True
-        paginator = Paginator(current_club.get_all_users(), settings.USERS_PER_PAGE)
-        page_number = self.request.GET.get('page')
-        page_obj = paginator.get_page(page_number)
-        for each in page_obj:
-            u_id = each.pk
-            if current_club.user_level(each) == "Member":
-                user_level = "Member"
-                u_id = each.pk
-            elif current_club.user_level(each) == "Organiser":
-                user_level = "Organiser"
-                u_id = each.pk
-            else:
-                user_level = "Owner"
-                u_id = each.pk
-                if each == self.request.user:
-                    current_user_is_owner = True
-
-        context['u_pk'] = u_id
+        current_club = Club.objects.select_related('owner').get(id=current_club_id)
+        club_roles = get_club_roles(self.request, current_club)
+        all_users = list(current_club.get_all_users())
+        page_obj = context['page_obj']
+        for each in [*all_users, *page_obj]:
+            each.club_level = club_roles.get(each.pk)
+        last_user = page_obj[len(page_obj) - 1]
+
+        context['u_pk'] = last_user.pk
         context['club'] = current_club
         context['all_users'] = all_users
         context['page_obj'] = page_obj
-        context['user_level'] = user_level
+        context['user_level'] = last_user.club_level
+        context['club_roles'] = club_roles
         context['c_pk'] = current_club_id
-        context['is_owner'] = current_user_is_owner
+        context['is_owner'] = club_roles.get(self.request.user.id) == "Owner"
         context['current_user'] = self.request.user
         return context
 
@@ -163,7 +149,9 @@ class ClubUpdateView(LoginRequiredMixin, UpdateView):
         club_to_edit = Club.objects.all().get(pk=c_pk)
         form = self.form_class(instance=club_to_edit, data=request.POST)
         if form.is_valid():
-            return self.form_valid(form)
+            response = self.form_valid(form)
+            clear_user_clubs_cache(*club_to_edit.get_all_users().values_list('id', flat=True))
+            return response
         return render(request, 'edit_club.html', {"form": form})
 
     def get(self, request, c_pk, *args, **kwargs):
@@ -177,26 +165,16 @@ class ClubUpdateView(LoginRequiredMixin, UpdateView):
             return redirect('club_list')
 
 
-def club_util(request):
-    user_clubs_list = []
-    clubs = Club.objects.all()
-
-    for temp_club in clubs:
-        if request.user in temp_club.get_all_users():
-            user_clubs_list.append(temp_club)
-
-    config.user_clubs = user_clubs_list
-
 @login_required
 def club_selector(request):
-    club_util(request)
-    return render(request, "club_switcher.html", {'user_clubs': config.user_clubs, 'user': request.user})
+    user_clubs = request.user.get_cached_clubs()
+    return render(request, "club_switcher.html", {'user_clubs': user_clubs, 'user': request.user})
 
 
 @login_required
 def club_selector_alt(request):
-    club_util(request)
-    return render(request, "club_switcher_alt.html", {"user_clubs": config.user_clubs, 'user': request.user})
+    user_clubs = request.user.get_cached_clubs()
+    return render(request, "club_switcher_alt.html", {"user_clubs": user_clubs, 'user': request.user})
 
 
 @login_required
@@ -206,7 +184,7 @@ def new_club(request):  # new club adapted from the chess club project
         form = ClubForm(request.POST)
         if form.is_valid():
             form.save(request.user)
-            club_util(request)
+            clear_user_clubs_cache(request.user.id)
             messages.add_message(request, messages.SUCCESS, "Club has been created!")
             return redirect('club_selector')
     else:
@@ -274,6 +252,6 @@ def leave_club(request, club_id):
 def disband_club(request, c_pk):
     """Disband a club"""
     club = Club.objects.get(pk=c_pk)
-    club.delete()
+    club.disband()
     messages.add_message(request, messages.SUCCESS, f"{club.name} has been disbanded!")
     return redirect('club_selector')
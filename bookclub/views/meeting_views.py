@@ -11,6 +11,7 @@ from django.http import Http404
 from django.views.generic import ListView
 from bookclub.models import Meeting, Club, Post
 from bookclub.views import club_views
+from bookclub.helpers import can_manage_meetings
 from django.views.generic.edit import View, UpdateView
 from django.core.paginator import Paginator
 
@@ -88,8 +89,7 @@ class MeetingScheduler(LoginRequiredMixin, View):
         """Render meeting scheduler form"""
         current_club = Club.objects.get(pk=pk)
         form = ScheduleMeetingForm(club=current_club)
-        if self.request.user == current_club.owner or (
-                self.request.user in current_club.get_organisers() and current_club.organiser_owner):
+        if can_manage_meetings(self.request, current_club):
             return render(self.request, 'schedule_meeting.html', {'form': form, 'pk': pk})
         else:
             messages.add_message(self.request, messages.ERROR, "Action prohibited")
@@ -138,8 +138,7 @@ class MeetingUpdateView(LoginRequiredMixin, UpdateView):
     def get(self, request, club_id, meeting_id, *args, **kwargs):
         club = Club.objects.get(id=club_id)
         meeting = Meeting.objects.get(id=meeting_id)
-        if self.request.user == club.owner or (
-                self.request.user in club.get_organisers() and club.organiser_owner):
+        if can_manage_meetings(self.request, club):
                 form = self.form_class(instance=meeting, club=club)
                 return render(request, 'edit_meeting.html', {"club": club, "form": form})
         else:
@@ -1,4 +0,0 @@
-from bookclub.views import config
-
-def menu(request):
-    config.inbox_count(request)
\ No newline at end of file
@@ -1,5 +1,8 @@
 from django.contrib import messages
-from django.shortcuts import render, redirect
+from django.conf import settings
+from django.http import HttpResponseBadRequest, HttpResponseForbidden, JsonResponse
+from django.shortcuts import render, redirect, get_object_or_404
+from django.template.loader import render_to_string
 from bookclub.templates import *
 from bookclub.forms import *
 from django.contrib.auth import login
@@ -7,6 +10,9 @@ from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.urls import reverse
 from bookclub.models import *
+from bookclub.inbox import mark_chat_read
+from bookclub.realtime import publish_message
+from bookclub.paginators import CursorPaginator, InvalidCursor, MESSAGES_CURSOR_ORDERING
 from django.views.generic.edit import View
 from django.db.models import Q
 
@@ -30,23 +36,11 @@ class CreateChatView(View):
             if receiver.id == request.user.id:
                 messages.add_message(request, messages.ERROR, "You cannot create a chat with yourself!")
                 return redirect('create_chat')
-            if Chat.objects.filter(user=request.user, receiver=receiver).exists():
-                chat = Chat.objects.filter(user=request.user, receiver=receiver)[0]
-                return redirect('chat', pk=chat.pk)
-
-            elif Chat.objects.filter(user=receiver, receiver=request.user).exists():
-                chat = Chat.objects.filter(user=receiver, receiver=request.user)[0]
-                return redirect('chat', pk=chat.pk)
-
             if form.is_valid():
-                sender_chat = Chat(
-                    user=request.user,
-                    receiver=receiver
-                )
-                sender_chat.save()
-                messages.add_message(request, messages.SUCCESS, "Chat created!")
-                chat_pk = sender_chat.pk
-                return redirect('chat', pk=chat_pk)
+                chat, created = get_or_create_chat(request.user, receiver)
+                if created:
+                    messages.add_message(request, messages.SUCCESS, "Chat created!")
+                return redirect('chat', pk=chat.pk)
         except:
             return redirect('create_chat')
 
@@ -54,21 +48,10 @@ class CreateChatView(View):
 def createChatFromProfile(request, user_id):
     try:
         receiver = User.objects.get(id=user_id)
-        if Chat.objects.filter(user=request.user, receiver=receiver).exists():
-            chat = Chat.objects.filter(user=request.user, receiver=receiver)[0]
-            return redirect('chat', pk=chat.pk)
-
-        elif Chat.objects.filter(user=receiver, receiver=request.user).exists():
-            chat = Chat.objects.filter(user=receiver, receiver=request.user)[0]
-            return redirect('chat', pk=chat.pk)
-
-        sender_chat = Chat.objects.create(
-            user=request.user,
-            receiver=receiver
-        )
-        messages.add_message(request, messages.SUCCESS, "Chat created!")
-        chat_pk = sender_chat.pk
-        return redirect('chat', pk=chat_pk)
+        chat, created = get_or_create_chat(request.user, receiver)
+        if created:
+            messages.add_message(request, messages.SUCCESS, "Chat created!")
+        return redirect('chat', pk=chat.pk)
     except:
         return redirect('create_chat')
 
@@ -106,7 +89,7 @@ class CreateMessageView(View):
             body=request.POST.get('message'),
         )
         message.save()
-        message.is_read = False 
+        publish_message(message)
         return redirect('chat', pk=pk)
        
 
@@ -116,21 +99,20 @@ class ChatView(View):
     def get(self, request, pk, *args, **kwargs):
         form = MessageForm()
         chat = Chat.objects.get(pk=pk)
-        if Message.objects.filter(chat=chat).exists():
-            user_messages = Message.objects.filter(chat=chat)
-            for msg in user_messages:
-                if request.user == chat.receiver:
-                    msg.is_read = True
-                    msg.save()
-
-
         if request.user == chat.receiver or request.user == chat.user:
-
-            message_list = Message.objects.filter(chat__pk__contains=pk)
+            mark_chat_read(chat, request.user)
+            page = CursorPaginator(
+                Message.objects.filter(chat_id=chat.pk), settings.MESSAGES_PER_PAGE, MESSAGES_CURSOR_ORDERING
+            ).page()
+            message_list = list(reversed(page.object_list))
             context = {
                 'chat': chat,
                 'form': form,
-                'message_list': message_list
+                'message_list': message_list,
+                'older_after': page.next_after,
+                'last_message_id': message_list[-1].id if message_list else 0,
+                'poll_interval': settings.CHAT_POLL_INTERVAL,
+                'websocket_path': f'/ws/chat/{chat.pk}/',
             }
             return render(request, 'chat.html', context)
 
@@ -138,3 +120,41 @@ class ChatView(View):
             messages.add_message(request, messages.ERROR, "Action prohibited")
             return redirect('home')
 
+
+class ChatMessagesView(LoginRequiredMixin, View):
+    """Return the messages of a chat as JSON, older ones by ?before= token or newer ones by ?since= id."""
+
+    def get(self, request, pk, *args, **kwargs):
+        chat = get_object_or_404(Chat, pk=pk)
+        if request.user.id not in (chat.user_id, chat.receiver_id):
+            return HttpResponseForbidden()
+        chat_messages = Message.objects.filter(chat_id=chat.pk)
+        older = None
+        try:
+            if 'since' in request.GET:
+                message_list = list(
+                    chat_messages.filter(id__gt=int(request.GET['since'])).order_by('date', 'id')[:settings.MESSAGES_PER_PAGE]
+                )
+                if any(message.receiver_user_id == request.user.id and not message.is_read for message in message_list):
+                    mark_chat_read(chat, request.user)
+            else:
+                page = CursorPaginator(chat_messages, settings.MESSAGES_PER_PAGE, MESSAGES_CURSOR_ORDERING).page(
+                    request.GET.get('before')
+                )
+                message_list = list(reversed(page.object_list))
+                older = page.next_after
+        except (ValueError, InvalidCursor):
+            return HttpResponseBadRequest()
+        return JsonResponse({
+            'messages': [
+                {
+                    'id': message.id,
+                    'sender': message.sender_user_id,
+                    'body': message.body,
+                    'date': message.date.isoformat(),
+                    'html': render_to_string('partials/chat_message.html', {'message': message}, request),
+                }
+                for message in message_list
+            ],
+            'older': older,
+        })
@@ -1,6 +1,7 @@
 """View mixins."""
 from django.shortcuts import redirect
 from django.core.exceptions import ImproperlyConfigured
+from bookclub.paginators import CursorPaginator, POSTS_CURSOR_ORDERING
 
 class LoginProhibitedMixin:
     """Mixin that redirects when a user is logged in."""
@@ -27,3 +28,17 @@ class LoginProhibitedMixin:
             )
         else:
             return self.redirect_when_logged_in_url
+
+
+class CursorPaginationMixin:
+    """Mixin for list views that pages with keyset pagination on cursor_ordering unless a ?page= number is asked for."""
+
+    cursor_ordering = POSTS_CURSOR_ORDERING
+
+    def paginate_queryset(self, queryset, page_size):
+        """Paginate by page number when given, or by ?after= or ?before= token from the first page on otherwise."""
+        if self.page_kwarg in self.request.GET or self.page_kwarg in self.kwargs:
+            return super().paginate_queryset(queryset.order_by(*self.cursor_ordering), page_size)
+        paginator = CursorPaginator(queryset, page_size, self.cursor_ordering)
+        page = paginator.get_page(self.request.GET.get('after'), self.request.GET.get('before'))
+        return paginator, page, page.object_list, page.has_next()
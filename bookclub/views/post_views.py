@@ -6,11 +6,11 @@ from django.views.generic.edit import CreateView
 from django.urls import reverse
 from bookclub.forms import PostForm
 from bookclub.models import Post, Club, User
-from bookclub.views import config
+from bookclub.timeline import get_timeline_club_posts
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.views.generic.edit import View
-from django.core.paginator import Paginator
+from bookclub.paginators import TIMELINE_CURSOR_ORDERING, paginate
 from django.conf import settings
 
 
@@ -54,25 +54,6 @@ class NewPostView(LoginRequiredMixin, CreateView):
     def handle_no_permission(self):
         return redirect('login')
 
-def get_all_club_posts(request):
-
-    user_clubs_list = []
-    clubs = Club.objects.all()
-
-    for club in clubs:
-        if request.user in club.get_all_users():
-            user_clubs_list.append(club)
-
-    all_club_posts = []
-
-    for club in user_clubs_list:
-        club_posts = list(set(Post.objects.filter(club=club)))
-        if club_posts:
-            for post in club_posts:
-                all_club_posts.append(post)
-    all_club_posts.sort(key=lambda p: p.created_at, reverse=True)
-    return all_club_posts
-
 class ClubPostsView(LoginRequiredMixin, View):
     """View that handles club posts."""
 
@@ -83,10 +64,8 @@ class ClubPostsView(LoginRequiredMixin, View):
     def render(self):
         current_user = self.request.user
         """Render all club posts"""
-        club_posts = get_all_club_posts(self.request)
+        club_posts = get_timeline_club_posts(current_user).order_by(*TIMELINE_CURSOR_ORDERING)
 
-        paginator = Paginator(club_posts, settings.POSTS_PER_PAGE)
-        page_number = self.request.GET.get('page')
-        page_obj = paginator.get_page(page_number)
+        page_obj = paginate(self.request, club_posts, settings.POSTS_PER_PAGE, TIMELINE_CURSOR_ORDERING)
 
         return render(self.request, 'club_posts.html', {'club_posts': club_posts, 'page_obj': page_obj})
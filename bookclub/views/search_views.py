@@ -1,32 +1,153 @@
+import hashlib
 import json
+from django.core.cache import caches
 from django.contrib.auth.decorators import login_required
-from django.http import HttpResponseForbidden, HttpResponse, JsonResponse
-from django.shortcuts import render
+from django.core.paginator import Paginator
+from django.http import HttpResponseBadRequest, HttpResponseForbidden, HttpResponse, JsonResponse
+from django.shortcuts import render, redirect
+from django.urls import reverse
 from bookclub.models import Club, Book, User
 from django.views.generic.list import ListView
 from django.conf import settings
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag, urlencode
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Value as V
-from django.db.models.functions import Concat
+from bookclub import autocomplete, search as search_index
 
+search_cache = caches['search']
+
+
+def query_digest(normalised_query):
+    return hashlib.md5(normalised_query.encode()).hexdigest()
+
+
+def cached_search(model, query, limit=None, offset=0):
+    """Return the instances of a model matching a query, best first, from ids cached under the normalised query."""
+    key = (f'search:{search_index.get_index_version()}:{model._meta.model_name}:{limit}:{offset}:'
+           f'{query_digest(search_index.normalise_query(query))}')
+    ids = search_cache.get(key)
+    if ids is None:
+        ids = search_index.search_ids(model._meta.model_name, query, limit, offset)
+        search_cache.set(key, ids)
+    return search_index.in_id_order(model, ids)
+
+
+def cached_count(model, query):
+    """Return how many instances of a model match a query, counted in the index and cached like the results."""
+    key = (f'search-count:{search_index.get_index_version()}:{model._meta.model_name}:'
+           f'{query_digest(search_index.normalise_query(query))}')
+    count = search_cache.get(key)
+    if count is None:
+        count = search_index.count_matches(model._meta.model_name, query)
+        search_cache.set(key, count)
+    return count
+
+
+def reusable_response(request, response, public=True):
+    """Let clients reuse a response for SEARCH_MAX_AGE and revalidate it by ETag, answering 304 when it is unchanged.
+
+    Responses that depend on who is logged in must not be public, so only the browser keeps them."""
+    etag = quote_etag(hashlib.md5(response.content).hexdigest())
+    response['ETag'] = etag
+    if public:
+        patch_cache_control(response, public=True, max_age=settings.SEARCH_MAX_AGE)
+    else:
+        patch_cache_control(response, private=True, max_age=settings.SEARCH_MAX_AGE)
+    return get_conditional_response(request, etag=etag, response=response)
+
+
+class SearchResults:
+    """The matches of a query, counted and sliced in the search index, so that a Paginator can page them."""
+
+    def __init__(self, model, query):
+        self.model = model
+        self.query = query
+
+    def count(self):
+        return cached_count(self.model, self.query)
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start = index.start or 0
+            limit = None if index.stop is None else max(0, index.stop - start)
+            return cached_search(self.model, self.query, limit, start)
+        results = cached_search(self.model, self.query, 1, index)
+        if not results:
+            raise IndexError(index)
+        return results[0]
+
+
+# Result types, with their model and page length; each type is paged by its own ?<type>_page= parameter
+SEARCH_TYPES = {
+    'books': (Book, settings.BOOKS_PER_PAGE),
+    'clubs': (Club, settings.CLUBS_PER_PAGE),
+    'users': (User, settings.USERS_PER_PAGE),
+}
+
+
+def search_pages(request, query, types):
+    """Return the requested page of results of the query for each of the given result types."""
+    pages = {}
+    for name in types:
+        model, per_page = SEARCH_TYPES[name]
+        pages[name] = Paginator(SearchResults(model, query), per_page).get_page(request.GET.get(f'{name}_page'))
+    return pages
 
 
 @login_required
 def search(request):
     if request.method == "POST":
-        query = request.POST['query']
-        books = Book.objects.filter(title__icontains=query) | Book.objects.filter(isbn__icontains=query) | Book.objects.filter(author__icontains=query) | Book.objects.filter(pub_year__icontains=query) | Book.objects.filter(publisher__icontains=query)
-        clubs = Club.objects.filter(name__icontains=query)
-        users = User.objects.annotate(full_name=Concat('first_name', V(' '), 'last_name')).filter(full_name__icontains=query) | User.objects.filter(email__icontains=query)
-        return render(request, 'search_page.html', {'query': query, 'books': books[:10], 'clubs': clubs[:10], 'users': users[:10]})
+        return redirect(f"{reverse('search_page')}?{urlencode({'query': request.POST.get('query', '')})}")
+    query = request.GET.get('query', '').strip()
+    if query:
+        return render(request, 'search_page.html', {'query': query, **search_pages(request, query, SEARCH_TYPES)})
     else:
         return render(request, 'search_page.html', {})
 
 
+def search_result_json(name, result):
+    if name == 'books':
+        return {'id': result.id, 'title': result.title, 'author': result.author, 'image': result.small_url,
+                'url': reverse('book_profile', args=[result.id])}
+    if name == 'clubs':
+        return {'id': result.id, 'name': result.name, 'location': result.location,
+                'url': reverse('club_profile', args=[result.id])}
+    return {'id': result.id, 'name': result.get_full_name(), 'location': result.location,
+            'url': reverse('user_profile', args=[result.id])}
+
+
+@login_required
+def search_results(request):
+    """Return a page of each type of search result as JSON, or of only the type given by ?type=."""
+    query = request.GET.get('query', '').strip()
+    types = SEARCH_TYPES
+    if 'type' in request.GET:
+        if request.GET['type'] not in SEARCH_TYPES:
+            return HttpResponseBadRequest()
+        types = [request.GET['type']]
+    data = {'query': query}
+    for name, page in search_pages(request, query, types).items():
+        data[name] = {
+            'count': page.paginator.count,
+            'page': page.number,
+            'num_pages': page.paginator.num_pages,
+            'has_next': page.has_next(),
+            'results': [search_result_json(name, result) for result in page],
+        }
+    return reusable_response(request, JsonResponse(data), public=False)
+
+
+@login_required
 def search_autocomplete(request):
-    if 'term' in request.GET:
-        query = Book.objects.filter(title__icontains=request.GET.get('term'))[:5]
-        books = list()
-        for book in query:
-            books.append(book.title)
-        return JsonResponse(books, safe=False)
+    if 'term' not in request.GET:
+        return JsonResponse([], safe=False)
+    term = autocomplete.normalise(request.GET.get('term'))
+    key = f'autocomplete:{search_index.get_index_version()}:{query_digest(term)}'
+    content = search_cache.get(key)
+    if content is None:
+        content = json.dumps(autocomplete.complete(term))
+        search_cache.set(key, content)
+    return reusable_response(request, HttpResponse(content, content_type='application/json'), public=False)
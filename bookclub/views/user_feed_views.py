@@ -4,9 +4,9 @@ from django.conf import settings
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.shortcuts import redirect, render
 from django.views.generic import ListView, FormView
-from django.core.paginator import Paginator
 from bookclub.forms import UserPostForm
 from bookclub.models import User, UserPost, Club
+from bookclub.paginators import paginate
 
 
 
@@ -34,7 +34,5 @@ class UserFeedView(LoginRequiredMixin, ListView):
         user = User.objects.get(id=user_id)
         posts = UserPost.objects.filter(author=user)
         form = UserPostForm()
-        paginator = Paginator(posts, settings.POSTS_PER_PAGE)
-        page_number = self.request.GET.get('page')
-        page_obj = paginator.get_page(page_number)
+        page_obj = paginate(request, posts.select_related('author'), settings.POSTS_PER_PAGE)
         return render(request, 'user_feed.html', {"user": user, "form": form, "posts": posts, "page_obj":page_obj})
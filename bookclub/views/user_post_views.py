@@ -6,10 +6,11 @@ from django.views.generic.edit import CreateView
 from django.urls import reverse
 from bookclub.forms import UserPostForm
 from bookclub.models import UserPost, Club, User
+from bookclub.timeline import get_timeline_user_posts
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.views.generic.edit import View
-from django.core.paginator import Paginator
+from bookclub.paginators import TIMELINE_CURSOR_ORDERING, paginate
 from django.conf import settings
 
 
@@ -52,18 +53,6 @@ class UserNewPostView(LoginRequiredMixin, CreateView):
     def handle_no_permission(self):
         return redirect('login')
 
-def get_all_follow_posts(request):
-    all_follow_posts = []
-    current_user = request.user
-
-    for follow in current_user.followees.all():
-        user_posts = list(set(UserPost.objects.filter(author=follow)))
-        if user_posts:
-            for post in user_posts:
-                all_follow_posts.append(post)
-    all_follow_posts.sort(key=lambda p: p.created_at, reverse=True)
-    return all_follow_posts
-
 class UserPostsView(LoginRequiredMixin, View):
     """View that handles user posts."""
 
@@ -74,10 +63,8 @@ class UserPostsView(LoginRequiredMixin, View):
     def render(self):
         current_user = self.request.user
         """Render all user posts"""
-        user_posts = get_all_follow_posts(self.request)
+        user_posts = get_timeline_user_posts(current_user).order_by(*TIMELINE_CURSOR_ORDERING)
 
-        paginator = Paginator(user_posts, settings.POSTS_PER_PAGE)
-        page_number = self.request.GET.get('page')
-        page_obj = paginator.get_page(page_number)
+        page_obj = paginate(self.request, user_posts, settings.POSTS_PER_PAGE, TIMELINE_CURSOR_ORDERING)
 
         return render(self.request, 'user_posts.html', {'user_posts': user_posts, 'page_obj': page_obj})
@@ -5,8 +5,9 @@ from django.template import context
 from bookclub.templates import *
 from django.shortcuts import render, redirect
 from django.urls import reverse
-from bookclub.models import User, Club, Message, Chat, UserPost
+from bookclub.models import User, Club, Message, UserPost, get_or_create_chat
 from bookclub.forms import UserForm, UserPostForm
+from bookclub.realtime import publish_message
 from django.http import Http404
 from django.contrib.auth import login
 from django.views.generic.edit import UpdateView
@@ -14,7 +15,6 @@ from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.views.generic import ListView
 from django.template.loader import render_to_string
-from bookclub.views import config
 from django.core.paginator import Paginator
 
 class UserClubsListView(LoginRequiredMixin, ListView):
@@ -46,7 +46,7 @@ class UserClubsListView(LoginRequiredMixin, ListView):
         queried_user_id = self.kwargs['user_id']
         queried_user = User.objects.get(id=queried_user_id)
         all_clubs = queried_user.get_all_clubs()
-        paginator = Paginator(queried_user.get_all_clubs(), settings.CLUBS_PER_PAGE)
+        paginator = Paginator(all_clubs, settings.CLUBS_PER_PAGE)
         page_number = self.request.GET.get('page')
         page_obj = paginator.get_page(page_number)
 
@@ -95,7 +95,6 @@ class UsersListView(LoginRequiredMixin, ListView):
 def user_profile(request, user_id):
     """ Individual User's Profile Page """
     user = User.objects.get(id=user_id)
-    club_util(request)
     current_user = request.user
     following = request.user.is_following(user)
     followable = request.user != user
@@ -111,7 +110,7 @@ def user_profile(request, user_id):
                       'current_user': current_user,
                       'following': following,
                       'followable': followable,
-                      'user_clubs': config.user_clubs,
+                      'user_clubs': request.user.get_cached_clubs(),
                       'currently_reading_books': currently_reading_books[:3],
                       'form': form,
                       'posts': posts
@@ -169,10 +168,6 @@ def unfollow_from_user_profile(request, user_id):
     return redirect('user_profile', user_id=user_id)
 
 
-def club_util(request):
-    user_clubs_list = request.user.get_all_clubs()
-    config.user_clubs = user_clubs_list
-
 
 @login_required
 def inviteMessage(request, user_id, club_id):
@@ -182,15 +177,7 @@ def inviteMessage(request, user_id, club_id):
         'receiver': receiver.first_name,
         'sender': request.user.first_name,
         'club_name': club.name})
-    chat_query = Chat.objects.filter(user=request.user, receiver=receiver)
-    r_chat_query = Chat.objects.filter(receiver=request.user, user=receiver)
-    if chat_query:
-        chat = chat_query.get()
-    elif r_chat_query:
-        chat = r_chat_query.get()
-    else:
-        chat = Chat(user=request.user, receiver=receiver)
-        chat.save()
+    chat, created = get_or_create_chat(request.user, receiver)
     message = Message(
         chat=chat,
         sender_user=request.user,
@@ -198,5 +185,6 @@ def inviteMessage(request, user_id, club_id):
         body=body,
         club=club)
     message.save()
+    publish_message(message)
     messages.add_message(request, messages.SUCCESS, "Invite Sent!")
     return redirect('user_profile', user_id=user_id)
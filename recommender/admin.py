@@ -1,3 +1,9 @@
 from django.contrib import admin
+from .models import RecommendationJob
 
-# Register your models here.
+
+@admin.register(RecommendationJob)
+class RecommendationJobAdmin(admin.ModelAdmin):
+    list_display = [
+        'user', 'status', 'created_at', 'started_at'
+    ]
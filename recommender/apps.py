@@ -1,6 +1,13 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_save, post_delete
 
 
 class RecommenderConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'recommender'
+
+    def ready(self):
+        from bookclub.models import Book
+        from recommender.popular import clear_popular_books_cache
+        post_save.connect(clear_popular_books_cache, sender=Book, dispatch_uid='recommender_popular_books_save')
+        post_delete.connect(clear_popular_books_cache, sender=Book, dispatch_uid='recommender_popular_books_delete')
@@ -0,0 +1,162 @@
+"""Offline training and on-disk persistence of the SVD recommender model."""
+import glob
+import logging
+import os
+import time
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from surprise import SVD
+from surprise import Dataset, Reader
+from bookclub.models import Rating
+from recommender.datasets import load_datasets
+
+
+# Bump this whenever the layout of the saved arrays changes, so stale artifacts are ignored
+ARTIFACT_VERSION = 1
+MODEL_PREFIX = f'svd-v{ARTIFACT_VERSION}'
+
+# The newest artifact read from disk for each name prefix, as {'path': ..., 'mtime': ..., 'artifact': ...}
+_loaded_artifacts = {}
+
+logger = logging.getLogger(__name__)
+
+
+class SVDModel:
+    """The factor matrices, biases and id indexes of a trained SVD model."""
+
+    def __init__(self, pu, qi, bu, bi, global_mean, user_ids, isbns, trained_at=None):
+        self.pu = pu
+        self.qi = qi
+        self.bu = bu
+        self.bi = bi
+        self.global_mean = float(global_mean)
+        self.user_ids = user_ids
+        self.isbns = isbns
+        self.trained_at = trained_at if trained_at is not None else time.time()
+        self.user_index = {int(user_id): index for index, user_id in enumerate(user_ids)}
+        self.item_index = {str(isbn): index for index, isbn in enumerate(isbns)}
+
+    def estimate(self, user_id, isbn):
+        """Return the predicted rating, falling back to the biases for unknown users or books like surprise does."""
+        estimate = self.global_mean
+        user = self.user_index.get(user_id)
+        item = self.item_index.get(str(isbn))
+        if user is not None:
+            estimate += self.bu[user]
+        if item is not None:
+            estimate += self.bi[item]
+        if user is not None and item is not None:
+            estimate += np.dot(self.qi[item], self.pu[user])
+        return estimate
+
+
+def get_artifact_dir():
+    return str(settings.RECOMMENDER_ARTIFACT_DIR)
+
+
+def load_ratings():
+    """Return the preprocessed BX ratings together with every rating made on Bookwise."""
+    user_rating_df = load_datasets().to_dataframe()
+    new_ratings_df = pd.DataFrame(list(Rating.objects.all().values("user_id", "isbn", "rating")))
+    frames = [new_ratings_df, user_rating_df]
+    return pd.concat(frames, ignore_index=True)
+
+
+def train_model(ratings_df, **svd_options):
+    """Fit an SVD model on a ratings dataframe with user_id, isbn and rating columns."""
+    reader = Reader(rating_scale=(1, 10))
+    data = Dataset.load_from_df(ratings_df[['user_id', 'isbn', 'rating']], reader)
+    trainset = data.build_full_trainset()
+    algo = SVD(**svd_options)
+    algo.fit(trainset)
+
+    user_ids = np.array([trainset.to_raw_uid(inner_id) for inner_id in trainset.all_users()], dtype=np.int64)
+    isbns = np.array([str(trainset.to_raw_iid(inner_id)) for inner_id in trainset.all_items()], dtype=str)
+
+    return SVDModel(
+        pu=algo.pu, qi=algo.qi, bu=algo.bu, bi=algo.bi, global_mean=trainset.global_mean,
+        user_ids=user_ids, isbns=isbns
+    )
+
+
+def save_artifact(prefix, version, trained_at, arrays, artifact_dir=None):
+    """Write the arrays with the version and training time to a new .npz artifact and return its path."""
+    artifact_dir = artifact_dir or get_artifact_dir()
+    os.makedirs(artifact_dir, exist_ok=True)
+    path = os.path.join(artifact_dir, f'{prefix}-{int(trained_at * 1000)}.npz')
+
+    """ Write to a temporary file first so workers never load a half-written artifact """
+
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as artifact:
+        np.savez(artifact, version=np.array(version), trained_at=np.array(trained_at), **arrays)
+    os.replace(temp_path, path)
+    return path
+
+
+def read_artifact(path, version, description, build):
+    """Return build() of the arrays of an artifact, raising ValueError if it was saved in another version."""
+    with np.load(path, allow_pickle=False) as artifact:
+        if int(artifact['version']) != version:
+            raise ValueError(f'{path} is not a version {version} {description}')
+        return build(artifact)
+
+
+def load_artifact(prefix, read, description, artifact_dir=None):
+    """Return read() of the newest artifact with the given name prefix, reading it only when a new one appears."""
+    path = latest_artifact_path(artifact_dir, prefix)
+    if path is None:
+        logger.warning('No %s in %s, run manage.py train_recommender', description, artifact_dir or get_artifact_dir())
+        return None
+    mtime = os.path.getmtime(path)
+    loaded = _loaded_artifacts.get(prefix)
+    if loaded is None or loaded['path'] != path or loaded['mtime'] != mtime:
+        loaded = {'path': path, 'mtime': mtime, 'artifact': read(path)}
+        _loaded_artifacts[prefix] = loaded
+    return loaded['artifact']
+
+
+def save_model(model, artifact_dir=None):
+    """Write the model to a new versioned .npz artifact and return its path."""
+    return save_artifact(MODEL_PREFIX, ARTIFACT_VERSION, model.trained_at, {
+        'pu': model.pu, 'qi': model.qi, 'bu': model.bu, 'bi': model.bi,
+        'global_mean': np.array(model.global_mean), 'user_ids': model.user_ids, 'isbns': model.isbns,
+    }, artifact_dir)
+
+
+def list_artifacts(artifact_dir=None, prefix=MODEL_PREFIX):
+    """Return the paths of all artifacts with the given name prefix, oldest first."""
+    artifact_dir = artifact_dir or get_artifact_dir()
+    paths = glob.glob(os.path.join(artifact_dir, f'{prefix}-*.npz'))
+    return sorted(paths, key=lambda path: int(path.rsplit('-', 1)[1][:-len('.npz')]))
+
+
+def latest_artifact_path(artifact_dir=None, prefix=MODEL_PREFIX):
+    """Return the path of the newest artifact with the given name prefix, or None if none exist."""
+    paths = list_artifacts(artifact_dir, prefix)
+    if not paths:
+        return None
+    return paths[-1]
+
+
+def prune_artifacts(keep, artifact_dir=None, prefix=MODEL_PREFIX):
+    """Delete all but the newest `keep` artifacts with the given name prefix and return the deleted paths."""
+    paths = list_artifacts(artifact_dir, prefix)
+    stale_paths = paths[:-keep] if keep > 0 else paths
+    for path in stale_paths:
+        os.remove(path)
+    return stale_paths
+
+
+def read_model(path):
+    return read_artifact(path, ARTIFACT_VERSION, 'recommender artifact', lambda artifact: SVDModel(
+        pu=artifact['pu'], qi=artifact['qi'], bu=artifact['bu'], bi=artifact['bi'],
+        global_mean=artifact['global_mean'], user_ids=artifact['user_ids'], isbns=artifact['isbns'],
+        trained_at=float(artifact['trained_at'])
+    ))
+
+
+def load_model(artifact_dir=None):
+    """Return the newest trained model, reading it from disk only when a new artifact appears."""
+    return load_artifact(MODEL_PREFIX, read_model, 'recommender model', artifact_dir)
@@ -0,0 +1,43 @@
+"""Precompute the recommendations of every eligible user in one pass over the trained item factors."""
+from django.db import transaction
+from django.db.models import Count
+from bookclub.models import Rating, RecommendedBook
+from recommender.engines import get_catalogue_mask, recommend_for_users
+
+MIN_RATINGS = 20
+
+
+def eligible_user_ids(min_ratings=MIN_RATINGS):
+    """Return the ids of the users who have rated enough books to receive recommendations."""
+    return list(
+        Rating.objects.filter(user__isnull=False)
+        .values('user_id')
+        .annotate(ratings_count=Count('id'))
+        .filter(ratings_count__gte=min_ratings)
+        .order_by('user_id')
+        .values_list('user_id', flat=True)
+    )
+
+
+def precompute_recommendations(model, user_ids, top_n=10, chunk_size=500):
+    """Replace the stored recommendations of the given users, chunk by chunk, and return how many were written."""
+    catalogue_mask = get_catalogue_mask(model)
+    written = 0
+
+    for start in range(0, len(user_ids), chunk_size):
+        chunk = user_ids[start:start + chunk_size]
+        ratings_by_user = {}
+        for user_id, isbn, rating in Rating.objects.filter(user_id__in=chunk).values_list('user_id', 'isbn', 'rating'):
+            ratings_by_user.setdefault(user_id, []).append((isbn, rating))
+
+        recommended_books = [
+            RecommendedBook(user_id=user_id, isbn=isbn)
+            for user_id, isbns in recommend_for_users(model, chunk, ratings_by_user, top_n, catalogue_mask)
+            for isbn in isbns
+        ]
+        with transaction.atomic():
+            RecommendedBook.objects.filter(user_id__in=chunk).delete()
+            RecommendedBook.objects.bulk_create(recommended_books)
+        written += len(recommended_books)
+
+    return written
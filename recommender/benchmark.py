@@ -0,0 +1,100 @@
+"""Benchmarks of the recommender on synthetic rating matrices of different sizes."""
+import platform
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from recommender.artifacts import train_model
+from recommender.engines import recommend_for_user, recommend_for_users
+
+
+def start_tracing_allocations():
+    """Trace memory allocations from zero, returning whether tracing was already on for the caller to restore."""
+    if tracemalloc.is_tracing():
+        tracemalloc.clear_traces()
+        return True
+    tracemalloc.start()
+    return False
+
+
+def peak_allocated_mb(was_tracing):
+    """Return the peak memory allocated since start_tracing_allocations in megabytes, and stop tracing if it started it."""
+    peak = tracemalloc.get_traced_memory()[1]
+    if not was_tracing:
+        tracemalloc.stop()
+    return peak / (1024 * 1024)
+
+
+def synthetic_ratings(n_ratings, n_users, n_books, seed=0):
+    """Return a ratings dataframe with popularity skewed books and ratings driven by hidden tastes."""
+    rng = np.random.default_rng(seed)
+    users = rng.integers(0, n_users, size=n_ratings)
+    popularity = 1.0 / np.arange(1, n_books + 1) ** 0.8
+    books = rng.choice(n_books, size=n_ratings, p=popularity / popularity.sum())
+
+    user_tastes = rng.normal(size=(n_users, 4))
+    book_traits = rng.normal(size=(n_books, 4))
+    affinity = np.einsum('ij,ij->i', user_tastes[users], book_traits[books])
+    ratings = np.clip(np.rint(6.5 + 1.2 * affinity + rng.normal(scale=1.0, size=n_ratings)), 1, 10)
+
+    ratings_df = pd.DataFrame({
+        'user_id': users.astype(np.int64),
+        'isbn': np.char.zfill(books.astype(str), 10).astype(object),
+        'rating': ratings.astype(np.int64),
+    })
+    return ratings_df.drop_duplicates(subset=['user_id', 'isbn'], ignore_index=True)
+
+
+def timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def benchmark_size(n_ratings, ratings_per_user=20, ratings_per_book=10, sample_users=200, top_n=10,
+                   chunk_size=500, seed=0, **svd_options):
+    """Time training, per-user scoring and batch scoring on one synthetic dataset and return the results.
+
+    Memory is measured as the peak of the allocations traced while this size runs, so each size reports its
+    own peak rather than the largest one of the process so far. Tracing slows down Python allocations a little."""
+    was_tracing = start_tracing_allocations()
+    n_users = max(1, n_ratings // ratings_per_user)
+    n_books = max(1, n_ratings // ratings_per_book)
+    ratings_df = synthetic_ratings(n_ratings, n_users, n_books, seed)
+    model, training_seconds = timed(train_model, ratings_df, **svd_options)
+
+    ratings_by_user = {}
+    for user_id, isbn, rating in ratings_df.itertuples(index=False):
+        ratings_by_user.setdefault(user_id, []).append((isbn, rating))
+    user_ids = sorted(ratings_by_user)[:sample_users]
+
+    start = time.perf_counter()
+    for user_id in user_ids:
+        recommend_for_user(model, user_id, top_n, ratings_by_user[user_id])
+    per_user_seconds = (time.perf_counter() - start) / max(1, len(user_ids))
+
+    catalogue_mask = np.ones(len(model.isbns), dtype=bool)
+    start = time.perf_counter()
+    for chunk_start in range(0, len(user_ids), chunk_size):
+        recommend_for_users(model, user_ids[chunk_start:chunk_start + chunk_size], ratings_by_user, top_n, catalogue_mask)
+    batch_seconds = time.perf_counter() - start
+
+    return {
+        'ratings': len(ratings_df),
+        'users': len(model.user_ids),
+        'books': len(model.isbns),
+        'training_seconds': training_seconds,
+        'per_user_scoring_ms': per_user_seconds * 1000,
+        'batch_scoring_users_per_second': len(user_ids) / batch_seconds if batch_seconds > 0 else None,
+        'peak_allocated_mb': peak_allocated_mb(was_tracing),
+    }
+
+
+def run_benchmarks(sizes, **options):
+    """Benchmark every size in turn and return a JSON serialisable report."""
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'results': [benchmark_size(size, **options) for size in sizes],
+    }
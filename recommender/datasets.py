@@ -0,0 +1,98 @@
+"""Columnar, memory-mapped storage of the preprocessed BX ratings and most popular books."""
+import os
+import numpy as np
+import pandas as pd
+from django.conf import settings
+
+DATASET_FILES = ('users', 'isbns', 'rating_users', 'rating_items', 'rating_values', 'popular_items', 'popular_counts')
+
+_loaded_datasets = {}
+
+
+class RatingsDataset:
+    """Integer encoded rating columns, with the user ids and ISBNs they index into.
+
+    The arrays are memory-mapped read-only, so every worker process shares the same pages."""
+
+    def __init__(self, users, isbns, rating_users, rating_items, rating_values, popular_items, popular_counts):
+        self.users = users
+        self.isbns = isbns
+        self.rating_users = rating_users
+        self.rating_items = rating_items
+        self.rating_values = rating_values
+        self.popular_items = popular_items
+        self.popular_counts = popular_counts
+
+    def __len__(self):
+        return len(self.rating_values)
+
+    def to_dataframe(self):
+        """Return the ratings as a dataframe with user_id, isbn and rating columns."""
+        return pd.DataFrame({
+            'user_id': self.users[self.rating_users],
+            'isbn': self.isbns[self.rating_items].astype(object),
+            'rating': self.rating_values.astype(np.int64),
+        })
+
+    def popular_isbns(self):
+        """Return the ISBNs of the most rated books, most popular first."""
+        return [str(isbn) for isbn in self.isbns[self.popular_items]]
+
+
+def get_dataset_dir():
+    return str(settings.RECOMMENDER_DATASET_DIR)
+
+
+def encode_datasets(user_rating_df, most_popular_df):
+    """Return the columns of a RatingsDataset built from the preprocessed dataframes."""
+    users, rating_users = np.unique(user_rating_df['user_id'].to_numpy(dtype=np.int64), return_inverse=True)
+    isbns, rating_items = np.unique(user_rating_df['isbn'].astype(str).to_numpy(dtype=str), return_inverse=True)
+
+    popular_isbns = most_popular_df['isbn'].astype(str).to_numpy(dtype=str)
+    popular_items = np.searchsorted(isbns, popular_isbns)
+    if not np.array_equal(isbns[np.minimum(popular_items, len(isbns) - 1)], popular_isbns):
+        raise ValueError('Every popular book must appear in the ratings')
+
+    return {
+        'users': users,
+        'isbns': isbns,
+        'rating_users': rating_users.astype(np.int32),
+        'rating_items': rating_items.astype(np.int32),
+        'rating_values': user_rating_df['rating'].to_numpy(dtype=np.int8),
+        'popular_items': popular_items.astype(np.int32),
+        'popular_counts': most_popular_df['rating'].to_numpy(dtype=np.int64),
+    }
+
+
+def write_datasets(user_rating_df, most_popular_df, dataset_dir=None):
+    """Write the preprocessed dataframes as .npy columns and return the directory."""
+    dataset_dir = dataset_dir or get_dataset_dir()
+    os.makedirs(dataset_dir, exist_ok=True)
+    for name, column in encode_datasets(user_rating_df, most_popular_df).items():
+        path = os.path.join(dataset_dir, name + '.npy')
+        with open(path + '.tmp', 'wb') as column_file:
+            np.save(column_file, column, allow_pickle=False)
+        os.replace(path + '.tmp', path)
+    _loaded_datasets.pop(dataset_dir, None)
+    return dataset_dir
+
+
+def file_version(path):
+    """Return a key that changes whenever the file at path is rewritten or replaced."""
+    stat = os.stat(path)
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def load_datasets(dataset_dir=None):
+    """Return the memory-mapped datasets, opening the files again only after they are rewritten."""
+    dataset_dir = dataset_dir or get_dataset_dir()
+    version = file_version(os.path.join(dataset_dir, 'isbns.npy'))
+    loaded = _loaded_datasets.get(dataset_dir)
+    if loaded is None or loaded[0] != version:
+        columns = {
+            name: np.load(os.path.join(dataset_dir, name + '.npy'), mmap_mode='r', allow_pickle=False)
+            for name in DATASET_FILES
+        }
+        loaded = (version, RatingsDataset(**columns))
+        _loaded_datasets[dataset_dir] = loaded
+    return loaded[1]
@@ -0,0 +1,105 @@
+"""Selection of the recommender engine configured by RECOMMENDER_ENGINE."""
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from bookclub.models import Book, RecommendedBook
+from recommender.artifacts import load_ratings, load_model, train_model, save_model, prune_artifacts
+from recommender.fold_in import fold_in, get_user_ratings
+from recommender.item_similarity import ItemSimilarityIndex, INDEX_PREFIX, build_index, save_index, load_index
+from recommender.scoring import isbn_mask, top_n_per_row
+
+SVD = 'svd'
+ITEM_KNN = 'item_knn'
+ENGINES = (SVD, ITEM_KNN)
+
+
+def get_engine_name():
+    engine = settings.RECOMMENDER_ENGINE
+    if engine not in ENGINES:
+        raise ValueError(f'RECOMMENDER_ENGINE must be one of {", ".join(ENGINES)}, not {engine!r}')
+    return engine
+
+
+def train_engine(ratings_df, engine=None, keep=3):
+    """Train the engine on a ratings dataframe, save it as the newest artifact and return the model and path."""
+    engine = engine or get_engine_name()
+    if engine == ITEM_KNN:
+        model = build_index(ratings_df, k=settings.RECOMMENDER_NEIGHBOURS)
+        path = save_index(model)
+        prune_artifacts(keep, prefix=INDEX_PREFIX)
+    else:
+        model = train_model(ratings_df)
+        path = save_model(model)
+        prune_artifacts(keep)
+    return model, path
+
+
+def load_engine():
+    """Return the newest trained model of the configured engine, or None if it has not been trained."""
+    if get_engine_name() == ITEM_KNN:
+        return load_index()
+    return load_model()
+
+
+def ensure_engine():
+    """Return the newest model of the configured engine, training one first if this machine has none.
+
+    Artifacts are files on the local disk, so a fresh host such as a new Heroku dyno starts without one."""
+    model = load_engine()
+    if model is None:
+        model, path = train_engine(load_ratings())
+    return model
+
+
+def score_users(model, user_ids, ratings_by_user):
+    """Return a dense users by items matrix of predicted scores for the given users."""
+    if isinstance(model, ItemSimilarityIndex):
+        return model.score_users(ratings_by_user, user_ids)
+    user_vectors = np.zeros((len(user_ids), model.qi.shape[1]))
+    user_biases = np.zeros(len(user_ids))
+    for row, user_id in enumerate(user_ids):
+        user_vectors[row], user_biases[row] = fold_in(model, ratings_by_user.get(user_id, ()), user_id)
+    return model.global_mean + user_biases[:, None] + model.bi[None, :] + user_vectors @ model.qi.T
+
+
+def get_catalogue_mask(model):
+    """Return a boolean array over the model's items that is True for the books in the catalogue."""
+    return isbn_mask(model, Book.objects.values_list('isbn', flat=True))
+
+
+def recommend_for_users(model, user_ids, ratings_by_user, top_n, catalogue_mask=None):
+    """Return a list of (user_id, [isbn, ...]) pairs of each user's top_n unrated books, best first.
+
+    Rated books and, given a catalogue_mask, books outside it are ruled out before the top_n are chosen,
+    so every user gets top_n books whenever that many are left."""
+    scores = score_users(model, user_ids, ratings_by_user)
+    if catalogue_mask is not None:
+        scores[:, ~catalogue_mask] = -np.inf
+    for row, user_id in enumerate(user_ids):
+        rated = [model.item_index[isbn] for isbn, rating in ratings_by_user.get(user_id, ()) if isbn in model.item_index]
+        scores[row, rated] = -np.inf
+
+    results = []
+    for user_id, row_scores, indexes in zip(user_ids, scores, top_n_per_row(scores, top_n)):
+        indexes = indexes[np.isfinite(row_scores[indexes])]
+        results.append((user_id, [str(isbn) for isbn in model.isbns[indexes]]))
+    return results
+
+
+def recommend_for_user(model, user_id, top_n, ratings=None, catalogue_mask=None):
+    """Return the ISBNs of the top_n unrated books for a user, best first, reading their ratings if not given."""
+    if ratings is None:
+        ratings = get_user_ratings(user_id)
+    return recommend_for_users(model, [user_id], {user_id: ratings}, top_n, catalogue_mask)[0][1]
+
+
+def refresh_user_recommendations(user, top_n=10):
+    """Replace a user's stored recommendations using their current ratings, returning the new ISBNs."""
+    model = load_engine()
+    if model is None:
+        return []
+    isbns = recommend_for_user(model, user.id, top_n, catalogue_mask=get_catalogue_mask(model))
+    with transaction.atomic():
+        RecommendedBook.objects.filter(user=user).delete()
+        RecommendedBook.objects.bulk_create([RecommendedBook(user=user, isbn=isbn) for isbn in isbns])
+    return isbns
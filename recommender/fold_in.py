@@ -0,0 +1,38 @@
+"""Fold a user's latest ratings into their latent vector without retraining the whole model."""
+import numpy as np
+from bookclub.models import Rating
+
+
+def user_factors(model, user_id):
+    """Return the latent vector and bias of a user, or zeros when the model has not seen them."""
+    user = model.user_index.get(user_id)
+    if user is None:
+        return np.zeros(model.qi.shape[1]), 0.0
+    return model.pu[user], model.bu[user]
+
+
+def fold_in(model, ratings, user_id=None, n_steps=3, reg=0.02):
+    """Return a (vector, bias) pair fitted to (isbn, rating) pairs against the fixed item factors.
+
+    Each step solves the regularised least squares problem for the vector and then for the bias,
+    which is the same objective SVD minimises during training, restricted to one user."""
+    pairs = [(model.item_index[isbn], rating) for isbn, rating in ratings if isbn in model.item_index]
+    if not pairs:
+        return user_factors(model, user_id)
+
+    items = np.array([item for item, rating in pairs])
+    values = np.array([rating for item, rating in pairs], dtype=float)
+    item_factors = model.qi[items]
+    residuals = values - model.global_mean - model.bi[items]
+    penalty = reg * len(pairs)
+    gram = item_factors.T @ item_factors + penalty * np.eye(item_factors.shape[1])
+
+    vector, bias = user_factors(model, user_id)
+    for step in range(n_steps):
+        vector = np.linalg.solve(gram, item_factors.T @ (residuals - bias))
+        bias = (residuals - item_factors @ vector).sum() / (len(pairs) + penalty)
+    return vector, bias
+
+
+def get_user_ratings(user_id):
+    return list(Rating.objects.filter(user_id=user_id).values_list('isbn', 'rating'))
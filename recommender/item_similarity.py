@@ -0,0 +1,105 @@
+"""Item-item collaborative filtering over a precomputed top-K cosine similarity index."""
+import time
+import numpy as np
+from scipy import sparse
+from recommender.artifacts import load_artifact, read_artifact, save_artifact
+
+INDEX_VERSION = 1
+INDEX_PREFIX = f'item-knn-v{INDEX_VERSION}'
+
+
+class ItemSimilarityIndex:
+    """The K most similar books of every book, as a sparse item by item matrix."""
+
+    def __init__(self, neighbours, isbns, popularity, trained_at=None):
+        self.neighbours = neighbours
+        self.isbns = isbns
+        self.popularity = popularity
+        self.trained_at = trained_at if trained_at is not None else time.time()
+        self.item_index = {str(isbn): index for index, isbn in enumerate(isbns)}
+
+    def ratings_matrix(self, ratings_by_user, user_ids):
+        """Return a sparse users by items matrix of the given users' ratings of indexed books."""
+        rows, columns, values = [], [], []
+        for row, user_id in enumerate(user_ids):
+            for isbn, rating in ratings_by_user.get(user_id, ()):
+                item = self.item_index.get(isbn)
+                if item is not None:
+                    rows.append(row)
+                    columns.append(item)
+                    values.append(float(rating))
+        return sparse.csr_matrix((values, (rows, columns)), shape=(len(user_ids), len(self.isbns)))
+
+    def score_users(self, ratings_by_user, user_ids):
+        """Return a dense users by items score matrix, the sparse product of ratings and neighbours.
+
+        Users without any rated book in the index fall back to the popularity of each book."""
+        ratings = self.ratings_matrix(ratings_by_user, user_ids)
+        scores = (ratings @ self.neighbours).toarray()
+        cold_users = np.diff(ratings.indptr) == 0
+        scores[cold_users] = self.popularity
+        return scores
+
+
+def keep_top_k(similarities, k):
+    """Return a copy of a square CSR matrix with only the k largest off-diagonal entries of each row."""
+    similarities = similarities.tocsr()
+    similarities.setdiag(0)
+    similarities.eliminate_zeros()
+    rows, columns, values = [], [], []
+    for row in range(similarities.shape[0]):
+        start, end = similarities.indptr[row], similarities.indptr[row + 1]
+        row_values = similarities.data[start:end]
+        row_columns = similarities.indices[start:end]
+        if len(row_values) > k:
+            best = np.argpartition(-row_values, k - 1)[:k]
+            row_values, row_columns = row_values[best], row_columns[best]
+        rows.extend([row] * len(row_values))
+        columns.extend(row_columns)
+        values.extend(row_values)
+    return sparse.csr_matrix((values, (rows, columns)), shape=similarities.shape, dtype=np.float32)
+
+
+def build_index(ratings_df, k=50):
+    """Build the similarity index from a ratings dataframe with user_id, isbn and rating columns."""
+    user_ids, user_rows = np.unique(ratings_df['user_id'].to_numpy(dtype=np.int64), return_inverse=True)
+    isbns, item_columns = np.unique(ratings_df['isbn'].astype(str).to_numpy(dtype=str), return_inverse=True)
+    ratings = sparse.csr_matrix(
+        (ratings_df['rating'].to_numpy(dtype=np.float32), (user_rows, item_columns)),
+        shape=(len(user_ids), len(isbns))
+    )
+    ratings.sum_duplicates()
+
+    norms = np.sqrt(np.asarray(ratings.multiply(ratings).sum(axis=0))).ravel()
+    norms[norms == 0] = 1.0
+    normalised = ratings @ sparse.diags(1.0 / norms)
+    similarities = (normalised.T @ normalised).tocsr()
+
+    popularity = np.diff(ratings.tocsc().indptr).astype(np.float32)
+    return ItemSimilarityIndex(keep_top_k(similarities, k), isbns, popularity / max(1.0, popularity.max()))
+
+
+def save_index(index, artifact_dir=None):
+    """Write the index to a new versioned .npz artifact and return its path."""
+    neighbours = index.neighbours.tocsr()
+    return save_artifact(INDEX_PREFIX, INDEX_VERSION, index.trained_at, {
+        'data': neighbours.data, 'indices': neighbours.indices, 'indptr': neighbours.indptr,
+        'isbns': index.isbns, 'popularity': index.popularity,
+    }, artifact_dir)
+
+
+def build_from_artifact(artifact):
+    size = len(artifact['isbns'])
+    neighbours = sparse.csr_matrix((artifact['data'], artifact['indices'], artifact['indptr']), shape=(size, size))
+    return ItemSimilarityIndex(
+        neighbours, artifact['isbns'], artifact['popularity'], trained_at=float(artifact['trained_at'])
+    )
+
+
+def read_index(path):
+    return read_artifact(path, INDEX_VERSION, 'item similarity index', build_from_artifact)
+
+
+def load_index(artifact_dir=None):
+    """Return the newest similarity index, reading it from disk only when a new artifact appears."""
+    return load_artifact(INDEX_PREFIX, read_index, 'item similarity index', artifact_dir)
@@ -0,0 +1,27 @@
+"""Running queued recommendation jobs outside of the request cycle."""
+import traceback
+from recommender.engines import refresh_user_recommendations
+from recommender.models import RecommendationJob
+
+
+def run_job(job):
+    """Recompute the recommendations of the job's user and record whether it succeeded."""
+    try:
+        refresh_user_recommendations(job.user)
+    except Exception:
+        job.finish(RecommendationJob.FAILED, traceback.format_exc())
+        return False
+    job.finish(RecommendationJob.DONE)
+    return True
+
+
+def run_pending_jobs(limit=None):
+    """Run queued jobs until the queue is empty or limit jobs have run, and return how many ran."""
+    ran = 0
+    while limit is None or ran < limit:
+        job = RecommendationJob.claim_next()
+        if job is None:
+            break
+        run_job(job)
+        ran += 1
+    return ran
@@ -0,0 +1,40 @@
+import json
+from django.core.management.base import BaseCommand
+from recommender.benchmark import run_benchmarks
+
+
+class Command(BaseCommand):
+    """Measure how the recommender scales with the number of users, books and ratings"""
+
+    help = 'Benchmark training, per-user scoring and batch scoring on synthetic ratings and write the results as JSON.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000],
+                            help='Numbers of synthetic ratings to benchmark.')
+        parser.add_argument('--ratings-per-user', type=int, default=20)
+        parser.add_argument('--ratings-per-book', type=int, default=10)
+        parser.add_argument('--sample-users', type=int, default=200, help='Number of users to score per size.')
+        parser.add_argument('--epochs', type=int, default=20, help='SVD training epochs.')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', default='bench_output.json', help='File to write the JSON results to.')
+
+    def handle(self, *args, **options):
+        report = run_benchmarks(
+            options['sizes'],
+            ratings_per_user=options['ratings_per_user'],
+            ratings_per_book=options['ratings_per_book'],
+            sample_users=options['sample_users'],
+            seed=options['seed'],
+            n_epochs=options['epochs'],
+        )
+        with open(options['output'], 'w') as output:
+            json.dump(report, output, indent=2)
+
+        for result in report['results']:
+            self.stdout.write(
+                f"{result['ratings']:>9} ratings: training {result['training_seconds']:.2f}s, "
+                f"per user {result['per_user_scoring_ms']:.2f}ms, "
+                f"batch {result['batch_scoring_users_per_second'] or 0:.0f} users/s, "
+                f"peak allocated {result['peak_allocated_mb']:.0f}MB"
+            )
+        self.stdout.write(f"[ COMPLETED: Results written to {options['output']} ]")
@@ -0,0 +1,19 @@
+import pickle
+from django.core.management.base import BaseCommand
+from recommender.datasets import write_datasets
+
+
+class Command(BaseCommand):
+    """Convert the pickled dataframes made by older versions of `manage.py recommender` to the columnar store"""
+
+    help = 'Convert the pickled BX ratings and most popular books to memory-mappable .npy columns.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ratings', default='data/user_item_rating.p', help='Pickled ratings dataframe.')
+        parser.add_argument('--popular', default='data/most_popular_item.p', help='Pickled most popular dataframe.')
+
+    def handle(self, *args, **options):
+        user_rating_df = pickle.load(open(options['ratings'], 'rb'))
+        most_popular_df = pickle.load(open(options['popular'], 'rb'))
+        dataset_dir = write_datasets(user_rating_df, most_popular_df)
+        self.stdout.write(f'[ COMPLETED: Converted {len(user_rating_df)} ratings to {dataset_dir} ]')
@@ -0,0 +1,31 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from recommender.engines import load_engine
+from recommender.batch import eligible_user_ids, precompute_recommendations, MIN_RATINGS
+
+
+class Command(BaseCommand):
+    """Write the recommendations of every eligible user so the home page never has to compute them"""
+
+    help = 'Precompute recommended books for every user with enough ratings using the latest trained model.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top-n', type=int, default=10, help='Number of books to recommend to each user.')
+        parser.add_argument('--chunk-size', type=int, default=500, help='Number of users scored per matrix product.')
+        parser.add_argument('--min-ratings', type=int, default=MIN_RATINGS,
+                            help='Minimum number of ratings a user needs to receive recommendations.')
+
+    def handle(self, *args, **options):
+        model = load_engine()
+        if model is None:
+            raise CommandError('No trained recommender found, run `manage.py train_recommender` first.')
+
+        start = time.perf_counter()
+        user_ids = eligible_user_ids(options['min_ratings'])
+        written = precompute_recommendations(model, user_ids, options['top_n'], options['chunk_size'])
+        elapsed = time.perf_counter() - start
+        throughput = len(user_ids) / elapsed if elapsed > 0 else 0.0
+        self.stdout.write(
+            f'[ COMPLETED: Wrote {written} recommendations for {len(user_ids)} users '
+            f'in {elapsed:.2f}s ({throughput:.1f} users/second) ]'
+        )
@@ -0,0 +1,28 @@
+import time
+from django.core.management.base import BaseCommand
+from recommender.engines import ensure_engine
+from recommender.jobs import run_pending_jobs
+
+
+class Command(BaseCommand):
+    """Poll the recommendation job table and compute recommendations in the background"""
+
+    help = 'Run queued recommendation jobs, polling the database for new ones.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--poll-interval', type=float, default=2.0, help='Seconds to wait when the queue is empty.')
+        parser.add_argument('--once', action='store_true', help='Run the jobs that are queued now, then exit.')
+        parser.add_argument('--train-if-missing', action='store_true',
+                            help='Train the recommender first when no model has been saved on this machine.')
+
+    def handle(self, *args, **options):
+        if options['train_if_missing']:
+            model = ensure_engine()
+            self.stdout.write(f'Using a recommender model of {len(model.isbns)} books')
+        while True:
+            ran = run_pending_jobs()
+            if ran:
+                self.stdout.write(f'Ran {ran} recommendation job(s)')
+            if options['once']:
+                break
+            time.sleep(options['poll_interval'])
@@ -1,7 +1,7 @@
-import pickle
 import pandas as pd
 import numpy as np
 from django.core.management.base import BaseCommand, CommandError
+from recommender.datasets import write_datasets
 
 
 def pre_process():
@@ -52,10 +52,6 @@ def pre_process():
 
     user_rating_df.rename(columns={'book_rating': 'rating'}, inplace=True)
 
-    """ Return the cleaned ratings dataset as a pickle """
-
-    pickle.dump(user_rating_df, open('data/user_item_rating.p', 'wb'))
-
     return user_rating_df
 
 
@@ -64,11 +60,15 @@ def get_most_popular_books(user_rating_df):
     most_popular_df = most_popular_df.groupby(['isbn']).agg('count')['rating'].reset_index()
     most_popular_df = most_popular_df.sort_values('rating', ascending=False)
     most_popular_df = most_popular_df.head(25)
-    pickle.dump(most_popular_df, open('data/most_popular_item.p', 'wb'))
+    return most_popular_df
 
 
 class Command(BaseCommand):
 
     def handle(self, *args, **options):
         user_rating_df = pre_process()
-        get_most_popular_books(user_rating_df)
+        most_popular_df = get_most_popular_books(user_rating_df)
+
+        """ Save the cleaned ratings and most popular books as memory-mappable columns """
+
+        write_datasets(user_rating_df, most_popular_df)
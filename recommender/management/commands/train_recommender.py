@@ -0,0 +1,24 @@
+import time
+from django.core.management.base import BaseCommand
+from recommender.artifacts import load_ratings
+from recommender.engines import ENGINES, train_engine
+
+
+class Command(BaseCommand):
+    """Fit the recommender out-of-band and persist it for the home page to load"""
+
+    help = 'Train the configured recommender engine on all ratings and save it as a versioned artifact.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--keep', type=int, default=3, help='Number of previous artifacts to keep on disk.')
+        parser.add_argument('--engine', choices=ENGINES, help='Engine to train, defaults to RECOMMENDER_ENGINE.')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        ratings_df = load_ratings()
+        model, path = train_engine(ratings_df, options['engine'], options['keep'])
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            f'[ COMPLETED: Trained on {len(ratings_df)} ratings and {len(model.isbns)} books '
+            f'in {elapsed:.1f}s, saved to {path} ]'
+        )
@@ -1,3 +1,94 @@
-from django.db import models
+from datetime import timedelta
+from django.conf import settings
+from django.db import models, IntegrityError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
 
-# Create your models here.
+
+class RecommendationJob(models.Model):
+    """A request to recompute a user's recommendations, picked up by `manage.py recommendation_worker`"""
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    status = models.CharField(max_length=8, choices=STATUS_CHOICES, default=PENDING)
+    created_at = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True)
+
+    class Meta:
+        """Model options."""
+
+        ordering = ['created_at']
+        indexes = [models.Index(fields=['status', 'created_at'])]
+        constraints = [
+            models.UniqueConstraint(fields=['user'], condition=Q(status='pending'),
+                                    name='one_pending_recommendation_job_per_user'),
+        ]
+
+    @classmethod
+    def enqueue(cls, user):
+        """Queue a job for the user unless one is already waiting, and return the waiting job."""
+        try:
+            with transaction.atomic():
+                return cls.objects.create(user=user)
+        except IntegrityError:
+            return cls.objects.get(user=user, status=cls.PENDING)
+
+    @classmethod
+    def has_pending(cls, user):
+        return cls.objects.filter(user=user, status__in=[cls.PENDING, cls.RUNNING]).exists()
+
+    @classmethod
+    def finished_recently(cls, user):
+        """Return whether a job of the user finished, whatever the outcome, in the last RECOMMENDATION_JOB_BACKOFF."""
+        since = timezone.now() - timedelta(seconds=settings.RECOMMENDATION_JOB_BACKOFF)
+        return cls.objects.filter(user=user, status__in=[cls.DONE, cls.FAILED], finished_at__gte=since).exists()
+
+    @classmethod
+    def claimable(cls, now):
+        """Return the filter of jobs a worker may start: pending jobs, running jobs whose worker has not
+        finished them within RECOMMENDATION_JOB_TIMEOUT, and failed jobs due for another attempt."""
+        stale = now - timedelta(seconds=settings.RECOMMENDATION_JOB_TIMEOUT)
+        retry = now - timedelta(seconds=settings.RECOMMENDATION_JOB_RETRY_DELAY)
+        return (
+            Q(status=cls.PENDING)
+            | Q(status=cls.RUNNING, started_at__lt=stale)
+            | Q(status=cls.FAILED, attempts__lt=settings.RECOMMENDATION_JOB_ATTEMPTS, finished_at__lt=retry)
+        )
+
+    @classmethod
+    def claim_next(cls):
+        """Mark the oldest claimable job as running and return it, or None when the queue is empty.
+
+        Several workers can poll at once, so a job only counts as claimed if this worker's update won."""
+        now = timezone.now()
+        for job in cls.objects.filter(cls.claimable(now))[:5]:
+            claimed = cls.objects.filter(pk=job.pk, status=job.status, started_at=job.started_at).update(
+                status=cls.RUNNING, started_at=now, finished_at=None, attempts=F('attempts') + 1
+            )
+            if claimed:
+                job.refresh_from_db()
+                return job
+        return None
+
+    def finish(self, status, error=''):
+        """Record the outcome of the job and forget the older finished jobs of its user."""
+        self.status = status
+        self.error = error
+        self.finished_at = timezone.now()
+        self.save(update_fields=['status', 'error', 'finished_at'])
+        RecommendationJob.objects.filter(user_id=self.user_id, status__in=[self.DONE, self.FAILED]).exclude(
+            pk=self.pk
+        ).delete()
@@ -0,0 +1,46 @@
+"""Process-wide cache of the most popular books shown on the home page."""
+import os
+import threading
+from bookclub.models import Book
+from recommender.datasets import get_dataset_dir, file_version, load_datasets
+
+_cache_lock = threading.Lock()
+_popular_books_cache = {'version': None, 'books': None, 'hits': 0, 'misses': 0}
+
+
+def popular_items_path():
+    return os.path.join(get_dataset_dir(), 'popular_items.npy')
+
+
+def get_popular_books():
+    """Return the Book objects of the most popular books, resolving them again only when the file changes."""
+    version = file_version(popular_items_path())
+    with _cache_lock:
+        if _popular_books_cache['version'] == version and _popular_books_cache['books'] is not None:
+            _popular_books_cache['hits'] += 1
+            return _popular_books_cache['books']
+        _popular_books_cache['misses'] += 1
+
+    books = Book.objects.in_isbn_order(load_datasets().popular_isbns())
+
+    with _cache_lock:
+        _popular_books_cache['version'] = version
+        _popular_books_cache['books'] = books
+    return books
+
+
+def clear_popular_books_cache(**kwargs):
+    """Forget the resolved books, so that changes to the catalogue show up on the next request."""
+    with _cache_lock:
+        _popular_books_cache['version'] = None
+        _popular_books_cache['books'] = None
+
+
+def popular_books_cache_info():
+    """Return the hit and miss counters of this process's cache."""
+    with _cache_lock:
+        return {
+            'hits': _popular_books_cache['hits'],
+            'misses': _popular_books_cache['misses'],
+            'cached_books': len(_popular_books_cache['books'] or []),
+        }
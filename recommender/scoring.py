@@ -0,0 +1,21 @@
+"""Vectorised selection of the best scored books, shared by the per-user and batch recommenders."""
+import numpy as np
+
+
+def isbn_mask(model, isbns):
+    """Return a boolean array over the item index that is True for the given ISBNs."""
+    mask = np.zeros(len(model.isbns), dtype=bool)
+    indexes = [model.item_index[isbn] for isbn in isbns if isbn in model.item_index]
+    mask[indexes] = True
+    return mask
+
+
+def top_n_per_row(scores, top_n):
+    """Return, for every row of a score matrix, the column indexes of its top_n scores best first."""
+    top_n = min(top_n, scores.shape[1])
+    if top_n <= 0:
+        return np.empty((scores.shape[0], 0), dtype=np.intp)
+    candidates = np.argpartition(-scores, top_n - 1, axis=1)[:, :top_n]
+    candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+    order = np.argsort(-candidate_scores, axis=1, kind='stable')
+    return np.take_along_axis(candidates, order, axis=1)
@@ -0,0 +1,72 @@
+"""Unit tests for the recommender model artifacts"""
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from django.test import TestCase, override_settings
+from recommender.artifacts import SVDModel, train_model, save_model, load_model, latest_artifact_path, \
+    prune_artifacts
+
+
+class ArtifactsTestCase(TestCase):
+    """Test case for training, saving and loading the SVD recommender"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.settings_override = override_settings(RECOMMENDER_ARTIFACT_DIR=self.temp_dir.name)
+        self.settings_override.enable()
+        self.ratings_df = pd.DataFrame({
+            'user_id': [1, 1, 1, 2, 2, 3, 3, 3],
+            'isbn': ['0000000001', '0000000002', '0000000003', '0000000001', '0000000004',
+                     '0000000002', '0000000003', '0000000004'],
+            'rating': [10, 8, 2, 9, 4, 7, 3, 5]
+        })
+
+    def tearDown(self):
+        self.settings_override.disable()
+        self.temp_dir.cleanup()
+
+    def test_train_model_indexes_all_users_and_books(self):
+        model = train_model(self.ratings_df, n_factors=4, n_epochs=5)
+        self.assertEqual(sorted(model.user_index), [1, 2, 3])
+        self.assertEqual(sorted(model.item_index), ['0000000001', '0000000002', '0000000003', '0000000004'])
+        self.assertEqual(model.pu.shape, (3, 4))
+        self.assertEqual(model.qi.shape, (4, 4))
+        self.assertAlmostEqual(model.global_mean, self.ratings_df['rating'].mean())
+
+    def test_load_model_returns_none_without_artifact(self):
+        with self.assertLogs('recommender.artifacts', 'WARNING') as logs:
+            self.assertIsNone(load_model())
+        self.assertIn('train_recommender', logs.output[0])
+
+    def test_saved_model_can_be_loaded(self):
+        model = train_model(self.ratings_df, n_factors=4, n_epochs=5)
+        path = save_model(model)
+        self.assertTrue(os.path.exists(path))
+        loaded = load_model()
+        np.testing.assert_array_equal(loaded.pu, model.pu)
+        np.testing.assert_array_equal(loaded.qi, model.qi)
+        np.testing.assert_array_equal(loaded.isbns, model.isbns)
+        self.assertAlmostEqual(loaded.estimate(1, '0000000004'), model.estimate(1, '0000000004'))
+
+    def test_load_model_picks_newest_artifact(self):
+        save_model(self._create_model(trained_at=1000.0))
+        newest = save_model(self._create_model(trained_at=2000.0))
+        self.assertEqual(latest_artifact_path(), newest)
+        self.assertEqual(load_model().trained_at, 2000.0)
+
+    def test_prune_artifacts_keeps_newest(self):
+        for trained_at in (1000.0, 2000.0, 3000.0):
+            save_model(self._create_model(trained_at=trained_at))
+        self.assertEqual(len(prune_artifacts(keep=1)), 2)
+        self.assertEqual(load_model().trained_at, 3000.0)
+
+    def test_estimate_falls_back_to_biases_for_unknown_user(self):
+        model = self._create_model()
+        self.assertAlmostEqual(model.estimate(99, 'b'), 5.0 + 0.5)
+
+    def _create_model(self, trained_at=None):
+        return SVDModel(
+            pu=np.ones((2, 3)), qi=np.ones((2, 3)), bu=np.array([1.0, -1.0]), bi=np.array([0.0, 0.5]),
+            global_mean=5.0, user_ids=np.array([1, 2]), isbns=np.array(['a', 'b']), trained_at=trained_at
+        )
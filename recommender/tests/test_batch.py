@@ -0,0 +1,77 @@
+"""Unit tests for the batch recommendation precomputation"""
+import tempfile
+from io import StringIO
+import numpy as np
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+from bookclub.models import User, Book, Rating, RecommendedBook
+from recommender.artifacts import SVDModel, save_model
+from recommender.batch import eligible_user_ids, precompute_recommendations
+from recommender.scoring import top_n_per_row
+
+
+class BatchRecommendationsTestCase(TestCase):
+    """Test case for precomputing recommendations for all eligible users"""
+
+    fixtures = [
+        "bookclub/tests/fixtures/default_users.json",
+        "bookclub/tests/fixtures/default_books.json"
+    ]
+
+    def setUp(self):
+        self.john = User.objects.get(pk=1)
+        self.jane = User.objects.get(pk=2)
+        self.joe = User.objects.get(pk=3)
+        self.books = list(Book.objects.order_by('isbn'))
+        self.model = SVDModel(
+            pu=np.array([[1.0, 0.0], [0.0, 1.0]]),
+            qi=np.array([[1.0, 0.0], [0.0, 1.0], [0.5, 0.5], [2.0, 2.0]]),
+            bu=np.zeros(2), bi=np.zeros(4), global_mean=5.0,
+            user_ids=np.array([self.john.id, self.jane.id]),
+            isbns=np.array([book.isbn for book in self.books] + ['not in catalogue'])
+        )
+
+    def test_eligible_user_ids_only_include_users_with_enough_ratings(self):
+        self._create_ratings(self.john, 20)
+        self._create_ratings(self.jane, 19)
+        self.assertEqual(eligible_user_ids(), [self.john.id])
+
+    def test_top_n_per_row_sorts_each_row(self):
+        scores = np.array([[1.0, 3.0, 2.0], [5.0, 4.0, 6.0]])
+        self.assertEqual(top_n_per_row(scores, 2).tolist(), [[1, 2], [2, 0]])
+
+    def test_precompute_writes_ranked_unrated_catalogue_books(self):
+        Rating.objects.create(user=self.john, book=self.books[0], isbn=self.books[0].isbn, rating=9)
+        written = precompute_recommendations(self.model, [self.john.id, self.jane.id, self.joe.id], top_n=2,
+                                             chunk_size=2)
+        self.assertEqual(written, 6)
+        john_isbns = list(RecommendedBook.objects.filter(user=self.john).order_by('id').values_list('isbn', flat=True))
+        self.assertEqual(john_isbns, [self.books[2].isbn, self.books[1].isbn])
+        jane_isbns = list(RecommendedBook.objects.filter(user=self.jane).order_by('id').values_list('isbn', flat=True))
+        self.assertEqual(jane_isbns, [self.books[1].isbn, self.books[2].isbn])
+        self.assertEqual(RecommendedBook.objects.filter(user=self.joe).count(), 2)
+
+    def test_precompute_replaces_existing_recommendations(self):
+        RecommendedBook.objects.create(user=self.john, isbn='0000000000')
+        precompute_recommendations(self.model, [self.john.id], top_n=1)
+        self.assertFalse(RecommendedBook.objects.filter(user=self.john, isbn='0000000000').exists())
+        self.assertEqual(RecommendedBook.objects.filter(user=self.john).count(), 1)
+
+    def test_command_reports_throughput(self):
+        self._create_ratings(self.john, 20)
+        with tempfile.TemporaryDirectory() as artifact_dir, override_settings(RECOMMENDER_ARTIFACT_DIR=artifact_dir):
+            save_model(self.model)
+            output = StringIO()
+            call_command('precompute_recommendations', stdout=output)
+        self.assertIn('for 1 users', output.getvalue())
+        self.assertIn('users/second', output.getvalue())
+
+    def test_command_fails_without_trained_model(self):
+        with tempfile.TemporaryDirectory() as artifact_dir, override_settings(RECOMMENDER_ARTIFACT_DIR=artifact_dir):
+            with self.assertRaises(CommandError):
+                call_command('precompute_recommendations', stdout=StringIO())
+
+    def _create_ratings(self, user, count):
+        for i in range(count):
+            Rating.objects.create(user=user, isbn=f'{i:010d}', rating=5)
@@ -0,0 +1,43 @@
+"""Unit tests for the recommender benchmark harness"""
+import json
+import os
+import tempfile
+from io import StringIO
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from recommender.benchmark import synthetic_ratings, benchmark_size
+
+
+class BenchmarkTestCase(SimpleTestCase):
+    """Test case for benchmarking the recommender on synthetic data"""
+
+    def test_synthetic_ratings_have_the_requested_shape(self):
+        ratings_df = synthetic_ratings(2000, n_users=100, n_books=50, seed=1)
+        self.assertEqual(list(ratings_df.columns), ['user_id', 'isbn', 'rating'])
+        self.assertLessEqual(len(ratings_df), 2000)
+        self.assertLessEqual(ratings_df['user_id'].nunique(), 100)
+        self.assertTrue(ratings_df['rating'].between(1, 10).all())
+        self.assertFalse(ratings_df.duplicated(subset=['user_id', 'isbn']).any())
+
+    def test_benchmark_size_reports_every_measurement(self):
+        result = benchmark_size(1000, sample_users=10, n_epochs=2)
+        for key in ('ratings', 'users', 'books', 'training_seconds', 'per_user_scoring_ms',
+                    'batch_scoring_users_per_second', 'peak_allocated_mb'):
+            self.assertIn(key, result)
+        self.assertGreater(result['training_seconds'], 0)
+
+    def test_each_size_reports_its_own_memory_peak(self):
+        large = benchmark_size(4000, sample_users=10, n_epochs=2)
+        small = benchmark_size(500, sample_users=10, n_epochs=2)
+        self.assertGreater(small['peak_allocated_mb'], 0)
+        self.assertLess(small['peak_allocated_mb'], large['peak_allocated_mb'])
+
+    def test_command_writes_json_results(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            output_path = os.path.join(output_dir, 'bench.json')
+            call_command('benchmark_recommender', '--sizes', '500', '1000', '--epochs', '2',
+                         '--sample-users', '5', '--output', output_path, stdout=StringIO())
+            with open(output_path) as output:
+                report = json.load(output)
+        self.assertEqual(len(report['results']), 2)
+        self.assertIn('numpy', report)
@@ -0,0 +1,52 @@
+"""Unit tests for the columnar recommender datasets"""
+import tempfile
+import numpy as np
+import pandas as pd
+from django.test import SimpleTestCase
+from recommender.datasets import write_datasets, load_datasets, encode_datasets
+
+
+class DatasetsTestCase(SimpleTestCase):
+    """Test case for storing the BX datasets as memory-mapped columns"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.user_rating_df = pd.DataFrame({
+            'user_id': [276822, 276822, 276847, 11],
+            'isbn': ['0060096195', '0375821813', '0060096195', '059035342X'],
+            'rating': [10, 9, 8, 7]
+        })
+        self.most_popular_df = pd.DataFrame({'isbn': ['0060096195', '059035342X'], 'rating': [2, 1]})
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_written_datasets_round_trip_to_the_same_ratings(self):
+        write_datasets(self.user_rating_df, self.most_popular_df, self.temp_dir.name)
+        ratings_df = load_datasets(self.temp_dir.name).to_dataframe()
+        pd.testing.assert_frame_equal(ratings_df, self.user_rating_df)
+
+    def test_loaded_columns_are_memory_mapped(self):
+        write_datasets(self.user_rating_df, self.most_popular_df, self.temp_dir.name)
+        datasets = load_datasets(self.temp_dir.name)
+        self.assertIsInstance(datasets.rating_items, np.memmap)
+        self.assertIsInstance(datasets.isbns, np.memmap)
+        self.assertEqual(len(datasets), 4)
+
+    def test_load_datasets_is_cached_per_directory(self):
+        write_datasets(self.user_rating_df, self.most_popular_df, self.temp_dir.name)
+        self.assertIs(load_datasets(self.temp_dir.name), load_datasets(self.temp_dir.name))
+
+    def test_popular_isbns_keep_popularity_order(self):
+        write_datasets(self.user_rating_df, self.most_popular_df, self.temp_dir.name)
+        self.assertEqual(load_datasets(self.temp_dir.name).popular_isbns(), ['0060096195', '059035342X'])
+
+    def test_isbns_are_encoded_once(self):
+        columns = encode_datasets(self.user_rating_df, self.most_popular_df)
+        self.assertEqual(len(columns['isbns']), 3)
+        self.assertEqual(len(columns['users']), 3)
+
+    def test_popular_books_must_be_rated(self):
+        most_popular_df = pd.DataFrame({'isbn': ['9999999999'], 'rating': [1]})
+        with self.assertRaises(ValueError):
+            encode_datasets(self.user_rating_df, most_popular_df)
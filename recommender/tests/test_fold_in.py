@@ -0,0 +1,66 @@
+"""Unit tests for folding new ratings into a user's latent vector"""
+import tempfile
+import numpy as np
+from django.test import TestCase, override_settings
+from bookclub.models import User, Book, Rating, RecommendedBook
+from recommender.artifacts import SVDModel, save_model
+from recommender.engines import recommend_for_user, refresh_user_recommendations
+from recommender.fold_in import fold_in
+
+
+class FoldInTestCase(TestCase):
+    """Test case for updating a user's recommendations without retraining"""
+
+    fixtures = [
+        "bookclub/tests/fixtures/default_users.json",
+        "bookclub/tests/fixtures/default_books.json"
+    ]
+
+    def setUp(self):
+        self.user = User.objects.get(pk=1)
+        self.books = list(Book.objects.order_by('isbn'))
+        rng = np.random.default_rng(1)
+        self.isbns = np.array([book.isbn for book in self.books] + [f'{i:010d}' for i in range(40)])
+        self.model = SVDModel(
+            pu=rng.normal(size=(1, 3)), qi=rng.normal(size=(len(self.isbns), 3)), bu=np.array([0.3]),
+            bi=rng.normal(scale=0.1, size=len(self.isbns)), global_mean=6.0,
+            user_ids=np.array([999]), isbns=self.isbns
+        )
+
+    def test_fold_in_recovers_the_vector_behind_the_ratings(self):
+        true_vector = np.array([0.5, -1.0, 0.25])
+        exact_scores = self.model.global_mean + 0.4 + self.model.bi + self.model.qi @ true_vector
+        ratings = [(isbn, score) for isbn, score in zip(self.isbns[3:], exact_scores[3:])]
+        vector, bias = fold_in(self.model, ratings, reg=0.0, n_steps=20)
+        np.testing.assert_allclose(vector, true_vector, atol=1e-6)
+        self.assertAlmostEqual(bias, 0.4, places=6)
+
+    def test_fold_in_without_known_ratings_keeps_trained_factors(self):
+        vector, bias = fold_in(self.model, [('not a book', 10)], user_id=999)
+        np.testing.assert_array_equal(vector, self.model.pu[0])
+        self.assertEqual(bias, 0.3)
+
+    def test_recommend_for_user_reflects_new_ratings(self):
+        ratings = [(isbn, 10 if self.model.qi[i, 0] > 0 else 1) for i, isbn in enumerate(self.isbns[3:], start=3)]
+        for isbn, rating in ratings:
+            Rating.objects.create(user=self.user, isbn=isbn, rating=rating)
+        isbns = recommend_for_user(self.model, self.user.id, top_n=3)
+        self.assertEqual(len(isbns), 3)
+        self.assertTrue(set(isbns) <= {book.isbn for book in self.books})
+        vector, bias = fold_in(self.model, ratings)
+        self.assertGreater(vector[0], 0)
+
+    def test_refresh_user_recommendations_replaces_rows(self):
+        RecommendedBook.objects.create(user=self.user, isbn='0000000000')
+        with tempfile.TemporaryDirectory() as artifact_dir, override_settings(RECOMMENDER_ARTIFACT_DIR=artifact_dir):
+            save_model(self.model)
+            isbns = refresh_user_recommendations(self.user, top_n=5)
+        stored = list(RecommendedBook.objects.filter(user=self.user).order_by('id').values_list('isbn', flat=True))
+        self.assertEqual(stored, isbns)
+        self.assertEqual(set(stored), {book.isbn for book in self.books})
+
+    def test_refresh_user_recommendations_without_model_does_nothing(self):
+        RecommendedBook.objects.create(user=self.user, isbn='0000000000')
+        with tempfile.TemporaryDirectory() as artifact_dir, override_settings(RECOMMENDER_ARTIFACT_DIR=artifact_dir):
+            self.assertEqual(refresh_user_recommendations(self.user), [])
+        self.assertEqual(RecommendedBook.objects.filter(user=self.user).count(), 1)
@@ -0,0 +1,94 @@
+"""Unit tests for the item-item cosine similarity recommender"""
+import tempfile
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from django.test import TestCase, override_settings
+from bookclub.models import User, Book, Rating, RecommendedBook
+from recommender.artifacts import latest_artifact_path
+from recommender.engines import load_engine, train_engine, refresh_user_recommendations
+from recommender.item_similarity import ItemSimilarityIndex, build_index, save_index, load_index, keep_top_k
+
+
+class ItemSimilarityTestCase(TestCase):
+    """Test case for building, saving and scoring with the item similarity index"""
+
+    fixtures = [
+        "bookclub/tests/fixtures/default_users.json",
+        "bookclub/tests/fixtures/default_books.json"
+    ]
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.settings_override = override_settings(RECOMMENDER_ARTIFACT_DIR=self.temp_dir.name,
+                                                   RECOMMENDER_ENGINE='item_knn')
+        self.settings_override.enable()
+        self.ratings_df = pd.DataFrame({
+            'user_id': [1, 1, 2, 2, 3, 3, 4],
+            'isbn': ['0000000001', '0000000002', '0000000001', '0000000002', '0000000002', '0000000003',
+                     '0000000004'],
+            'rating': [10, 8, 9, 7, 6, 5, 4]
+        })
+
+    def tearDown(self):
+        self.settings_override.disable()
+        self.temp_dir.cleanup()
+
+    def test_build_index_computes_cosine_similarities(self):
+        index = build_index(self.ratings_df, k=3)
+        neighbours = index.neighbours.toarray()
+        first, second = index.item_index['0000000001'], index.item_index['0000000002']
+        expected = (10 * 8 + 9 * 7) / (np.sqrt(10 ** 2 + 9 ** 2) * np.sqrt(8 ** 2 + 7 ** 2 + 6 ** 2))
+        self.assertAlmostEqual(neighbours[first, second], expected, places=5)
+        self.assertEqual(neighbours[first, first], 0)
+        self.assertEqual(neighbours[index.item_index['0000000004']].sum(), 0)
+
+    def test_keep_top_k_keeps_largest_entries_of_each_row(self):
+        similarities = np.array([[1.0, 0.2, 0.9, 0.5], [0.2, 1.0, 0.1, 0.3], [0.9, 0.1, 1.0, 0.4],
+                                 [0.5, 0.3, 0.4, 1.0]])
+        kept = keep_top_k(sparse.csr_matrix(similarities), k=2).toarray()
+        np.testing.assert_array_almost_equal(kept[0], [0, 0, 0.9, 0.5])
+        self.assertTrue(((kept > 0).sum(axis=1) == 2).all())
+
+    def test_score_users_uses_neighbours_of_rated_books(self):
+        index = build_index(self.ratings_df, k=3)
+        scores = index.score_users({5: [('0000000001', 10)]}, [5])[0]
+        self.assertGreater(scores[index.item_index['0000000002']], scores[index.item_index['0000000003']])
+        self.assertEqual(scores[index.item_index['0000000004']], 0)
+
+    def test_score_users_falls_back_to_popularity(self):
+        index = build_index(self.ratings_df, k=3)
+        scores = index.score_users({}, [5])[0]
+        np.testing.assert_array_equal(scores, index.popularity)
+        self.assertEqual(index.isbns[np.argmax(scores)], '0000000002')
+
+    def test_saved_index_can_be_loaded(self):
+        index = build_index(self.ratings_df, k=2)
+        save_index(index)
+        loaded = load_index()
+        self.assertIsInstance(loaded, ItemSimilarityIndex)
+        np.testing.assert_array_equal(loaded.neighbours.toarray(), index.neighbours.toarray())
+        np.testing.assert_array_equal(loaded.isbns, index.isbns)
+
+    def test_engine_setting_selects_the_index(self):
+        self.assertIsNone(load_engine())
+        model, path = train_engine(self.ratings_df)
+        self.assertEqual(latest_artifact_path(prefix='item-knn-v1'), path)
+        self.assertIsNone(latest_artifact_path())
+        self.assertIsInstance(load_engine(), ItemSimilarityIndex)
+
+    def test_refresh_user_recommendations_with_the_index(self):
+        user = User.objects.get(pk=1)
+        isbns = [book.isbn for book in Book.objects.all()]
+        ratings_df = pd.DataFrame({
+            'user_id': [2, 2, 2, 3, 3],
+            'isbn': [isbns[0], isbns[1], isbns[2], isbns[0], isbns[1]],
+            'rating': [9, 8, 3, 10, 7]
+        })
+        train_engine(ratings_df)
+        Rating.objects.create(user=user, isbn=isbns[0], rating=10)
+        recommended = refresh_user_recommendations(user, top_n=2)
+        self.assertEqual(recommended[0], isbns[1])
+        self.assertNotIn(isbns[0], recommended)
+        self.assertEqual(RecommendedBook.objects.filter(user=user).count(), len(recommended))
+
@@ -0,0 +1,115 @@
+"""Unit tests for the background recommendation jobs"""
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+import pandas as pd
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from bookclub.models import User
+from recommender.artifacts import load_model
+from recommender.jobs import run_pending_jobs
+from recommender.models import RecommendationJob
+
+
+class RecommendationJobTestCase(TestCase):
+    """Test case for queueing and running recommendation jobs"""
+
+    fixtures = ["bookclub/tests/fixtures/default_users.json"]
+
+    def setUp(self):
+        self.john = User.objects.get(pk=1)
+        self.jane = User.objects.get(pk=2)
+
+    def test_enqueue_does_not_duplicate_pending_jobs(self):
+        first = RecommendationJob.enqueue(self.john)
+        second = RecommendationJob.enqueue(self.john)
+        self.assertEqual(first, second)
+        self.assertEqual(RecommendationJob.objects.count(), 1)
+
+    def test_enqueue_while_running_queues_one_more_job(self):
+        RecommendationJob.enqueue(self.john)
+        RecommendationJob.claim_next()
+        RecommendationJob.enqueue(self.john)
+        RecommendationJob.enqueue(self.john)
+        self.assertEqual(RecommendationJob.objects.filter(user=self.john).count(), 2)
+        self.assertTrue(RecommendationJob.has_pending(self.john))
+
+    def test_claim_next_takes_oldest_job_once(self):
+        john_job = RecommendationJob.enqueue(self.john)
+        RecommendationJob.enqueue(self.jane)
+        claimed = RecommendationJob.claim_next()
+        self.assertEqual(claimed, john_job)
+        self.assertEqual(claimed.status, RecommendationJob.RUNNING)
+        self.assertEqual(RecommendationJob.claim_next().user, self.jane)
+        self.assertIsNone(RecommendationJob.claim_next())
+
+    @mock.patch('recommender.jobs.refresh_user_recommendations')
+    def test_run_pending_jobs_refreshes_and_marks_jobs_done(self, refresh):
+        RecommendationJob.enqueue(self.john)
+        RecommendationJob.enqueue(self.jane)
+        self.assertEqual(run_pending_jobs(), 2)
+        self.assertEqual(refresh.call_count, 2)
+        self.assertFalse(RecommendationJob.objects.exclude(status=RecommendationJob.DONE).exists())
+        self.assertFalse(RecommendationJob.objects.filter(finished_at__isnull=True).exists())
+        self.assertTrue(RecommendationJob.finished_recently(self.john))
+        self.assertFalse(RecommendationJob.has_pending(self.john))
+
+    @mock.patch('recommender.jobs.refresh_user_recommendations')
+    def test_finished_jobs_replace_the_older_ones_of_their_user(self, refresh):
+        for i in range(3):
+            RecommendationJob.enqueue(self.john)
+            run_pending_jobs()
+        self.assertEqual(RecommendationJob.objects.filter(user=self.john).count(), 1)
+
+    def test_claim_next_takes_over_stale_running_jobs(self):
+        job = RecommendationJob.enqueue(self.john)
+        RecommendationJob.claim_next()
+        self.assertIsNone(RecommendationJob.claim_next())
+        RecommendationJob.objects.filter(pk=job.pk).update(started_at=timezone.now() - timedelta(hours=1))
+        claimed = RecommendationJob.claim_next()
+        self.assertEqual(claimed, job)
+        self.assertEqual(claimed.attempts, 2)
+        self.assertIsNone(RecommendationJob.claim_next())
+
+    @mock.patch('recommender.jobs.refresh_user_recommendations', side_effect=RuntimeError('broken model'))
+    def test_failed_jobs_are_kept_with_their_error(self, refresh):
+        RecommendationJob.enqueue(self.john)
+        run_pending_jobs()
+        job = RecommendationJob.objects.get(user=self.john)
+        self.assertEqual(job.status, RecommendationJob.FAILED)
+        self.assertIn('broken model', job.error)
+
+    @mock.patch('recommender.jobs.refresh_user_recommendations', side_effect=RuntimeError('broken model'))
+    def test_failed_jobs_are_retried_after_a_delay_until_out_of_attempts(self, refresh):
+        job = RecommendationJob.enqueue(self.john)
+        for attempt in range(1, 4):
+            self.assertEqual(run_pending_jobs(), 1)
+            self.assertEqual(run_pending_jobs(), 0)
+            RecommendationJob.objects.filter(pk=job.pk).update(finished_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(run_pending_jobs(), 0)
+        job.refresh_from_db()
+        self.assertEqual(job.attempts, 3)
+        self.assertEqual(refresh.call_count, 3)
+
+    @mock.patch('recommender.jobs.refresh_user_recommendations')
+    def test_worker_command_once_drains_the_queue(self, refresh):
+        RecommendationJob.enqueue(self.john)
+        output = StringIO()
+        call_command('recommendation_worker', '--once', stdout=output)
+        self.assertIn('Ran 1 recommendation job(s)', output.getvalue())
+        self.assertFalse(RecommendationJob.has_pending(self.john))
+
+    @mock.patch('recommender.engines.load_ratings')
+    def test_worker_command_trains_a_missing_model(self, load_ratings):
+        load_ratings.return_value = pd.DataFrame({
+            'user_id': [1, 1, 2, 2], 'isbn': ['0000000001', '0000000002', '0000000001', '0000000003'],
+            'rating': [9, 4, 7, 6]
+        })
+        output = StringIO()
+        with tempfile.TemporaryDirectory() as artifact_dir, override_settings(RECOMMENDER_ARTIFACT_DIR=artifact_dir):
+            with self.assertLogs('recommender.artifacts', 'WARNING'):
+                call_command('recommendation_worker', '--once', '--train-if-missing', stdout=output)
+            self.assertIsNotNone(load_model())
+        self.assertIn('Using a recommender model of 3 books', output.getvalue())
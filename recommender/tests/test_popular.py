@@ -0,0 +1,77 @@
+"""Unit tests for the popular books cache"""
+import os
+import tempfile
+import pandas as pd
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from bookclub.models import Book, User
+from recommender.datasets import write_datasets
+from recommender.popular import get_popular_books, clear_popular_books_cache, popular_books_cache_info
+
+
+class PopularBooksCacheTestCase(TestCase):
+    """Test case for caching the resolved popular books per process"""
+
+    fixtures = [
+        "bookclub/tests/fixtures/default_users.json",
+        "bookclub/tests/fixtures/default_books.json"
+    ]
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.settings_override = override_settings(RECOMMENDER_DATASET_DIR=self.temp_dir.name)
+        self.settings_override.enable()
+        self.user_rating_df = pd.DataFrame({
+            'user_id': [1, 2, 2],
+            'isbn': ['12345678910', '12345678911', '12345678912'],
+            'rating': [10, 9, 8]
+        })
+        self._write_popular(['12345678911', '12345678910'])
+        clear_popular_books_cache()
+
+    def tearDown(self):
+        clear_popular_books_cache()
+        self.settings_override.disable()
+        self.temp_dir.cleanup()
+
+    def test_popular_books_are_resolved_in_popularity_order(self):
+        books = get_popular_books()
+        self.assertEqual([book.isbn for book in books], ['12345678911', '12345678910'])
+
+    def test_second_call_is_a_cache_hit_without_queries(self):
+        get_popular_books()
+        before = popular_books_cache_info()
+        with self.assertNumQueries(0):
+            get_popular_books()
+        after = popular_books_cache_info()
+        self.assertEqual(after['hits'], before['hits'] + 1)
+        self.assertEqual(after['misses'], before['misses'])
+
+    def test_rewriting_the_file_invalidates_the_cache(self):
+        get_popular_books()
+        misses = popular_books_cache_info()['misses']
+        self._write_popular(['12345678912'])
+        books = get_popular_books()
+        self.assertEqual([book.isbn for book in books], ['12345678912'])
+        self.assertEqual(popular_books_cache_info()['misses'], misses + 1)
+
+    def test_saving_a_book_invalidates_the_cache(self):
+        book = get_popular_books()[0]
+        book.title = 'A new title'
+        book.save()
+        self.assertEqual(get_popular_books()[0].title, 'A new title')
+
+    def test_cache_stats_are_only_shown_to_staff(self):
+        user = User.objects.get(pk=1)
+        self.client.login(email=user.email, password='Password123')
+        response = self.client.get(reverse('popular_books_cache_stats'))
+        self.assertEqual(response.status_code, 302)
+        user.is_staff = True
+        user.save()
+        response = self.client.get(reverse('popular_books_cache_stats'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.json()), {'hits', 'misses', 'cached_books'})
+
+    def _write_popular(self, isbns):
+        most_popular_df = pd.DataFrame({'isbn': isbns, 'rating': list(range(len(isbns), 0, -1))})
+        write_datasets(self.user_rating_df, most_popular_df, self.temp_dir.name)
@@ -0,0 +1,53 @@
+"""Unit tests for the vectorised recommender scoring"""
+import numpy as np
+from django.test import SimpleTestCase
+from recommender.artifacts import SVDModel
+from recommender.engines import score_users, recommend_for_user
+from recommender.scoring import isbn_mask
+
+
+class ScoringTestCase(SimpleTestCase):
+    """Test case for scoring every book for a user at once"""
+
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.isbns = np.array([f'{i:010d}' for i in range(50)])
+        self.model = SVDModel(
+            pu=rng.normal(size=(4, 5)), qi=rng.normal(size=(50, 5)), bu=rng.normal(size=4),
+            bi=rng.normal(size=50), global_mean=7.5, user_ids=np.array([10, 11, 12, 13]), isbns=self.isbns
+        )
+
+    def test_score_users_matches_per_book_estimate(self):
+        scores = score_users(self.model, [11], {})[0]
+        expected = [self.model.estimate(11, isbn) for isbn in self.isbns]
+        np.testing.assert_allclose(scores, expected)
+
+    def test_score_users_for_unknown_user_uses_item_biases(self):
+        scores = score_users(self.model, [99], {})[0]
+        np.testing.assert_allclose(scores, 7.5 + self.model.bi)
+
+    def test_isbn_mask_ignores_unknown_isbns(self):
+        mask = isbn_mask(self.model, [self.isbns[3], 'not a book'])
+        self.assertEqual(mask.sum(), 1)
+        self.assertTrue(mask[3])
+
+    def test_recommend_for_user_skips_rated_books(self):
+        best = recommend_for_user(self.model, 12, 2, ratings=[])
+        recommended = recommend_for_user(self.model, 12, 2, ratings=[(best[0], 10)])
+        self.assertNotIn(best[0], recommended)
+        self.assertEqual(len(recommended), 2)
+
+    def test_recommend_for_user_fills_top_n_from_the_catalogue(self):
+        best = recommend_for_user(self.model, 12, 10, ratings=[])
+        catalogue = ~isbn_mask(self.model, best[:5])
+        self.assertEqual(recommend_for_user(self.model, 12, 5, ratings=[], catalogue_mask=catalogue), best[5:])
+
+    def test_recommend_for_user_never_returns_more_than_available(self):
+        catalogue = isbn_mask(self.model, self.isbns[:3])
+        recommended = recommend_for_user(self.model, 12, 10, ratings=[(self.isbns[0], 5)], catalogue_mask=catalogue)
+        self.assertEqual(sorted(recommended), list(self.isbns[1:3]))
+
+    def test_recommend_for_user_matches_sorting_every_estimate(self):
+        estimates = [(self.model.estimate(12, isbn), isbn) for isbn in self.isbns]
+        expected = [isbn for estimate, isbn in sorted(estimates, reverse=True)[:10]]
+        self.assertEqual(recommend_for_user(self.model, 12, 10, ratings=[]), expected)
@@ -1,7 +1,8 @@
 """
 ASGI config for system project.
 
-It exposes the ASGI callable as a module-level variable named ``application``.
+It exposes the ASGI callable as a module-level variable named ``application``,
+which serves the chat websockets under /ws/ and hands every other request to Django.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/3.2/howto/deployment/asgi/
@@ -13,4 +14,13 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'system.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from bookclub.realtime import chat_websocket  # noqa: E402, needs the apps loaded by get_asgi_application
+
+
+async def application(scope, receive, send):
+    if scope['type'] == 'websocket':
+        await chat_websocket(scope, receive, send)
+    else:
+        await django_application(scope, receive, send)
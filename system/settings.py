@@ -71,6 +71,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'bookclub.context_processors.inbox_count',
             ],
         },
     },
@@ -90,6 +91,26 @@ DATABASES = {
 }
 
 
+# The default cache is Django's own in-memory cache, search results get a separate one so they only evict each other
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Search results of this process, keyed by the index version kept in the shared cache
+    'search': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'search',
+        'TIMEOUT': 5 * 60,
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
+    # Seen by every process, for the values they must agree on. Create its table with `manage.py createcachetable`
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'bookclub_cache',
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
 
@@ -157,6 +178,34 @@ BOOKS_PER_PAGE = 10
 APPLICATIONS_PER_PAGE = 10
 CLUBS_PER_PAGE = 10
 POSTS_PER_PAGE = 10
+MESSAGES_PER_PAGE = 20
+
+# Milliseconds between checks for new messages on an open chat
+CHAT_POLL_INTERVAL = 5000
+
+# Seconds a user's list of clubs is kept in the shared cache. Membership changes and club edits clear it sooner
+USER_CLUBS_CACHE_TIMEOUT = 60 * 60
+
+# Seconds before a process rebuilds its autocomplete index to pick up changes made by other processes
+AUTOCOMPLETE_INDEX_TIMEOUT = 15 * 60
+
+# Seconds browsers may reuse autocomplete and search responses
+SEARCH_MAX_AGE = 5 * 60
+
+# Recommender system
+RECOMMENDER_DATASET_DIR = os.path.join(BASE_DIR, 'data', 'columnar')
+RECOMMENDER_ARTIFACT_DIR = os.path.join(BASE_DIR, 'data', 'recommender')
+# 'svd' for the latent factor model, 'item_knn' for item-item cosine similarity
+RECOMMENDER_ENGINE = 'svd'
+RECOMMENDER_NEIGHBOURS = 50
+
+# Seconds a claimed recommendation job may run before another worker takes it over
+RECOMMENDATION_JOB_TIMEOUT = 10 * 60
+# Seconds before a failed recommendation job is run again, up to RECOMMENDATION_JOB_ATTEMPTS runs in all
+RECOMMENDATION_JOB_RETRY_DELAY = 60
+RECOMMENDATION_JOB_ATTEMPTS = 3
+# Seconds before the home page queues another job for a user whose last job left them without recommendations
+RECOMMENDATION_JOB_BACKOFF = 60 * 60
 
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = 'smtp.gmail.com'
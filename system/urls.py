@@ -71,11 +71,13 @@ urlpatterns = [
      path('new_club/', club_views.new_club, name='new_club'),
      path('club_profile/<int:pk>/meeting/', meeting_views.MeetingScheduler.as_view(), name='schedule_meeting'),
      path('search/', search_views.search, name='search_page'),
+     path('search/results/', search_views.search_results, name='search_results'),
      path('search_autocomplete/', search_views.search_autocomplete, name='search_autocomplete'),
      path('leave_club/<int:club_id>/', club_views.leave_club, name='leave_club'),
      path('inbox/', messaging_views.ListChatsView.as_view(), name='inbox'),
      path('inbox/create_chat/', messaging_views.CreateChatView.as_view(), name='create_chat'),
      path('inbox/<int:pk>/', messaging_views.ChatView.as_view(), name='chat'),
+     path('inbox/<int:pk>/messages/', messaging_views.ChatMessagesView.as_view(), name='chat_messages'),
      path('inbox/<int:pk>/create_message/', messaging_views.CreateMessageView.as_view(), name='create_message'),
      path('club_profile/<int:c_pk>/members/<int:u_pk>/promote', club_views.promote_member_to_organiser,
           name='promote_member_to_organiser'),
@@ -110,6 +112,7 @@ urlpatterns = [
      path('user_profile/<int:user_id>/user_feed/', user_feed_views.UserFeedView.as_view(), name='user_feed'),
      path('user_profile/<int:user_id>/new_post/', user_post_views.UserNewPostView.as_view(), name='user_new_post'),
      path('home/recommender', dashboard_views.refresh_recommendations, name='recommend'),
+     path('home/popular_books_cache', dashboard_views.popular_books_cache_stats, name='popular_books_cache_stats'),
      path('club_profile/<int:club_id>/meetings/<int:meeting_id>/delete', meeting_views.remove_from_meeting_list,
           name='delete_meeting'),
      path('user_posts/', user_post_views.UserPostsView.as_view(), name='user_posts'),